@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 
 @dataclass
@@ -12,6 +12,22 @@ class CardResponse:
         self.value = value
 
 
+@dataclass
+class SplitHandResponse:
+    hand: List[CardResponse]
+    handValue: int
+    bet: int
+    outcome: str
+    payout: int
+
+    def __init__(self, hand: List, handValue: int, bet: int, outcome: str, payout: int) -> None:
+        self.hand = [CardResponse(**card) for card in hand]
+        self.handValue = handValue
+        self.bet = bet
+        self.outcome = outcome
+        self.payout = payout
+
+
 @dataclass
 class TransactionResponse:
     player_id: str
@@ -28,6 +44,7 @@ class TransactionResponse:
     lastAction: str
     outcome: str
     payout: int
+    splitHands: Optional[List[SplitHandResponse]]
 
     def __init__(
         self,
@@ -45,6 +62,7 @@ class TransactionResponse:
         lastAction: str,
         outcome: str,
         payout: int,
+        splitHands: Optional[List] = None,
     ) -> None:
         self.player_id = playerId
         self.timestamp = timestamp
@@ -60,6 +78,7 @@ class TransactionResponse:
         self.lastAction = lastAction
         self.outcome = outcome
         self.payout = payout
+        self.splitHands = [SplitHandResponse(**hand) for hand in splitHands] if splitHands is not None else None
 
 
 @dataclass
@@ -0,0 +1,51 @@
+from games.blackjack.models.blackjack_response import BlackJackResponse, CardResponse, SplitHandResponse
+
+# A split hand as served by /blackjack?strategy=basic.
+SPLIT_TRANSACTION = {
+    "playerId": 2016,
+    "timestamp": "2024-05-01T13:36:12.346753",
+    "gameId": "0b47179d-5cdf-410d-b8f9-351d2e40ee3a",
+    "status": "completed",
+    "playerHand": [{"suit": "diamonds", "value": "2"}, {"suit": "diamonds", "value": "Q"}, {"suit": "spades", "value": "8"}],
+    "playerHandValue": 20,
+    "dealerHand": [{"suit": "spades", "value": "2"}, {"suit": "clubs", "value": "4"}, {"suit": "clubs", "value": "3"}, {"suit": "hearts", "value": "4"}, {"suit": "diamonds", "value": "4"}],
+    "dealerHandValue": 17,
+    "currentBet": 46,
+    "playerBalance": 815,
+    "availableActions": [],
+    "lastAction": "hit",
+    "outcome": "Player wins!",
+    "payout": 0,
+    "splitHands": [
+        {
+            "hand": [{"suit": "diamonds", "value": "2"}, {"suit": "diamonds", "value": "Q"}, {"suit": "spades", "value": "8"}],
+            "handValue": 20,
+            "bet": 23,
+            "outcome": "Player wins!",
+            "payout": 23,
+        },
+        {
+            "hand": [{"suit": "hearts", "value": "2"}, {"suit": "diamonds", "value": "A"}, {"suit": "spades", "value": "4"}, {"suit": "diamonds", "value": "7"}],
+            "handValue": 14,
+            "bet": 23,
+            "outcome": "Dealer wins!",
+            "payout": -23,
+        },
+    ],
+}
+
+
+def test_transaction_keeps_split_hands():
+    response = BlackJackResponse(numPlayers=1, numGames=1, transactions=[SPLIT_TRANSACTION])
+    transaction = response.transactions[0]
+
+    assert len(transaction.splitHands) == 2
+    assert all(isinstance(hand, SplitHandResponse) for hand in transaction.splitHands)
+    assert transaction.splitHands[1].hand[1] == CardResponse(suit="diamonds", value="A")
+    assert [hand.payout for hand in transaction.splitHands] == [23, -23]
+
+
+def test_transaction_without_split_hands():
+    unsplit = {key: value for key, value in SPLIT_TRANSACTION.items() if key != "splitHands"}
+    transaction = BlackJackResponse(numPlayers=1, numGames=1, transactions=[unsplit]).transactions[0]
+    assert transaction.splitHands is None
@@ -1,3 +1,3 @@
 from .poker import simulate_poker
 from .bigwheel import simulate_bigwheel
-from .baccarat import simulate_baccarat
+from .baccarat import simulate_baccarat, simulate_baccarat_batch, simulate_baccarat_shoe
@@ -1 +1,3 @@
-from .sim import simulate_baccarat
\ No newline at end of file
+from .sim import simulate_baccarat, simulate_baccarat_shoe
+from .batch import simulate_baccarat_batch
+from .odds import baccarat_odds, BaccaratOdds
@@ -0,0 +1,172 @@
+import string
+import datetime
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+from .helper_functions import (
+    CARDS, CARD_POINTS, PAIR_INDICES, PAIR_VALUES, RIGGED_PAIR_WEIGHTS,
+    announce_bet_winner, compute_payout,
+)
+from ..rng import GameRNG, default_rng
+
+
+# Columnar Dataclass:
+# One list per BaccaratResult field, element i of every list describing hand i.
+@dataclass
+class BaccaratBatchResult:
+    game_name: str
+    hands: int
+    game_id: List[str]
+    player_id: List[str]
+    status: List[str]
+    start_time: List[datetime.datetime]
+    end_time: List[datetime.datetime]
+    player_hand: List[list]
+    player_hand_value: List[int]
+    banker_hand: List[list]
+    banker_hand_value: List[int]
+    last_action: List[str]
+    player_wager: List[float]
+    player_payout: List[float]
+    game_outcome: List[str]
+    player_bet: List[str]
+    player_bet_outcome: List[str]
+
+
+# Lookup Tables
+# Outcomes are coded by their index in OUTCOMES/BETS, so settling a hand is a
+# single gather into tables derived from the scalar helpers.
+OUTCOMES = ('Player', 'Banker', 'Tie')
+BETS = ('Player', 'Banker', 'Tie')
+PLAYER, BANKER, TIE = range(3)
+
+PAYOUT_MULTIPLIERS = np.array([[compute_payout(winner, 1, bet) for bet in BETS] for winner in OUTCOMES])
+BET_OUTCOMES = np.array([[announce_bet_winner(bet, winner) for bet in BETS] for winner in OUTCOMES], dtype = object)
+GAME_OUTCOMES = np.array([f'{winner} wins!' if winner in ['Player', 'Banker'] else "It's a tie!" for winner in OUTCOMES], dtype = object)
+LAST_ACTIONS = np.array(['initial_deal', 'banker_draw'], dtype = object)
+
+CARD_DICTS = tuple({'value': card.split(' of ')[0], 'rank': card.split(' of ')[1]} for card in CARDS)
+PLAYER_IDS = np.array([f'PID-{player:06}' for player in range(1, 51)], dtype = object)
+GAME_ID_CHARS = np.array(list(string.ascii_uppercase + string.digits))
+RIGGED_PAIR_CUMULATIVE = np.cumsum(RIGGED_PAIR_WEIGHTS)
+
+
+# Helper Functions
+def draw_banker_pairs(rng, player_pairs, rigged):
+    """Draws a banker pair per hand that shares no card with the player pair.
+
+    Pairs are drawn from the full table and redrawn where they collide with the
+    player's cards, which leaves the (weighted) draw over the remaining pairs."""
+
+    banker_pairs = np.empty_like(player_pairs)
+    pending = np.arange(len(player_pairs))
+
+    while len(pending):
+        is_rigged = rigged[pending]
+        pairs = rng.integers(0, len(PAIR_INDICES), len(pending))
+        pairs[is_rigged] = np.searchsorted(
+            RIGGED_PAIR_CUMULATIVE,
+            rng.random(is_rigged.sum()) * RIGGED_PAIR_CUMULATIVE[-1],
+            side = 'right',
+        )
+
+        banker_cards = PAIR_INDICES[pairs]
+        player_cards = PAIR_INDICES[player_pairs[pending]]
+        collides = (banker_cards[:, :, None] == player_cards[:, None, :]).any(axis = (1, 2))
+
+        banker_pairs[pending[~collides]] = pairs[~collides]
+        pending = pending[collides]
+
+    return banker_pairs
+
+
+def draw_third_cards(rng, drawn_cards):
+    """Draws one card per row of drawn_cards (-1 marks an empty slot) that is not already in that row."""
+
+    draws = np.empty(len(drawn_cards), dtype = np.int64)
+    pending = np.arange(len(drawn_cards))
+
+    while len(pending):
+        cards = rng.integers(0, len(CARDS), len(pending))
+        collides = (drawn_cards[pending] == cards[:, None]).any(axis = 1)
+
+        draws[pending[~collides]] = cards[~collides]
+        pending = pending[collides]
+
+    return draws
+
+
+def cards_to_hands(cards):
+    return [[CARD_DICTS[card] for card in hand if card >= 0] for hand in cards.tolist()]
+
+
+# Function Wrapper
+def simulate_baccarat_batch(hands: int, rng: GameRNG = None) -> BaccaratBatchResult:
+    rng = (rng or default_rng()).numpy
+    start_time = datetime.datetime.now()
+
+    game_ids = GAME_ID_CHARS[rng.integers(0, len(GAME_ID_CHARS), (hands, 6))].view('<U6').ravel()
+    player_ids = PLAYER_IDS[rng.integers(0, len(PLAYER_IDS), hands)]
+    player_wager = rng.integers(0, 1002, hands).astype(float)
+    player_bet = rng.integers(0, len(BETS), hands)
+    durations = rng.integers(1, 4, hands) * 60 + rng.integers(start_time.second, 60, hands)
+    end_time = np.datetime64(start_time, 'us') + durations.astype('timedelta64[s]')
+
+    rigged = (
+        (player_wager > 500)
+        | (start_time.hour >= 20)
+        | ((start_time.hour <= 9) & (player_bet == BANKER))
+    )
+
+    # 1. Draw Player and Banker Cards
+    player_pairs = rng.integers(0, len(PAIR_INDICES), hands)
+    banker_pairs = draw_banker_pairs(rng, player_pairs, rigged)
+
+    player_cards = np.full((hands, 3), -1)
+    banker_cards = np.full((hands, 3), -1)
+    player_cards[:, :2] = PAIR_INDICES[player_pairs]
+    banker_cards[:, :2] = PAIR_INDICES[banker_pairs]
+    player_hand_value = PAIR_VALUES[player_pairs].copy()
+    banker_hand_value = PAIR_VALUES[banker_pairs].copy()
+
+    # 2. Decision logic for drawing additional card (Player)
+    player_draws = player_hand_value <= 5
+    drawn_cards = np.hstack([player_cards[player_draws, :2], banker_cards[player_draws, :2]])
+    player_cards[player_draws, 2] = draw_third_cards(rng, drawn_cards)
+    player_hand_value[player_draws] = (player_hand_value[player_draws] + CARD_POINTS[player_cards[player_draws, 2]]) % 10
+
+    # 3. Decision logic for drawing additional card (Banker)
+    banker_draws = banker_hand_value <= 5
+    drawn_cards = np.hstack([player_cards[banker_draws], banker_cards[banker_draws, :2]])
+    banker_cards[banker_draws, 2] = draw_third_cards(rng, drawn_cards)
+    banker_hand_value[banker_draws] = (banker_hand_value[banker_draws] + CARD_POINTS[banker_cards[banker_draws, 2]]) % 10
+
+    # 4. Settle
+    winner = np.select(
+        [player_hand_value > banker_hand_value, player_hand_value < banker_hand_value],
+        [PLAYER, BANKER],
+        default = TIE,
+    )
+    player_payout = PAYOUT_MULTIPLIERS[winner, player_bet] * player_wager
+
+    return BaccaratBatchResult(
+        game_name = "Baccarat",
+        hands = hands,
+        game_id = np.char.add('GID-', game_ids).tolist(),
+        player_id = player_ids.tolist(),
+        status = ["Success"] * hands,
+        start_time = [start_time] * hands,
+        end_time = end_time.tolist(),
+        player_hand = cards_to_hands(player_cards),
+        player_hand_value = player_hand_value.tolist(),
+        banker_hand = cards_to_hands(banker_cards),
+        banker_hand_value = banker_hand_value.tolist(),
+        last_action = LAST_ACTIONS[banker_draws.astype(int)].tolist(),
+        player_wager = player_wager.tolist(),
+        player_payout = player_payout.tolist(),
+        game_outcome = GAME_OUTCOMES[winner].tolist(),
+        player_bet = np.array(BETS, dtype = object)[player_bet].tolist(),
+        player_bet_outcome = BET_OUTCOMES[winner, player_bet].tolist(),
+    )
@@ -4,6 +4,7 @@ import numpy as np
 import itertools
 import random
 from dataclasses import dataclass
+from types import MappingProxyType
 
 
 # Dataclass:
@@ -63,64 +64,87 @@ def build_combinations(deck):
     return card_combinations, card_combinations_df, deck_dict
 
 
-def draw_player_hand():
-    
-    deck = build_deck()
-    card_combinations, card_combinations_df, deck_dict = build_combinations(deck)
+# Precomputed Tables
+# Built once at import and shared by every hand. Cards are referred to by their
+# index in CARDS, so removing drawn cards is a boolean mask instead of a rebuild.
+def card_point(card):
+    rank = card.split(' ')[0]
+    return int(rank) if rank.isdigit() else 1 if rank == 'A' else 10
+
+
+def _frozen(array):
+    array.setflags(write = False)
+    return array
+
+
+CARDS = tuple(build_deck())
+CARD_INDEX = MappingProxyType({card: index for index, card in enumerate(CARDS)})
+CARD_POINTS = _frozen(np.array([card_point(card) for card in CARDS], dtype = np.int64))
+CARD_POINTS_LIST = tuple(CARD_POINTS.tolist())
+PAIR_INDICES = _frozen(np.array(list(itertools.combinations(range(len(CARDS)), 2)), dtype = np.int64))
+PAIR_VALUES = _frozen(CARD_POINTS[PAIR_INDICES].sum(axis = 1) % 10)
+RIGGED_PAIR_WEIGHTS = _frozen(np.where(PAIR_VALUES >= 7, 10, 1))
+PAIRS_WITH_CARD = _frozen((PAIR_INDICES[None, :, :] == np.arange(len(CARDS))[:, None, None]).any(axis = 2))
+DECK_DICT = MappingProxyType({
+    (CARDS[card_1], CARDS[card_2]): int(value)
+    for (card_1, card_2), value in zip(PAIR_INDICES.tolist(), PAIR_VALUES.tolist())
+})
+
 
-    player_hand = tuple(random.choice(card_combinations))
-    player_hand_value = int(str(deck_dict[player_hand])[-1])
+def drawn_mask(drawn_cards):
+    mask = np.zeros(len(CARDS), dtype = bool)
+    mask[[CARD_INDEX[card] for card in drawn_cards]] = True
+    return mask
+
+
+def draw_player_hand(rng = random):
+
+    pair = rng.randrange(len(PAIR_INDICES))
+    card_1, card_2 = PAIR_INDICES[pair]
+
+    player_hand = (CARDS[card_1], CARDS[card_2])
+    player_hand_value = int(PAIR_VALUES[pair])
 
     return player_hand, player_hand_value
 
 
-def draw_banker_hand(player_hand, with_weights = 'No'):
+def draw_banker_hand(player_hand, with_weights = 'No', rng = random):
 
-    original_deck = build_deck()
-    deck_remaining = rebuild_deck(original_deck, player_hand)
-    card_combinations, card_combinations_df, deck_dict = build_combinations(deck_remaining)
+    excluded_pairs = PAIRS_WITH_CARD[[CARD_INDEX[card] for card in player_hand]].any(axis = 0)
+    available_pairs = np.flatnonzero(~excluded_pairs)
 
     if with_weights != 'No':
-        weights = np.where(card_combinations_df['card_combination_value'] >= 7, 10, 1)
+        cumulative_weights = np.cumsum(RIGGED_PAIR_WEIGHTS[available_pairs])
+        pair = available_pairs[np.searchsorted(cumulative_weights, rng.random() * cumulative_weights[-1], side = 'right')]
 
     else:
-        weights = np.ones(len(card_combinations))
+        pair = available_pairs[rng.randrange(len(available_pairs))]
 
-    
-    banker_hand = tuple(random.choices(card_combinations, weights = weights)[0])
-    banker_hand_value = int(str(deck_dict[banker_hand])[-1])
+    card_1, card_2 = PAIR_INDICES[pair]
+    banker_hand = (CARDS[card_1], CARDS[card_2])
+    banker_hand_value = int(PAIR_VALUES[pair])
 
     return banker_hand, banker_hand_value
 
 
-def draw_player(drawn_cards, player_hand, player_hand_value):
-    
-    original_deck = build_deck()
-    deck_remaining = rebuild_deck(original_deck, drawn_cards)
-    card_combinations, card_combinations_df, deck_dict = build_combinations(deck_remaining)
+def draw_third_card(drawn_cards, hand, hand_value, rng = random):
 
-    player_draw = (random.choice(deck_remaining), )
-    player_draw_rank = player_draw[0].split(' ')[0]
-    player_draw_value = int(player_draw_rank) if player_draw_rank.isdigit() else 1 if player_draw_rank == 'A' else 10
-    player_hand = player_hand + player_draw    
-    player_hand_value =  int(str(player_hand_value + player_draw_value)[-1])
+    cards_remaining = np.flatnonzero(~drawn_mask(drawn_cards))
+    card = cards_remaining[rng.randrange(len(cards_remaining))]
 
-    return player_hand, player_hand_value, player_draw
+    draw = (CARDS[card], )
+    hand = hand + draw
+    hand_value = int(hand_value + CARD_POINTS[card]) % 10
 
+    return hand, hand_value, draw
 
-def draw_banker(drawn_cards: list, banker_hand, banker_hand_value):
-    
-    original_deck = build_deck()
-    deck_remaining = rebuild_deck(original_deck, drawn_cards)
-    card_combinations, card_combinations_df, deck_dict = build_combinations(deck_remaining)
 
-    banker_draw = (random.choice(deck_remaining), )
-    banker_draw_rank = banker_draw[0].split(' ')[0]
-    banker_draw_value = int(banker_draw_rank) if banker_draw_rank.isdigit() else 1 if banker_draw_rank == 'A' else 10
-    banker_hand = banker_hand + banker_draw    
-    banker_hand_value = int(str(banker_hand_value + banker_draw_value)[-1])
+def draw_player(drawn_cards, player_hand, player_hand_value, rng = random):
+    return draw_third_card(drawn_cards, player_hand, player_hand_value, rng)
+
 
-    return banker_hand, banker_hand_value, banker_draw
+def draw_banker(drawn_cards: list, banker_hand, banker_hand_value, rng = random):
+    return draw_third_card(drawn_cards, banker_hand, banker_hand_value, rng)
 
 
 def announce_winner(player_hand_value, banker_hand_value):
@@ -180,26 +204,131 @@ def compute_payout(winner, wager, bet):
     return payout
 
 
+# Shoe
+class Shoe:
+    """A multi-deck baccarat shoe, shuffled once and dealt by advancing a position.
+
+    Cards are held as indices into CARDS. Once the position passes the cut card
+    (`penetration` of the shoe), or fewer cards than a full hand are left,
+    `needs_shuffle` is set and the table should start a new shoe; hands in
+    between all share this one. Shuffles and rejected rigged pairs draw from
+    `rng`.
+    """
+
+    def __init__(self, decks = 8, penetration = 0.75, rng = random):
+        if decks < 1:
+            raise ValueError('A shoe needs at least one deck')
+        if not 0 < penetration <= 1:
+            raise ValueError('Penetration must be in (0, 1]')
+
+        self.decks = decks
+        self.penetration = penetration
+        self.rng = rng
+        self.cards = list(range(len(CARDS))) * decks
+        self.cut_card = int(len(self.cards) * penetration)
+        self.shuffle()
+
+    def shuffle(self):
+        self.rng.shuffle(self.cards)
+        self.position = 0
+
+    @property
+    def cards_remaining(self):
+        return len(self.cards) - self.position
+
+    @property
+    def needs_shuffle(self):
+        return self.position >= self.cut_card or self.cards_remaining < 6
+
+    def composition(self):
+        """Count of undealt cards for each point value 0-9, as used by baccarat_odds."""
+
+        counts = [0] * 10
+        for card in self.cards[self.position:]:
+            counts[CARD_POINTS_LIST[card] % 10] += 1
+        return tuple(counts)
+
+    def draw(self):
+        if self.position >= len(self.cards):
+            raise IndexError('The shoe is empty')
+
+        card = self.cards[self.position]
+        self.position += 1
+        return card
+
+    def deal_pair(self, with_weights = 'No'):
+        """Deals a two-card hand.
+
+        With weights, a pair worth less than 7 is only accepted one time in ten
+        (the same 10:1 weighting as draw_banker_hand); a rejected pair is
+        swapped back into the undealt cards and the next pair is tried.
+        """
+
+        if self.cards_remaining < 2:
+            raise IndexError('The shoe is empty')
+
+        while True:
+            card_1, card_2 = self.cards[self.position], self.cards[self.position + 1]
+            hand_value = (CARD_POINTS_LIST[card_1] + CARD_POINTS_LIST[card_2]) % 10
+
+            if with_weights == 'No' or hand_value >= 7 or self.rng.random() < 0.1:
+                self.position += 2
+                return (CARDS[card_1], CARDS[card_2]), hand_value
+
+            for i in (self.position, self.position + 1):
+                j = self.rng.randrange(i, len(self.cards))
+                self.cards[i], self.cards[j] = self.cards[j], self.cards[i]
+
+    def deal_third_card(self, hand, hand_value):
+        card = self.draw()
+        draw = (CARDS[card], )
+        return hand + draw, (hand_value + CARD_POINTS_LIST[card]) % 10, draw
+
+
 # Function Wrapper
-def play_game(type = 'normal') -> GameResult:
+def play_shoe_game(shoe, type = 'normal') -> GameResult:
+
+    # 1. Draw Player and Banker Cards
+    player_hand, player_hand_value = shoe.deal_pair()
+    banker_hand, banker_hand_value = shoe.deal_pair(with_weights = 'Yes' if type == 'rigged' else 'No')
+
+    # 2. Decision logic for drawing additional card (Player)
+    if player_hand_value <= 5:
+        player_hand, player_hand_value, player_draw = shoe.deal_third_card(player_hand, player_hand_value)
+
+    # 3. Decision logic for drawing additional card (Banker)
+    if banker_hand_value <= 5:
+        banker_hand, banker_hand_value, banker_draw = shoe.deal_third_card(banker_hand, banker_hand_value)
+        last_action = 'banker_draw'
+
+    else:
+        last_action = 'initial_deal'
+
+    return GameResult(player_hand, player_hand_value, banker_hand, banker_hand_value, last_action)
+
+
+def play_game(type = 'normal', shoe = None, rng = random) -> GameResult:
+
+    if shoe is not None:
+        return play_shoe_game(shoe, type)
 
     # 1. Draw Player Cards
-    player_hand, player_hand_value = draw_player_hand()
+    player_hand, player_hand_value = draw_player_hand(rng)
     drawn_cards = player_hand
     
     # 2. Draw Banker Cards
     if type == 'normal':
-        banker_hand, banker_hand_value = draw_banker_hand(player_hand, 'No')
+        banker_hand, banker_hand_value = draw_banker_hand(player_hand, 'No', rng)
         drawn_cards += tuple(banker_hand)
     
     elif type == 'rigged':
-        banker_hand, banker_hand_value = draw_banker_hand(player_hand, with_weights='Yes')
+        banker_hand, banker_hand_value = draw_banker_hand(player_hand, with_weights='Yes', rng=rng)
         drawn_cards += tuple(banker_hand)
 
     # 3. Decision logic for drawing additional card (Player)
     if player_hand_value <= 5:
         
-        player_hand, player_hand_value, player_draw = draw_player(drawn_cards, player_hand, player_hand_value)
+        player_hand, player_hand_value, player_draw = draw_player(drawn_cards, player_hand, player_hand_value, rng)
         drawn_cards += tuple(player_draw)
         last_action = 'player_draw'
 
@@ -209,7 +338,7 @@ def play_game(type = 'normal') -> GameResult:
     # 3. Decision logic for drawing additional card (Banker)
     if banker_hand_value <= 5:
         
-        banker_hand, banker_hand_value, banker_draw = draw_banker(drawn_cards, banker_hand, banker_hand_value)
+        banker_hand, banker_hand_value, banker_draw = draw_banker(drawn_cards, banker_hand, banker_hand_value, rng)
         drawn_cards += tuple(banker_draw)
         last_action = 'banker_draw'
 
@@ -0,0 +1,104 @@
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from typing import Dict, Tuple
+
+import numpy as np
+
+from .helper_functions import CARD_POINTS_LIST, compute_payout
+
+
+# Dataclass:
+@dataclass
+class BaccaratOdds:
+    player: float
+    banker: float
+    tie: float
+    ev: Dict[str, float] = field(default_factory = dict)
+
+
+# Card counts per point value (0-9) for a single 52-card deck: tens and faces are 0.
+DECK_COMPOSITION = tuple(Counter(point % 10 for point in CARD_POINTS_LIST)[point] for point in range(10))
+BETS = ('Player', 'Banker', 'Tie')
+HAND_CARDS = 6
+
+# One broadcastable axis per dealt card: player pair, banker pair, player third, banker third.
+_DRAWS = [np.arange(10).reshape([10 if axis == draw else 1 for axis in range(HAND_CARDS)]) for draw in range(HAND_CARDS)]
+_PLAYER_TOTAL = (_DRAWS[0] + _DRAWS[1]) % 10
+_BANKER_TOTAL = (_DRAWS[2] + _DRAWS[3]) % 10
+_PLAYER_FINAL = np.where(_PLAYER_TOTAL <= 5, (_PLAYER_TOTAL + _DRAWS[4]) % 10, _PLAYER_TOTAL)
+_BANKER_FINAL = np.where(_BANKER_TOTAL <= 5, (_BANKER_TOTAL + _DRAWS[5]) % 10, _BANKER_TOTAL)
+_RIGGED_WEIGHTS = np.where(_BANKER_TOTAL >= 7, 10, 1)
+
+
+# Helper Functions
+def composition_from_decks(decks = 1) -> Tuple[int, ...]:
+    return tuple(count * decks for count in DECK_COMPOSITION)
+
+
+def sequence_probabilities(composition):
+    """P(first six cards have these point values), as a 10x10x10x10x10x10 array.
+
+    The six cards are drawn without replacement, so every card's factor is its
+    point value's count left after the earlier draws over the cards left.
+    """
+
+    counts = np.asarray(composition)
+    total = counts.sum()
+    probabilities = np.ones((1, ) * HAND_CARDS)
+
+    for draw in range(HAND_CARDS):
+        drawn_before = sum((_DRAWS[earlier] == _DRAWS[draw]).astype(int) for earlier in range(draw))
+        probabilities = probabilities * np.clip(counts[_DRAWS[draw]] - drawn_before, 0, None) / (total - draw)
+
+    return probabilities
+
+
+@lru_cache(maxsize = 4096)
+def _odds(composition, type):
+    # The draws are exchangeable: when the player stands, the banker's third card
+    # has the same distribution as the card the player would have drawn, so
+    # every hand can be read off the same six-card sequence.
+    probabilities = sequence_probabilities(composition)
+
+    if type == 'rigged':
+        # draw_banker_hand weights each remaining pair by its value, which is the
+        # uniform pair probability reweighted and renormalised per player pair.
+        weighted = probabilities * _RIGGED_WEIGHTS
+        player_pair_mass = probabilities.sum(axis = (2, 3, 4, 5), keepdims = True)
+        weighted_mass = weighted.sum(axis = (2, 3, 4, 5), keepdims = True)
+        scale = np.divide(player_pair_mass, weighted_mass, out = np.zeros_like(weighted_mass), where = weighted_mass > 0)
+        probabilities = weighted * scale
+
+    outcomes = {
+        'Player': float(probabilities[_PLAYER_FINAL > _BANKER_FINAL].sum()),
+        'Banker': float(probabilities[_PLAYER_FINAL < _BANKER_FINAL].sum()),
+        'Tie': float(probabilities[_PLAYER_FINAL == _BANKER_FINAL].sum()),
+    }
+    ev = {bet: sum(p * compute_payout(winner, 1, bet) for winner, p in outcomes.items()) for bet in BETS}
+
+    return BaccaratOdds(outcomes['Player'], outcomes['Banker'], outcomes['Tie'], ev)
+
+
+# Function Wrapper
+def baccarat_odds(composition = None, decks = 1, type = 'normal') -> BaccaratOdds:
+    """Exact outcome probabilities and per-unit EVs of the next play_game(type) hand.
+
+    `composition` is the count of cards left for each point value 0-9, e.g.
+    Shoe.composition() for a partly dealt shoe; without it a fresh shoe of
+    `decks` decks is used. Results are memoized by composition.
+    """
+
+    if composition is None:
+        composition = composition_from_decks(decks)
+
+    composition = tuple(int(count) for count in composition)
+    if len(composition) != 10 or min(composition) < 0:
+        raise ValueError('Composition must hold ten non-negative card counts')
+    if sum(composition) < HAND_CARDS:
+        raise ValueError(f'At least {HAND_CARDS} cards are needed to deal a hand')
+    if type not in ('normal', 'rigged'):
+        raise ValueError("Type must be 'normal' or 'rigged'")
+
+    odds = _odds(composition, type)
+    return replace(odds, ev = dict(odds.ev))
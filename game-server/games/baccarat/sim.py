@@ -1,13 +1,11 @@
-import sys
-import os
 import string
 import random
 import datetime
 from dataclasses import dataclass
+from typing import List
 
-# Adjust the Python path to include the current directory
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from helper_functions import play_game, announce_winner, announce_bet_winner, compute_payout
+from .helper_functions import Shoe, play_game, announce_winner, announce_bet_winner, compute_payout
+from ..rng import default_rng
 
 @dataclass
 class BaccaratResult:
@@ -28,20 +26,21 @@ class BaccaratResult:
     player_bet: str
     player_bet_outcome: str
 
-def simulate_baccarat() -> BaccaratResult:
+def simulate_baccarat(shoe: Shoe = None, rng: random.Random = None) -> BaccaratResult:
+    rng = rng or default_rng()
     game_name = "Baccarat"
-    game_id = 'GID-' + ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-    player_id = f'PID-{random.randint(1, 50):06}'
-    player_wager = float(random.randint(0, int(1001)))
-    player_bet = random.choice(['Player', 'Banker', 'Tie'])
+    game_id = 'GID-' + ''.join(rng.choices(string.ascii_uppercase + string.digits, k=6))
+    player_id = f'PID-{rng.randint(1, 50):06}'
+    player_wager = float(rng.randint(0, int(1001)))
+    player_bet = rng.choice(['Player', 'Banker', 'Tie'])
     status = "Success"
     start_time = datetime.datetime.now()
-    end_time = start_time + datetime.timedelta(minutes=random.randint(1, 3), seconds = random.randint(start_time.second, 59))
+    end_time = start_time + datetime.timedelta(minutes=rng.randint(1, 3), seconds = rng.randint(start_time.second, 59))
 
     if player_wager > 500 or (start_time.hour >= 20 or start_time.hour >= 0 and start_time.hour <=9 and player_bet == 'Banker'):
-        game_result = play_game('rigged')
+        game_result = play_game('rigged', shoe, rng)
     else:
-        game_result = play_game('normal')
+        game_result = play_game('normal', shoe, rng)
 
     player_hand = [
         {
@@ -96,4 +95,15 @@ def simulate_baccarat() -> BaccaratResult:
         player_hand, player_hand_value, banker_hand, banker_hand_value, last_action,
         player_wager, player_payout,
         game_outcome, player_bet, player_bet_outcome
-    )
\ No newline at end of file
+    )
+
+
+def simulate_baccarat_shoe(decks: int = 8, penetration: float = 0.75, rng: random.Random = None) -> List[BaccaratResult]:
+    rng = rng or default_rng()
+    shoe = Shoe(decks, penetration, rng)
+    results = []
+
+    while not shoe.needs_shuffle:
+        results.append(simulate_baccarat(shoe, rng))
+
+    return results
@@ -1,5 +1,6 @@
 from dataclasses import dataclass, field
 import random
+from ..rng import default_rng
 
 @dataclass
 class BigWheelResult:
@@ -9,16 +10,17 @@ class BigWheelResult:
     amount_won: float
     hand_details: dict
 
-def simulate_bigwheel() -> BigWheelResult:
+def simulate_bigwheel(rng: random.Random = None) -> BigWheelResult:
+    rng = rng or default_rng()
     game = "Big Wheel"
-    hand_number = random.randint(10000, 99999)
-    result = random.choice(["Win", "Loss"])
-    amount_won = round(random.uniform(0, 1000), 2)
+    hand_number = rng.randint(10000, 99999)
+    result = rng.choice(["Win", "Loss"])
+    amount_won = round(rng.uniform(0, 1000), 2)
     hand_details = {
-        "selected_bet": random.choice(["Odd", "Even"]),
-        "winning_option": random.choice(["Odd", "Even"]),
-        "multiplier": round(random.uniform(1, 5), 1),
-        "final_wheel_position": random.randint(1, 20)
+        "selected_bet": rng.choice(["Odd", "Even"]),
+        "winning_option": rng.choice(["Odd", "Even"]),
+        "multiplier": round(rng.uniform(1, 5), 1),
+        "final_wheel_position": rng.randint(1, 20)
     }
 
     return BigWheelResult(game, hand_number, result, amount_won, hand_details)
@@ -1 +1,2 @@
-from .sim import simulate_blackjack_games
\ No newline at end of file
+from .sim import simulate_blackjack_games, stream_blackjack_games
+from .edge import estimate_house_edge
@@ -0,0 +1,109 @@
+import time
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Optional
+import numpy as np
+from .engine import Shoes, play_games
+from .strategy import STRATEGIES
+from ..rng import GameRNG, default_rng
+
+
+@dataclass
+class HouseEdgeEstimate:
+    strategy: str
+    numDecks: Optional[int]
+    ev: float
+    houseEdge: float
+    ciLow: float
+    ciHigh: float
+    confidence: float
+    hands: int
+    batches: int
+    converged: bool
+    seconds: float
+    handsPerSecond: float
+
+
+class RunningStats:
+    """Running count, mean and sum of squared deviations (Welford), updated a
+    batch at a time by merging each batch's own statistics (Chan et al.)."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, values: np.ndarray) -> None:
+        count = len(values)
+        if not count:
+            return
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else float("inf")
+
+    def half_width(self, z: float) -> float:
+        return z * (self.variance / self.count) ** 0.5 if self.count > 1 else float("inf")
+
+
+def estimate_house_edge(
+    strategy: str = "naive",
+    num_decks: Optional[int] = None,
+    penetration: float = 0.75,
+    target_width: float = 0.01,
+    confidence: float = 0.95,
+    batch_size: int = 100_000,
+    max_hands: int = 50_000_000,
+    rng: Optional[GameRNG] = None,
+) -> HouseEdgeEstimate:
+    """Estimates the player's EV per hand (in initial bets) for a rule set by
+    playing batches of games until the confidence interval on it is narrower
+    than target_width, or at least max_hands have been played.
+
+    Without num_decks every game gets a fresh deck; with it, batch_size tables
+    each deal one game per batch from their own shoe, reshuffled past the cut
+    card, so the estimate reflects shoe play.
+    """
+    if target_width <= 0:
+        raise ValueError("Target width must be positive")
+    if not 0 < confidence < 1:
+        raise ValueError("Confidence must be in (0, 1)")
+
+    rng = (rng or default_rng()).numpy
+    shoes = Shoes(rng, batch_size, num_decks, penetration) if num_decks is not None else None
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    stats = RunningStats()
+    batches = 0
+    start = time.perf_counter()
+
+    while stats.count < max_hands and 2 * stats.half_width(z) >= target_width:
+        if shoes is not None:
+            shoes.reshuffle_past_cut()
+        batch = play_games(rng, batch_size, shoes, STRATEGIES[strategy])
+        stats.update(batch.payouts(np.ones(batch_size)))
+        batches += 1
+
+    seconds = time.perf_counter() - start
+    half_width = stats.half_width(z)
+    return HouseEdgeEstimate(
+        strategy=strategy,
+        numDecks=num_decks,
+        ev=stats.mean,
+        houseEdge=-stats.mean,
+        ciLow=stats.mean - half_width,
+        ciHigh=stats.mean + half_width,
+        confidence=confidence,
+        hands=stats.count,
+        batches=batches,
+        converged=2 * half_width < target_width,
+        seconds=seconds,
+        handsPerSecond=stats.count / seconds if seconds else 0.0,
+    )
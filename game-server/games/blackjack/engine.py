@@ -0,0 +1,629 @@
+import gc
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+import numpy as np
+from .strategy import DOUBLE_OR_HIT, DOUBLE_OR_STAND, HIT, NAIVE, SPLIT, STAND, Strategy
+
+SUITS = ('hearts', 'diamonds', 'clubs', 'spades')
+VALUES = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A')
+DECK_SIZE = len(SUITS) * len(VALUES)
+MAX_HAND_CARDS = 12
+# Hands a player can end up with by splitting (and resplitting) pairs.
+MAX_HANDS = 4
+
+# Cards are integers in Deck() order (suit-major): card // 13 is the suit, card % 13 the value.
+CARD_DICTS = tuple({"suit": suit, "value": value} for suit in SUITS for value in VALUES)
+# Indexed by card, with the empty slot (-1) mapping to None.
+_CARD_DICT_LOOKUP = np.array(CARD_DICTS + (None,), dtype=object)
+CARD_POINTS = np.array([0 if value == 'A' else 10 if value in ('J', 'Q', 'K') else int(value) for _ in SUITS for value in VALUES], dtype=np.int16)
+CARD_IS_ACE = np.array([value == 'A' for _ in SUITS for value in VALUES], dtype=np.int16)
+# Points for strategy lookups (dealer upcard, pair rank), with aces as 11.
+CARD_STRATEGY_POINTS = np.where(CARD_IS_ACE == 1, 11, CARD_POINTS)
+
+OUTCOMES = (
+    "Player busts! Dealer wins.",
+    "Dealer busts! Player wins.",
+    "Dealer wins!",
+    "Player wins!",
+    "It's a tie!",
+)
+PLAYER_BUSTS, DEALER_BUSTS, DEALER_WINS, PLAYER_WINS, TIE = range(len(OUTCOMES))
+OUTCOME_MULTIPLIERS = np.array([-1, 1, -1, 1, 0])
+LAST_ACTIONS = ("initial_deal", "hit", "double_down", "split")
+INITIAL_DEAL, HIT_ACTION, DOUBLE_DOWN_ACTION, SPLIT_ACTION = range(len(LAST_ACTIONS))
+
+
+@dataclass
+class GameBatch:
+    """Columnar results of n independent games, each dealt from its own shuffled deck.
+
+    Player columns hold one entry per hand (up to MAX_HANDS after splits);
+    hands past hand_count have no cards and a bet of 0 units. bet_units is 2
+    for a doubled hand.
+    """
+    player_cards: np.ndarray
+    player_card_count: np.ndarray
+    player_value: np.ndarray
+    hand_count: np.ndarray
+    bet_units: np.ndarray
+    hand_outcome: np.ndarray
+    dealer_cards: np.ndarray
+    dealer_card_count: np.ndarray
+    dealer_value: np.ndarray
+    last_action: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.hand_count)
+
+    @property
+    def outcome(self) -> np.ndarray:
+        return self.hand_outcome[:, 0]
+
+    def wagers(self, bet_amounts: np.ndarray) -> np.ndarray:
+        return self.bet_units.sum(axis=1) * bet_amounts
+
+    def payouts(self, bet_amounts: np.ndarray) -> np.ndarray:
+        return (OUTCOME_MULTIPLIERS[self.hand_outcome] * self.bet_units).sum(axis=1) * bet_amounts
+
+
+def is_soft(non_ace_total: np.ndarray, aces: np.ndarray) -> np.ndarray:
+    # Same as calculate_hand_value: one ace counts 11 when the hand stays at
+    # 21 or under with it, every other ace counts 1.
+    return (aces > 0) & (non_ace_total + aces + 10 <= 21)
+
+
+def hand_value(non_ace_total: np.ndarray, aces: np.ndarray) -> np.ndarray:
+    return non_ace_total + aces + 10 * is_soft(non_ace_total, aces)
+
+
+class _Hands:
+    """Cards and incremental (non-ace total, ace count) for one hand per row."""
+
+    def __init__(self, n: int):
+        self.cards = np.full((n, MAX_HAND_CARDS), -1, dtype=np.int8)
+        self.count = np.zeros(n, dtype=np.int16)
+        self.non_ace_total = np.zeros(n, dtype=np.int16)
+        self.aces = np.zeros(n, dtype=np.int16)
+
+    def add(self, rows: np.ndarray, cards: np.ndarray) -> None:
+        self.cards[rows, self.count[rows]] = cards
+        self.count[rows] += 1
+        self.non_ace_total[rows] += CARD_POINTS[cards]
+        self.aces[rows] += CARD_IS_ACE[cards]
+
+    def remove_last(self, rows: np.ndarray) -> np.ndarray:
+        self.count[rows] -= 1
+        cards = self.cards[rows, self.count[rows]]
+        self.cards[rows, self.count[rows]] = -1
+        self.non_ace_total[rows] -= CARD_POINTS[cards]
+        self.aces[rows] -= CARD_IS_ACE[cards]
+        return cards
+
+    def value(self, rows=slice(None)) -> np.ndarray:
+        return hand_value(self.non_ace_total[rows], self.aces[rows])
+
+    def is_soft(self, rows=slice(None)) -> np.ndarray:
+        return is_soft(self.non_ace_total[rows], self.aces[rows])
+
+
+class Shoes:
+    """One shoe of num_decks decks per lane, shuffled lazily: each draw is one
+    Fisher-Yates step over the undealt cards, so only the cards actually dealt
+    are ever placed. Reshuffling a lane just rewinds its position, since the
+    next steps shuffle the cards again from wherever they lie."""
+
+    def __init__(self, rng: np.random.Generator, lanes: int, num_decks: int = 1, penetration: float = 1.0):
+        self.rng = rng
+        self.size = DECK_SIZE * num_decks
+        self.cards = np.tile(np.arange(DECK_SIZE, dtype=np.int8), (lanes, num_decks))
+        self.position = np.zeros(lanes, dtype=np.int64)
+        # Leave room behind the cut card for a game in progress to finish.
+        self.cut_card = max(1, min(int(self.size * penetration), self.size - 2 * MAX_HAND_CARDS))
+
+    def draw(self, rows: np.ndarray) -> np.ndarray:
+        # A game that runs through the whole shoe (long split hands) reshuffles
+        # it mid-game, as Shoe.draw does.
+        self.position[rows[self.position[rows] >= self.size]] = 0
+        position = self.position[rows]
+        swap = position + (self.rng.random(len(rows)) * (self.size - position)).astype(np.int64)
+        drawn = self.cards[rows, swap]
+        self.cards[rows, swap] = self.cards[rows, position]
+        self.cards[rows, position] = drawn
+        self.position[rows] += 1
+        return drawn
+
+    def reshuffle_past_cut(self) -> None:
+        self.position[self.position >= self.cut_card] = 0
+
+
+def play_games(
+    rng: np.random.Generator,
+    n: int,
+    decks: Optional[Shoes] = None,
+    strategy: Strategy = NAIVE,
+) -> GameBatch:
+    """Plays n games of simulate_blackjack at once: the player plays each hand
+    by strategy, the dealer then draws below 17 unless every hand busted. Each
+    game uses a fresh deck unless decks holds one shoe per game to deal from.
+
+    Split hands are played one after another, as at a table: pass k plays
+    every game's hand k, so each shoe is only drawn from once per step. Hand
+    rows are game * MAX_HANDS + hand.
+    """
+    all_rows = np.arange(n)
+    decks = decks if decks is not None else Shoes(rng, n)
+    player = _Hands(n * MAX_HANDS)
+    dealer = _Hands(n)
+    first_hands = all_rows * MAX_HANDS
+
+    player.add(first_hands, decks.draw(all_rows))
+    player.add(first_hands, decks.draw(all_rows))
+    dealer.add(all_rows, decks.draw(all_rows))
+    dealer.add(all_rows, decks.draw(all_rows))
+
+    upcards = CARD_STRATEGY_POINTS[dealer.cards[:, 0]]
+    hand_count = np.ones(n, dtype=np.int16)
+    bet_units = np.zeros((n, MAX_HANDS), dtype=np.int16)
+    bet_units[:, 0] = 1
+    split_aces = np.zeros(n, dtype=bool)
+    last_action = np.zeros(n, dtype=np.int8)
+
+    for hand in range(MAX_HANDS):
+        games = all_rows[hand_count > hand]
+        if hand:
+            # A split hand starts with one card and gets its second when played.
+            player.add(games * MAX_HANDS + hand, decks.draw(games))
+            bet_units[games, hand] = 1
+        # Split aces get one card each and no further decisions.
+        games = games[~split_aces[games]]
+
+        while len(games):
+            rows = games * MAX_HANDS + hand
+            playing = player.value(rows) < 21
+            games, rows = games[playing], rows[playing]
+
+            first, second = player.cards[rows, 0], player.cards[rows, 1]
+            can_split = (player.count[rows] == 2) & (hand_count[games] < MAX_HANDS) & (CARD_STRATEGY_POINTS[first] == CARD_STRATEGY_POINTS[second])
+            action = strategy.decide_all(
+                values=player.value(rows),
+                soft=player.is_soft(rows),
+                upcards=upcards[games],
+                pair_points=np.where(can_split, CARD_STRATEGY_POINTS[first], 0),
+                first_decision=player.count[rows] == 2,
+            )
+
+            splitting = action == SPLIT
+            split_games = games[splitting]
+            split_rows = split_games * MAX_HANDS + hand_count[split_games]
+            player.add(split_rows, player.remove_last(rows[splitting]))
+            hand_count[split_games] += 1
+            split_aces[split_games] = CARD_IS_ACE[first[splitting]] == 1
+
+            doubling = (action == DOUBLE_OR_HIT) | (action == DOUBLE_OR_STAND)
+            bet_units[games[doubling], hand] = 2
+
+            last_action[games[action == HIT]] = HIT_ACTION
+            last_action[games[doubling]] = DOUBLE_DOWN_ACTION
+            last_action[split_games] = SPLIT_ACTION
+
+            drawing = action != STAND
+            games, rows = games[drawing], rows[drawing]
+            player.add(rows, decks.draw(games))
+            # A doubled hand and a split ace take just the one card.
+            finished = doubling[drawing] | split_aces[games]
+            games = games[~finished]
+
+    cards = player.cards.reshape(n, MAX_HANDS, MAX_HAND_CARDS)
+    card_count = player.count.reshape(n, MAX_HANDS)
+    player_value = player.value().reshape(n, MAX_HANDS)
+    in_play = np.arange(MAX_HANDS) < hand_count[:, None]
+    busted = player_value > 21
+
+    rows = all_rows[(in_play & ~busted).any(axis=1) & (dealer.value() < 17)]
+    while len(rows):
+        dealer.add(rows, decks.draw(rows))
+        rows = rows[dealer.value(rows) < 17]
+
+    dealer_value = dealer.value()[:, None]
+    hand_outcome = np.select(
+        [~in_play, busted, dealer_value > 21, dealer_value > player_value, player_value > dealer_value],
+        [TIE, PLAYER_BUSTS, DEALER_BUSTS, DEALER_WINS, PLAYER_WINS],
+        default=TIE,
+    )
+
+    return GameBatch(
+        player_cards=cards,
+        player_card_count=card_count,
+        player_value=player_value,
+        hand_count=hand_count,
+        bet_units=bet_units,
+        hand_outcome=hand_outcome,
+        dealer_cards=dealer.cards,
+        dealer_card_count=dealer.count,
+        dealer_value=dealer_value[:, 0],
+        last_action=last_action,
+    )
+
+
+class _ShoeLanes:
+    """The lanes of shoes dealt to by a batch of games: game i draws from
+    lane lanes[i]."""
+
+    def __init__(self, shoes: Shoes, lanes: np.ndarray):
+        self.shoes = shoes
+        self.lanes = lanes
+
+    def draw(self, rows: np.ndarray) -> np.ndarray:
+        return self.shoes.draw(self.lanes[rows])
+
+
+def play_lane_games(
+    rng: np.random.Generator,
+    lanes: np.ndarray,
+    shoes: Shoes,
+    strategy: Strategy = NAIVE,
+) -> GameBatch:
+    """Plays one game per entry of lanes, dealt from that lane of shoes. A
+    lane's games are played one after another in the order they appear, with
+    the shoe reshuffled between games once the cut card is passed; rows follow
+    lanes."""
+    # The k-th game of every lane is played in round k.
+    order = np.argsort(lanes, kind="stable")
+    grouped = lanes[order]
+    group_starts = np.flatnonzero(np.r_[True, grouped[1:] != grouped[:-1]])
+    rank = np.empty(len(lanes), dtype=np.int64)
+    rank[order] = np.arange(len(lanes)) - np.repeat(group_starts, np.diff(np.r_[group_starts, len(lanes)]))
+
+    rounds = []
+    for k in range(rank.max() + 1):
+        games = np.flatnonzero(rank == k)
+        shoes.reshuffle_past_cut()
+        rounds.append((games, play_games(rng, len(games), _ShoeLanes(shoes, lanes[games]), strategy)))
+
+    columns = {}
+    for name, value in vars(rounds[0][1]).items():
+        column = np.empty((len(lanes), *value.shape[1:]), dtype=value.dtype)
+        for games, batch in rounds:
+            column[games] = getattr(batch, name)
+        columns[name] = column
+    return GameBatch(**columns)
+
+
+def play_table_games(
+    rng: np.random.Generator,
+    num_tables: int,
+    num_games: int,
+    num_decks: int,
+    penetration: float,
+    strategy: Strategy = NAIVE,
+) -> GameBatch:
+    """Plays num_games consecutive games at each of num_tables tables, every
+    table dealing from its own shoe that is reshuffled between games once the
+    cut card is passed. Rows are table-major: table t's game g is row t * num_games + g."""
+    shoes = Shoes(rng, num_tables, num_decks, penetration)
+    rounds = []
+    for _ in range(num_games):
+        shoes.reshuffle_past_cut()
+        rounds.append(play_games(rng, num_tables, shoes, strategy))
+
+    return GameBatch(**{
+        name: np.stack([getattr(batch, name) for batch in rounds], axis=1).reshape(num_tables * num_games, *value.shape[1:])
+        for name, value in vars(rounds[0]).items()
+    })
+
+
+_HEX_DIGITS = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+# Position of each of the 32 hex digits inside the 36-character UUID string.
+_UUID_DIGIT_COLUMNS = np.array([i for i in range(36) if i not in (8, 13, 18, 23)])
+
+
+def game_ids(rng: np.random.Generator, n: int) -> List[str]:
+    """n random (version 4) UUID strings, formatted like str(uuid.uuid4())."""
+    raw = rng.integers(0, 256, (n, 16), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+
+    chars = np.full((n, 36), ord("-"), dtype=np.uint8)
+    chars[:, _UUID_DIGIT_COLUMNS[0::2]] = _HEX_DIGITS[raw >> 4]
+    chars[:, _UUID_DIGIT_COLUMNS[1::2]] = _HEX_DIGITS[raw & 0x0F]
+    return chars.view("S36").ravel().astype("U36").tolist()
+
+
+def iso_timestamps(start_time: datetime, offsets: np.ndarray) -> List[str]:
+    """(start_time + offset seconds).isoformat() for every offset."""
+    unit = 'us' if start_time.microsecond else 's'
+    timestamps = np.datetime64(start_time, 'us') + offsets.astype('timedelta64[s]')
+    return np.datetime_as_string(timestamps, unit=unit).tolist()
+
+
+def _hands_as_dicts(cards: np.ndarray, counts: np.ndarray) -> List[List[Dict[str, str]]]:
+    return [hand[:count] for hand, count in zip(_CARD_DICT_LOOKUP[cards].tolist(), counts.tolist())]
+
+
+@contextmanager
+def _gc_paused():
+    # Building millions of small dicts/lists otherwise triggers repeated full
+    # collections that scan every object already built; none of them is garbage.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def transactions(
+    player_ids: np.ndarray,
+    timestamps: List[str],
+    batch: GameBatch,
+    bet_amounts: np.ndarray,
+    balances: np.ndarray,
+    ids: List[str],
+) -> List[Dict[str, Any]]:
+    """Builds the simulate_blackjack transaction dicts for a batch, in batch order."""
+    payouts = batch.payouts(bet_amounts)
+    outcomes = np.array(OUTCOMES, dtype=object)[batch.outcome].tolist()
+    last_actions = np.array(LAST_ACTIONS, dtype=object)[batch.last_action].tolist()
+
+    with _gc_paused():
+        results = _transaction_dicts(
+            player_ids.tolist(),
+            timestamps,
+            ids,
+            _hands_as_dicts(batch.player_cards[:, 0], batch.player_card_count[:, 0]),
+            batch.player_value[:, 0].tolist(),
+            _hands_as_dicts(batch.dealer_cards, batch.dealer_card_count),
+            batch.dealer_value.tolist(),
+            batch.wagers(bet_amounts).tolist(),
+            balances.tolist(),
+            last_actions,
+            outcomes,
+            payouts.tolist(),
+        )
+
+    for row in np.flatnonzero(batch.hand_count > 1).tolist():
+        results[row]["splitHands"] = split_hands(batch, row, int(bet_amounts[row]))
+    return results
+
+
+def split_hands(batch: GameBatch, row: int, bet_amount: int) -> List[Dict[str, Any]]:
+    """The hands of a game the player split, in the order they were played."""
+    hands = range(batch.hand_count[row])
+    return [
+        {
+            "hand": hand,
+            "handValue": value,
+            "bet": bet_amount * units,
+            "outcome": OUTCOMES[outcome],
+            "payout": int(OUTCOME_MULTIPLIERS[outcome]) * bet_amount * units,
+        }
+        for hand, value, units, outcome in zip(
+            _hands_as_dicts(batch.player_cards[row, hands], batch.player_card_count[row, hands]),
+            batch.player_value[row, hands].tolist(),
+            batch.bet_units[row, hands].tolist(),
+            batch.hand_outcome[row, hands].tolist(),
+        )
+    ]
+
+
+def _transaction_dicts(*columns: List[Any]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "playerId": player_id,
+            "timestamp": timestamp,
+            "gameId": game_id,
+            "status": "completed",
+            "playerHand": player_hand,
+            "playerHandValue": player_value,
+            "dealerHand": dealer_hand,
+            "dealerHandValue": dealer_value,
+            "currentBet": bet_amount,
+            "playerBalance": balance,
+            "availableActions": [],
+            "lastAction": last_action,
+            "outcome": outcome,
+            "payout": payout,
+        }
+        for player_id, timestamp, game_id, player_hand, player_value, dealer_hand, dealer_value, bet_amount, balance, last_action, outcome, payout in zip(*columns)
+    ]
+
+
+@dataclass
+class ScheduledGames:
+    """Games played by a set of players with their bets, running balances and
+    timestamp offsets (seconds from the simulation start), one row per game."""
+    player_ids: np.ndarray
+    offsets: np.ndarray
+    tie_breaks: np.ndarray
+    bet_amounts: np.ndarray
+    balances: np.ndarray
+    batch: GameBatch
+
+    def take(self, order: np.ndarray) -> "ScheduledGames":
+        return ScheduledGames(
+            player_ids=self.player_ids[order],
+            offsets=self.offsets[order],
+            tie_breaks=self.tie_breaks[order],
+            bet_amounts=self.bet_amounts[order],
+            balances=self.balances[order],
+            batch=GameBatch(**{name: value[order] for name, value in vars(self.batch).items()}),
+        )
+
+    def sorted_by_time(self) -> "ScheduledGames":
+        # Equal timestamps are ordered at random, as the shuffle before the sort did.
+        return self.take(np.lexsort((self.tie_breaks, self.offsets)))
+
+    @staticmethod
+    def merge(parts: List["ScheduledGames"]) -> "ScheduledGames":
+        """Merges time-sorted parts into one time-sorted set of games."""
+        columns = {
+            name: np.concatenate([getattr(part, name) for part in parts])
+            for name in ("player_ids", "offsets", "tie_breaks", "bet_amounts", "balances")
+        }
+        batch = GameBatch(**{
+            name: np.concatenate([getattr(part.batch, name) for part in parts])
+            for name in vars(parts[0].batch)
+        })
+        return ScheduledGames(batch=batch, **columns).sorted_by_time()
+
+
+def schedule_games(
+    rng: np.random.Generator,
+    player_ids: np.ndarray,
+    num_games: int,
+    timestamp_range: int,
+    num_decks: Optional[int] = None,
+    penetration: float = 0.75,
+    strategy: Strategy = NAIVE,
+) -> ScheduledGames:
+    """Plays num_games games for each player id, sorted by timestamp. Each
+    player starts at a balance of 1000 and carries it through their games in
+    order. With num_decks, each player plays at their own table from a shoe of
+    that many decks instead of a fresh deck per game."""
+    num_players = len(player_ids)
+    if num_decks is None:
+        batch = play_games(rng, num_players * num_games, strategy=strategy)
+    else:
+        batch = play_table_games(rng, num_players, num_games, num_decks, penetration, strategy)
+    bet_amounts = rng.integers(10, 101, (num_players, num_games))
+    balances = 1000 + np.cumsum(batch.payouts(bet_amounts.ravel()).reshape(num_players, num_games), axis=1)
+
+    return ScheduledGames(
+        player_ids=np.repeat(player_ids, num_games),
+        offsets=rng.integers(0, timestamp_range + 1, num_players * num_games),
+        tie_breaks=rng.random(num_players * num_games),
+        bet_amounts=bet_amounts.ravel(),
+        balances=balances.ravel(),
+        batch=batch,
+    ).sorted_by_time()
+
+
+def _schedule_shard(
+    seed: np.random.SeedSequence,
+    player_ids: np.ndarray,
+    num_games: int,
+    timestamp_range: int,
+    num_decks: Optional[int],
+    penetration: float,
+    strategy: Strategy,
+) -> ScheduledGames:
+    return schedule_games(np.random.default_rng(seed), player_ids, num_games, timestamp_range, num_decks, penetration, strategy)
+
+
+def schedule_games_parallel(
+    seed: np.random.SeedSequence,
+    player_ids: np.ndarray,
+    num_games: int,
+    timestamp_range: int,
+    workers: int,
+    num_decks: Optional[int] = None,
+    penetration: float = 0.75,
+    strategy: Strategy = NAIVE,
+) -> ScheduledGames:
+    """schedule_games with the players split across a pool of worker processes.
+
+    Players are independent, so each shard gets its own RNG stream spawned from
+    seed; the time-sorted shards are merged back into one timeline."""
+    shards = [shard for shard in np.array_split(player_ids, workers) if len(shard)]
+    seeds = seed.spawn(len(shards))
+
+    if len(shards) == 1:
+        return _schedule_shard(seeds[0], shards[0], num_games, timestamp_range, num_decks, penetration, strategy)
+
+    with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+        parts = list(pool.map(
+            _schedule_shard,
+            seeds,
+            shards,
+            [num_games] * len(shards),
+            [timestamp_range] * len(shards),
+            [num_decks] * len(shards),
+            [penetration] * len(shards),
+            [strategy] * len(shards),
+        ))
+
+    return ScheduledGames.merge(parts)
+
+
+def stream_games(
+    rng: np.random.Generator,
+    player_ids: np.ndarray,
+    num_games: int,
+    timestamp_range: int,
+    chunk_size: int = 8192,
+    strategy: Strategy = NAIVE,
+    num_decks: Optional[int] = None,
+    penetration: float = 0.75,
+) -> Iterator[ScheduledGames]:
+    """Same games as schedule_games, generated already in timestamp order and
+    yielded in chunks, so memory depends on chunk_size and the number of
+    players but not on players * games.
+
+    Timestamps are drawn as ascending uniform order statistics, continuing
+    each chunk from where the previous one ended. Which player plays each slot
+    is a uniform arrangement of num_games slots per player, drawn chunk by
+    chunk with a multivariate hypergeometric split of the remaining slots.
+    Balances carry through each player's games in timestamp order. With
+    num_decks, each player deals their games in order from their own shoe, as
+    in schedule_games.
+    """
+    num_players = len(player_ids)
+    shoes = Shoes(rng, num_players, num_decks, penetration) if num_decks is not None else None
+    total = num_players * num_games
+    remaining = np.full(num_players, num_games, dtype=np.int64)
+    balances = np.full(num_players, 1000, dtype=np.int64)
+    log_survival = 0.0
+
+    for start in range(0, total, chunk_size):
+        size = min(chunk_size, total - start)
+
+        # 1 - U(k) is a running product of V ** (1 / (total - k)) for uniform V.
+        log_survivals = log_survival + np.cumsum(np.log1p(-rng.random(size)) / (total - np.arange(start, start + size)))
+        log_survival = log_survivals[-1]
+        offsets = np.minimum(((1 - np.exp(log_survivals)) * (timestamp_range + 1)).astype(np.int64), timestamp_range)
+
+        counts = rng.multivariate_hypergeometric(remaining, size)
+        remaining -= counts
+        players = rng.permutation(np.repeat(np.arange(num_players), counts))
+
+        if shoes is None:
+            batch = play_games(rng, size, strategy=strategy)
+        else:
+            batch = play_lane_games(rng, players, shoes, strategy)
+        bet_amounts = rng.integers(10, 101, size)
+        payouts = batch.payouts(bet_amounts)
+
+        # Running balance per player within the chunk: a cumulative sum over the
+        # chunk grouped by player (stable, so each group stays in time order).
+        order = np.argsort(players, kind="stable")
+        grouped_players = players[order]
+        running = np.cumsum(payouts[order])
+        group_starts = np.flatnonzero(np.r_[True, grouped_players[1:] != grouped_players[:-1]])
+        before_group = np.repeat((running - payouts[order])[group_starts], np.diff(np.r_[group_starts, size]))
+        chunk_balances = np.empty(size, dtype=np.int64)
+        chunk_balances[order] = balances[grouped_players] + running - before_group
+        np.add.at(balances, players, payouts)
+
+        yield ScheduledGames(
+            player_ids=player_ids[players],
+            offsets=offsets,
+            tie_breaks=np.zeros(size),
+            bet_amounts=bet_amounts,
+            balances=chunk_balances,
+            batch=batch,
+        )
+
+
+def to_transactions(rng: np.random.Generator, games: ScheduledGames, start_time: datetime) -> List[Dict[str, Any]]:
+    return transactions(
+        player_ids=games.player_ids,
+        timestamps=iso_timestamps(start_time, games.offsets),
+        batch=games.batch,
+        bet_amounts=games.bet_amounts,
+        balances=games.balances,
+        ids=game_ids(rng, len(games.offsets)),
+    )
@@ -1,8 +1,11 @@
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Literal
+from typing import Iterator, List, Dict, Any, Literal, Optional, Tuple
 import random
-import uuid
-from datetime import datetime, timedelta
+from datetime import datetime
+import numpy as np
+from .engine import CARD_DICTS, DECK_SIZE, MAX_HANDS, game_ids, schedule_games_parallel, stream_games, to_transactions
+from .strategy import DOUBLE_OR_HIT, DOUBLE_OR_STAND, NAIVE, SPLIT, STAND, STRATEGIES, HandTotals, Strategy, card_points
+from ..rng import GameRNG, default_rng
 
 @dataclass
 class BlackjackSimulation:
@@ -20,16 +23,50 @@ class Card:
 
 
 class Deck:
-    def __init__(self):
+    def __init__(self, rng: Optional[random.Random] = None):
         suits: List[Literal['hearts', 'diamonds', 'clubs', 'spades']] = ['hearts', 'diamonds', 'clubs', 'spades']
         values: List[Literal['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']] = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
         self.cards: List[Card] = [Card(suit, value) for suit in suits for value in values]
-        random.shuffle(self.cards)
+        (rng or default_rng()).shuffle(self.cards)
 
     def draw(self) -> Card:
         return self.cards.pop()
 
 
+class Shoe:
+    """A table's shoe of num_decks decks, held as card indices in Deck order in
+    a bytearray. It is shuffled when created and again before a game once the
+    cut card (penetration) is passed, so consecutive games share it."""
+    cards_by_index: Tuple[Card, ...] = tuple(Card(**card) for card in CARD_DICTS)
+
+    def __init__(self, num_decks: int = 6, penetration: float = 0.75, rng: Optional[np.random.Generator] = None):
+        if num_decks < 1:
+            raise ValueError("A shoe needs at least one deck")
+        if not 0 < penetration <= 1:
+            raise ValueError("Penetration must be in (0, 1]")
+        self.num_decks = num_decks
+        self.penetration = penetration
+        self.rng = rng if rng is not None else default_rng().numpy
+        self.cards = bytearray(np.tile(np.arange(DECK_SIZE, dtype=np.uint8), num_decks).tobytes())
+        self.cut_card = int(len(self.cards) * penetration)
+        self.shuffle()
+
+    def shuffle(self) -> None:
+        self.cards = bytearray(self.rng.permutation(np.frombuffer(self.cards, dtype=np.uint8)).tobytes())
+        self.position = 0
+
+    @property
+    def needs_shuffle(self) -> bool:
+        return self.position >= self.cut_card
+
+    def draw(self) -> Card:
+        if self.position >= len(self.cards):
+            self.shuffle()
+        card = self.cards_by_index[self.cards[self.position]]
+        self.position += 1
+        return card
+
+
 def calculate_hand_value(hand: List[Card]) -> int:
     value = 0
     aces = 0
@@ -41,11 +78,9 @@ def calculate_hand_value(hand: List[Card]) -> int:
         else:
             value += int(card.value)
     
-    for _ in range(aces):
-        if value + 11 <= 21:
-            value += 11
-        else:
-            value += 1
+    value += aces
+    if aces and value + 10 <= 21:
+        value += 10
     
     return value
 
@@ -56,93 +91,186 @@ class BlackjackSimulation:
     transactions: List[Dict[str, Any]] = field(default_factory=list)
 
 
-def simulate_blackjack(player_balance: int, bet_amount: int, timestamp: datetime) -> Dict[str, Any]:
-    game_id = str(uuid.uuid4())
-    deck = Deck()
+def settle_hand(player_value: int, dealer_value: int) -> Tuple[str, int]:
+    """Outcome of a hand and what it pays per unit bet."""
+    if player_value > 21:
+        return "Player busts! Dealer wins.", -1
+    if dealer_value > 21:
+        return "Dealer busts! Player wins.", 1
+    if dealer_value > player_value:
+        return "Dealer wins!", -1
+    if player_value > dealer_value:
+        return "Player wins!", 1
+    return "It's a tie!", 0
+
+
+def simulate_blackjack(
+    player_balance: int,
+    bet_amount: int,
+    timestamp: datetime,
+    shoe: Optional[Shoe] = None,
+    strategy: Strategy = NAIVE,
+    rng: Optional[GameRNG] = None,
+) -> Dict[str, Any]:
+    # Without a shoe the game is dealt from a fresh deck shuffled by rng; a
+    # shoe keeps its own stream.
+    rng = rng or default_rng()
+    game_id = game_ids(rng.numpy, 1)[0]
+    if shoe is None:
+        deck = Shoe(num_decks=1, rng=rng.numpy)
+    else:
+        if shoe.needs_shuffle:
+            shoe.shuffle()
+        deck = shoe
     player_hand: List[Card] = [deck.draw(), deck.draw()]
     dealer_hand: List[Card] = [deck.draw(), deck.draw()]
-    
-    player_value = calculate_hand_value(player_hand)
-    dealer_value = calculate_hand_value(dealer_hand)
-    
+    upcard = card_points(dealer_hand[0].value)
+
     status = "in_progress"
-    available_actions = ["hit", "stand", "double_down"]
+    available_actions = ["hit", "stand", "double_down", "split"]
     last_action = "initial_deal"
-    outcome = None
-    payout = 0
-    
-    # Simulate player's turn
-    while player_value < 17:  # Simple strategy: hit on 16 or less
-        player_hand.append(deck.draw())
-        player_value = calculate_hand_value(player_hand)
-        last_action = "hit"
-        if player_value > 21:
-            status = "completed"
-            outcome = "Player busts! Dealer wins."
-            payout = -bet_amount
-            player_balance += payout
-            break
-
-    # Simulate dealer's turn if player hasn't busted
-    if status != "completed":
-        while dealer_value < 17:
-            dealer_hand.append(deck.draw())
-            dealer_value = calculate_hand_value(dealer_hand)
-        
-        status = "completed"
-        if dealer_value > 21:
-            outcome = "Dealer busts! Player wins."
-            payout = bet_amount
-        elif dealer_value > player_value:
-            outcome = "Dealer wins!"
-            payout = -bet_amount
-        elif player_value > dealer_value:
-            outcome = "Player wins!"
-            payout = bet_amount
-        else:
-            outcome = "It's a tie!"
-            payout = 0
-        
-        player_balance += payout
 
-    return {
+    # Simulate player's turn, one hand at a time: splitting a pair moves its
+    # second card to a new hand that is played after the current one.
+    hands: List[List[Card]] = [player_hand]
+    bets: List[int] = [bet_amount]
+    hand_values: List[int] = []
+    split_aces = False
+    while len(hand_values) < len(hands):
+        hand = hands[len(hand_values)]
+        if len(hand) == 1:
+            hand.append(deck.draw())
+        totals = HandTotals()
+        for card in hand:
+            totals.add(card.value)
+
+        # Split aces get one card each and no further decisions.
+        while totals.value < 21 and not split_aces:
+            pair_points = None
+            if totals.cards == 2 and len(hands) < MAX_HANDS and card_points(hand[0].value) == card_points(hand[1].value):
+                pair_points = card_points(hand[0].value)
+
+            action = strategy.decide(totals, upcard, pair_points)
+            if action == STAND:
+                break
+            if action == SPLIT:
+                hands.append([hand.pop()])
+                bets.append(bet_amount)
+                split_aces = hand[0].value == 'A'
+                totals = HandTotals()
+                totals.add(hand[0].value)
+                last_action = "split"
+            elif action in (DOUBLE_OR_HIT, DOUBLE_OR_STAND):
+                bets[len(hand_values)] *= 2
+                last_action = "double_down"
+            else:
+                last_action = "hit"
+
+            card = deck.draw()
+            hand.append(card)
+            totals.add(card.value)
+            if action in (DOUBLE_OR_HIT, DOUBLE_OR_STAND):
+                break
+
+        hand_values.append(totals.value)
+
+    # Simulate dealer's turn if player hasn't busted every hand
+    dealer = HandTotals()
+    for card in dealer_hand:
+        dealer.add(card.value)
+    if min(hand_values) <= 21:
+        while dealer.value < 17:
+            card = deck.draw()
+            dealer_hand.append(card)
+            dealer.add(card.value)
+    dealer_value = dealer.value
+
+    status = "completed"
+    settled = [settle_hand(value, dealer_value) for value in hand_values]
+    outcome = settled[0][0]
+    payout = sum(units * bet for (_, units), bet in zip(settled, bets))
+    player_balance += payout
+
+    result = {
         "timestamp": timestamp.isoformat(),
         "gameId": game_id,
         "status": status,
         "playerHand": [card.to_dict() for card in player_hand],
-        "playerHandValue": player_value,
+        "playerHandValue": hand_values[0],
         "dealerHand": [dealer_hand[0].to_dict(), {"suit": "hidden", "value": "hidden"}] if status == "in_progress" else [card.to_dict() for card in dealer_hand],
         "dealerHandValue": calculate_hand_value([dealer_hand[0]]) if status == "in_progress" else dealer_value,
-        "currentBet": bet_amount,
+        "currentBet": sum(bets),
         "playerBalance": player_balance,
         "availableActions": available_actions if status == "in_progress" else [],
         "lastAction": last_action,
         "outcome": outcome,
         "payout": payout
     }
+    if len(hands) > 1:
+        result["splitHands"] = [
+            {
+                "hand": [card.to_dict() for card in hand],
+                "handValue": value,
+                "bet": bet,
+                "outcome": hand_outcome,
+                "payout": units * bet,
+            }
+            for hand, value, bet, (hand_outcome, units) in zip(hands, hand_values, bets, settled)
+        ]
+    return result
 
 
-def simulate_blackjack_games(num_players: int, num_games: int) -> BlackjackSimulation:
-    results = []
+def simulate_blackjack_games(
+    num_players: int,
+    num_games: int,
+    workers: int = 1,
+    num_decks: Optional[int] = None,
+    penetration: float = 0.75,
+    strategy: str = "naive",
+    rng: Optional[GameRNG] = None,
+) -> BlackjackSimulation:
+    # Same games and transaction schema as running simulate_blackjack once per
+    # game, played as whole-array batches by the engine. With workers > 1 the
+    # players are sharded across that many processes. With num_decks each
+    # player's games are dealt in order from their own table's shoe. strategy
+    # names the player's decision tables in STRATEGIES.
+    seed = (rng or default_rng()).seed_sequence.spawn(1)[0]
     start_time = datetime.now()
-    for player_id in range(2000, 2000 + num_players):
-        player_balance = 1000  # Starting balance for each player
-        for game_number in range(num_games):
-            bet_amount = random.randint(10, 100)
-            # Generate a timestamp for each game
-            game_timestamp = start_time + timedelta(seconds=random.randint(0, num_players * num_games * 10))
-            game_result = simulate_blackjack(player_balance, bet_amount, game_timestamp)
-            player_balance = game_result["playerBalance"]
-            
-            results.append({
-                "playerId": player_id,
-                **game_result
-            })
-    
-    # Shuffle the results to randomize the sequence
-    random.shuffle(results)
-    
-    # Sort the results by timestamp after shuffling
-    results.sort(key=lambda x: x['timestamp'])
-    
-    return BlackjackSimulation(numPlayers=num_players, numGames=num_games, transactions=results)
\ No newline at end of file
+    games = schedule_games_parallel(
+        seed=seed,
+        player_ids=np.arange(2000, 2000 + num_players),
+        num_games=num_games,
+        timestamp_range=num_players * num_games * 10,
+        workers=workers,
+        num_decks=num_decks,
+        penetration=penetration,
+        strategy=STRATEGIES[strategy],
+    )
+    results = to_transactions(np.random.default_rng(seed.spawn(1)[0]), games, start_time)
+
+    return BlackjackSimulation(numPlayers=num_players, numGames=num_games, transactions=results)
+
+
+def stream_blackjack_games(
+    num_players: int,
+    num_games: int,
+    num_decks: Optional[int] = None,
+    penetration: float = 0.75,
+    strategy: str = "naive",
+    rng: Optional[GameRNG] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    # Streaming counterpart of simulate_blackjack_games: yields the transactions
+    # in timestamp order, one chunk at a time, without holding them all. Each
+    # chunk is played in one process, so there is no workers option.
+    rng = (rng or default_rng()).numpy
+    start_time = datetime.now()
+    for games in stream_games(
+        rng=rng,
+        player_ids=np.arange(2000, 2000 + num_players),
+        num_games=num_games,
+        timestamp_range=num_players * num_games * 10,
+        strategy=STRATEGIES[strategy],
+        num_decks=num_decks,
+        penetration=penetration,
+    ):
+        yield to_transactions(rng, games, start_time)
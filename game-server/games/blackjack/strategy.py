@@ -0,0 +1,183 @@
+from typing import Dict, List, Optional
+import numpy as np
+
+# Actions a strategy can take. DOUBLE_OR_HIT / DOUBLE_OR_STAND double down on
+# the first two cards and otherwise fall back to hitting / standing.
+HIT, STAND, DOUBLE_OR_HIT, DOUBLE_OR_STAND, SPLIT = range(5)
+ACTION_CODES = {"H": HIT, "S": STAND, "D": DOUBLE_OR_HIT, "X": DOUBLE_OR_STAND, "P": SPLIT}
+
+# Hand kinds a decision table is indexed by.
+HARD, SOFT, PAIR = range(3)
+
+MAX_TOTAL = 31
+UPCARDS = range(2, 12)  # dealer upcard points, ace = 11
+
+
+def card_points(value: str) -> int:
+    """Points of a card value for table lookups: faces are 10 and an ace is 11."""
+    if value == 'A':
+        return 11
+    if value in ('J', 'Q', 'K'):
+        return 10
+    return int(value)
+
+
+def is_soft(non_ace_total: int, aces: int) -> bool:
+    # One ace counts 11 when the hand stays at 21 or under with it, every
+    # other ace counts 1.
+    return aces > 0 and non_ace_total + aces + 10 <= 21
+
+
+def hand_value(non_ace_total: int, aces: int) -> int:
+    return non_ace_total + aces + (10 if is_soft(non_ace_total, aces) else 0)
+
+
+class HandTotals:
+    """Running totals of a hand, updated per card instead of re-summing it.
+
+    The hand is soft while an ace is being counted as 11.
+    """
+    __slots__ = ("non_ace_total", "aces", "cards")
+
+    def __init__(self) -> None:
+        self.non_ace_total = 0
+        self.aces = 0
+        self.cards = 0
+
+    def add(self, value: str) -> None:
+        if value == 'A':
+            self.aces += 1
+        else:
+            self.non_ace_total += card_points(value)
+        self.cards += 1
+
+    @property
+    def value(self) -> int:
+        return hand_value(self.non_ace_total, self.aces)
+
+    @property
+    def is_soft(self) -> bool:
+        return is_soft(self.non_ace_total, self.aces)
+
+
+class Strategy:
+    """A player strategy as three decision tables indexed by
+    [total][dealer upcard] for hard and soft totals and by [card points][dealer
+    upcard] for pairs. Each table is given as rows of action letters (H, S, D,
+    X, P) for upcards 2-10 and A. A row applies to its total and every total up
+    to the next row; totals below the first row use the first row.
+    """
+
+    def __init__(self, name: str, hard: Dict[int, str], soft: Dict[int, str], pairs: Dict[int, str]):
+        self.name = name
+        self.tables = np.stack([self._expand(hard), self._expand(soft), self._expand(pairs)])
+        # Nested lists index faster than NumPy scalars for one hand at a time.
+        self._rows: List[List[List[int]]] = self.tables.tolist()
+
+    @staticmethod
+    def _expand(rows: Dict[int, str]) -> np.ndarray:
+        table = np.full((MAX_TOTAL + 1, max(UPCARDS) + 1), STAND, dtype=np.int8)
+        row = rows[min(rows)]
+        for total in range(MAX_TOTAL + 1):
+            row = rows.get(total, row)
+            for upcard, letter in zip(UPCARDS, row):
+                table[total, upcard] = ACTION_CODES[letter]
+        return table
+
+    def decide(self, hand: HandTotals, upcard: int, pair_points: Optional[int] = None) -> int:
+        """Action for a hand against the dealer's upcard points. pair_points is
+        the points of the pair when the hand can still be split. Doubling falls
+        back to hitting or standing after the first two cards."""
+        if pair_points is not None:
+            action = self._rows[PAIR][pair_points][upcard]
+        else:
+            action = self._rows[SOFT if hand.is_soft else HARD][hand.value][upcard]
+
+        if hand.cards != 2:
+            if action == DOUBLE_OR_HIT:
+                return HIT
+            if action == DOUBLE_OR_STAND:
+                return STAND
+        return action
+
+    def decide_all(
+        self,
+        values: np.ndarray,
+        soft: np.ndarray,
+        upcards: np.ndarray,
+        pair_points: np.ndarray,
+        first_decision: np.ndarray,
+    ) -> np.ndarray:
+        """decide for arrays of hands, with pair_points 0 where a hand can't be split."""
+        action = np.where(
+            pair_points > 0,
+            self.tables[PAIR, pair_points, upcards],
+            self.tables[np.where(soft, SOFT, HARD), values, upcards],
+        )
+        action[(action == DOUBLE_OR_HIT) & ~first_decision] = HIT
+        action[(action == DOUBLE_OR_STAND) & ~first_decision] = STAND
+        return action
+
+
+def _rows(text: str) -> Dict[int, str]:
+    rows = {}
+    for line in text.strip().splitlines():
+        total, row = line.split()
+        rows[int(total)] = row
+    return rows
+
+
+# simulate_blackjack's original player: hit below 17, never double or split.
+# Pairs play as their two-card total.
+NAIVE = Strategy(
+    "naive",
+    hard=_rows("""
+        16 HHHHHHHHHH
+        17 SSSSSSSSSS
+    """),
+    soft=_rows("""
+        16 HHHHHHHHHH
+        17 SSSSSSSSSS
+    """),
+    pairs=_rows("""
+        2  HHHHHHHHHH
+        9  SSSSSSSSSS
+        11 HHHHHHHHHH
+    """),
+)
+
+# Multi-deck basic strategy, dealer stands on soft 17, double after split allowed.
+BASIC = Strategy(
+    "basic",
+    hard=_rows("""
+        8  HHHHHHHHHH
+        9  HDDDDHHHHH
+        10 DDDDDDDDHH
+        11 DDDDDDDDDH
+        12 HHSSSHHHHH
+        13 SSSSSHHHHH
+        17 SSSSSSSSSS
+    """),
+    soft=_rows("""
+        12 HHHHHHHHHH
+        13 HHHDDHHHHH
+        15 HHDDDHHHHH
+        17 HDDDDHHHHH
+        18 SXXXXSSHHH
+        19 SSSSSSSSSS
+    """),
+    pairs=_rows("""
+        2  PPPPPPHHHH
+        3  PPPPPPHHHH
+        4  HHHPPHHHHH
+        5  DDDDDDDDHH
+        6  PPPPPHHHHH
+        7  PPPPPPHHHH
+        8  PPPPPPPPPP
+        9  PPPPPSPPSS
+        10 SSSSSSSSSS
+        11 PPPPPPPPPP
+    """),
+)
+
+STRATEGIES = {strategy.name: strategy for strategy in (NAIVE, BASIC)}
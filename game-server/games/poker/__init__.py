@@ -1 +1,3 @@
 from .sim import simulate_poker
+from .equity import poker_equity
+from .importance import hand_frequencies
@@ -0,0 +1,230 @@
+# equity.py
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import combinations
+from math import comb
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from .hand_evaluation import CARD_INDEX, KICKER_BITS, deck_template, evaluate_boards, rank_values, ranks
+from ..rng import GameRNG, default_rng
+
+BOARD_CARDS = 5
+HOLE_CARDS = 2
+# Most deals enumerate_equity plays out before poker_equity samples instead:
+# any board from the turn on or known hands on the flop are exact, known
+# hands preflop (1,712,304 boards heads-up) and one hand on the flop against
+# a random opponent (1,070,190 deals) are sampled.
+MAX_ENUMERATION = 250_000
+CHUNK_SIZE = 100_000
+
+CARD_RANKS = np.array([rank_values[card[:-1]] for card in deck_template], dtype=np.int64)
+
+
+@dataclass
+class PokerEquity:
+    holeCards: List[List[str]]
+    board: List[str]
+    equity: List[float]
+    method: str
+    deals: int
+    stdError: float
+
+
+def preflop_class(hole_cards: List[str]) -> str:
+    """The hand's one of 169 preflop classes, e.g. 'AA', 'AKs' or 'T9o'."""
+    high, low = sorted(hole_cards, key=lambda card: rank_values[card[:-1]], reverse=True)
+    if high[:-1] == low[:-1]:
+        return high[:-1] * 2
+    return high[:-1] + low[:-1] + ('s' if high[-1] == low[-1] else 'o')
+
+
+def preflop_classes() -> Dict[str, List[str]]:
+    """Every preflop class with one representative hand."""
+    classes = {}
+    for high, low in combinations(reversed(ranks), 2):
+        classes[high + low + 's'] = [high + 'H', low + 'H']
+        classes[high + low + 'o'] = [high + 'H', low + 'D']
+    for rank in ranks:
+        classes[rank * 2] = [rank + 'H', rank + 'D']
+    return classes
+
+
+def pot_shares(boards: np.ndarray, hole_cards: np.ndarray) -> np.ndarray:
+    """(G, S) share of the pot each seat wins on each table, with equal hands
+    broken by hole cards as in showdown_strength and true ties split."""
+    strengths, _ = evaluate_boards(boards, hole_cards)
+    hole_ranks = np.sort(CARD_RANKS[hole_cards], axis=2)
+    strengths = (strengths << 2 * KICKER_BITS) | (hole_ranks[:, :, 1] << KICKER_BITS) | hole_ranks[:, :, 0]
+    winners = strengths == strengths.max(axis=1, keepdims=True)
+    return winners / winners.sum(axis=1, keepdims=True)
+
+
+def _tables(known: np.ndarray, board: np.ndarray, dealt: np.ndarray, opponent: bool) -> Tuple[np.ndarray, np.ndarray]:
+    # dealt holds each deal's unknown cards: the random opponent's hole cards
+    # first when there is one, then the rest of the board.
+    deals = len(dealt)
+    hole_cards = np.broadcast_to(known, (deals, *known.shape))
+    if opponent:
+        hole_cards = np.concatenate([hole_cards, dealt[:, None, :HOLE_CARDS]], axis=1)
+        dealt = dealt[:, HOLE_CARDS:]
+    boards = np.concatenate([np.broadcast_to(board, (deals, len(board))), dealt], axis=1)
+    return boards, hole_cards
+
+
+def enumeration_size(known_cards: int, board_cards: int, opponent: bool) -> int:
+    remaining = len(deck_template) - known_cards - board_cards
+    missing = BOARD_CARDS - board_cards
+    if opponent:
+        return comb(remaining, HOLE_CARDS) * comb(remaining - HOLE_CARDS, missing)
+    return comb(remaining, missing)
+
+
+def enumerate_equity(known: np.ndarray, board: np.ndarray, opponent: bool) -> Tuple[np.ndarray, int]:
+    """Pot shares over every way to deal the rest of the board (and the random
+    opponent's hole cards). Returns the equities and the number of deals."""
+    rest = np.setdiff1d(np.arange(len(deck_template)), np.concatenate([known.ravel(), board]))
+    missing = BOARD_CARDS - len(board)
+    opponent_hands = list(combinations(range(len(rest)), HOLE_CARDS)) if opponent else [()]
+
+    shares = np.zeros(len(known) + opponent)
+    deals = 0
+    for opponent_hand in opponent_hands:
+        others = np.delete(rest, opponent_hand)
+        runouts = np.array(list(combinations(others, missing)), dtype=np.int64).reshape(-1, missing)
+        dealt = np.concatenate([np.broadcast_to(rest[list(opponent_hand)], (len(runouts), len(opponent_hand))), runouts], axis=1)
+        for start in range(0, len(dealt), CHUNK_SIZE):
+            shares += pot_shares(*_tables(known, board, dealt[start:start + CHUNK_SIZE], opponent)).sum(axis=0)
+        deals += len(dealt)
+    return shares / deals, deals
+
+
+def _sample_shares(rng: GameRNG, known: np.ndarray, board: np.ndarray, opponent: bool, deals: int) -> Tuple[np.ndarray, np.ndarray]:
+    rng = rng.numpy
+    rest = np.setdiff1d(np.arange(len(deck_template)), np.concatenate([known.ravel(), board]))
+    unknown = BOARD_CARDS - len(board) + HOLE_CARDS * opponent
+
+    shares = np.zeros(len(known) + opponent)
+    squares = np.zeros_like(shares)
+    for start in range(0, deals, CHUNK_SIZE):
+        size = min(CHUNK_SIZE, deals - start)
+        # The cards with the smallest random keys, in key order, are a
+        # uniformly random ordered draw from the rest of the deck.
+        keys = rng.random((size, len(rest)))
+        drawn = np.argpartition(keys, unknown - 1, axis=1)[:, :unknown]
+        drawn = np.take_along_axis(drawn, np.take_along_axis(keys, drawn, axis=1).argsort(axis=1), axis=1)
+        dealt = rest[drawn]
+        chunk = pot_shares(*_tables(known, board, dealt, opponent))
+        shares += chunk.sum(axis=0)
+        squares += (chunk ** 2).sum(axis=0)
+    return shares, squares
+
+
+def sample_equity(
+    known: np.ndarray,
+    board: np.ndarray,
+    opponent: bool,
+    deals: int,
+    workers: int = 1,
+    rng: Optional[GameRNG] = None,
+) -> Tuple[np.ndarray, float]:
+    """Monte Carlo pot shares over random deals of the rest of the board (and
+    the random opponent's hole cards), split across a pool of worker
+    processes with their own RNG streams. Returns the equities and the
+    largest standard error among them."""
+    streams = (rng or default_rng()).spawn(workers)
+    counts = [deals // workers + (worker < deals % workers) for worker in range(workers)]
+
+    if workers == 1:
+        parts = [_sample_shares(streams[0], known, board, opponent, deals)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(
+                _sample_shares,
+                streams,
+                [known] * workers,
+                [board] * workers,
+                [opponent] * workers,
+                counts,
+            ))
+
+    shares = sum(part[0] for part in parts) / deals
+    squares = sum(part[1] for part in parts) / deals
+    std_error = np.sqrt(np.maximum(squares - shares ** 2, 0) / deals)
+    return shares, float(std_error.max())
+
+
+def poker_equity(
+    hole_cards: List[List[str]],
+    board: Optional[List[str]] = None,
+    deals: int = 200_000,
+    workers: int = 1,
+    rng: Optional[GameRNG] = None,
+) -> PokerEquity:
+    """Each hand's expected share of the pot at showdown, under this game's
+    showdown rules (equal hands are split by hole cards, then tie).
+
+    With a single hand it plays heads-up against a random opponent, whose
+    equity is listed last. A single hand without a board is looked up in
+    the precomputed PREFLOP_EQUITY table. Otherwise every remaining deal is
+    played out when there are at most MAX_ENUMERATION of them, and deals
+    random deals are sampled across workers processes when there are more.
+    """
+    from .preflop_equity import PREFLOP_DEALS, PREFLOP_EQUITY
+
+    board = list(board or [])
+    if not hole_cards or any(len(hole) != HOLE_CARDS for hole in hole_cards):
+        raise ValueError(f'Every hand must hold {HOLE_CARDS} hole cards')
+    if len(board) > BOARD_CARDS or len(board) in (1, 2):
+        raise ValueError('The board must hold 0, 3, 4 or 5 cards')
+    cards = [card for hole in hole_cards for card in hole] + board
+    if any(card not in CARD_INDEX for card in cards):
+        raise ValueError(f'Cards must be in {deck_template}')
+    if len(set(cards)) != len(cards):
+        raise ValueError('A card cannot be dealt twice')
+    opponent = len(hole_cards) == 1
+    if len(hole_cards) + opponent > len(deck_template) // HOLE_CARDS - BOARD_CARDS:
+        raise ValueError('Too many hands for one deck')
+    if deals < 1 or workers < 1:
+        raise ValueError('Deals and workers must be positive')
+
+    if opponent and not board:
+        equity = PREFLOP_EQUITY[preflop_class(hole_cards[0])]
+        return PokerEquity(
+            holeCards=[hole_cards[0], []],
+            board=board,
+            equity=[equity, 1 - equity],
+            method='preflop_table',
+            deals=PREFLOP_DEALS,
+            stdError=(equity * (1 - equity) / PREFLOP_DEALS) ** 0.5,
+        )
+
+    known = np.array([[CARD_INDEX[card] for card in hole] for hole in hole_cards], dtype=np.int64)
+    board_cards = np.array([CARD_INDEX[card] for card in board], dtype=np.int64)
+    if enumeration_size(len(cards) - len(board), len(board), opponent) <= MAX_ENUMERATION:
+        shares, played = enumerate_equity(known, board_cards, opponent)
+        method, std_error = 'exact', 0.0
+    else:
+        shares, std_error = sample_equity(known, board_cards, opponent, deals, workers, rng)
+        method, played = 'monte_carlo', deals
+
+    return PokerEquity(
+        holeCards=hole_cards + [[]] * opponent,
+        board=board,
+        equity=shares.tolist(),
+        method=method,
+        deals=played,
+        stdError=std_error,
+    )
+
+
+def preflop_equity_table(deals: int, workers: int = 1, rng: Optional[GameRNG] = None) -> Dict[str, float]:
+    """Heads-up preflop equity of every class against a random hand, sampled
+    with deals deals per class. preflop_equity.py holds its output."""
+    rng = rng or default_rng()
+    no_board = np.empty(0, dtype=np.int64)
+    table = {}
+    for name, hand in preflop_classes().items():
+        known = np.array([[CARD_INDEX[card] for card in hand]], dtype=np.int64)
+        shares, _ = sample_equity(known, no_board, True, deals, workers, rng)
+        table[name] = float(shares[0])
+    return table
@@ -1,13 +1,328 @@
 # hand_evaluation.py
-from typing import List, Tuple
+from itertools import combinations_with_replacement
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 
 suits = ['H', 'D', 'C', 'S']
 ranks = ['2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A']
 deck_template = [rank + suit for suit in suits for rank in ranks]
 rank_values = {rank: index for index, rank in enumerate(ranks, start=2)}
+hand_values = {
+    'hc': 1,
+    'pa': 2,
+    'tp': 3,
+    'toak': 4,
+    'st': 5,
+    'fl': 6,
+    'fh': 7,
+    'foak': 8,
+    'sf': 9,
+    'rf': 10
+}
+hand_names = {value: hand for hand, value in hand_values.items()}
+
+# Hand strengths are single integers: the category value above 28 bits of
+# kickers, 4 bits each from the most significant down, zero padded. Comparing
+# two strengths compares categories, then kickers in order.
+KICKER_BITS = 4
+MAX_KICKERS = 7
+CATEGORY_SHIFT = KICKER_BITS * MAX_KICKERS
+
+# A hand's rank multiset is hashed perfectly as the sum of 5 ** (rank - 2)
+# over its cards (a rank appears at most four times, so digits never carry).
+# Suits are counted the same way in 3-bit fields to spot a flush; CARD_KEYS
+# carries both, so one sum over the cards gives the two keys.
+RANK_KEYS = {card: 5 ** (rank_values[card[:-1]] - 2) for card in deck_template}
+SUIT_KEYS = {card: 1 << (3 * suits.index(card[-1])) for card in deck_template}
+SUIT_KEY_BITS = 3 * len(suits)
+SUIT_KEY_MASK = (1 << SUIT_KEY_BITS) - 1
+CARD_KEYS = {card: (RANK_KEYS[card] << SUIT_KEY_BITS) | SUIT_KEYS[card] for card in deck_template}
+RANK_BITS = {card: 1 << (rank_values[card[:-1]] - 2) for card in deck_template}
+# Flushes are looked up under the rank key plus FLUSH_KEY (or 2 * FLUSH_KEY
+# when the flush suit holds T-J-Q-K-A).
+FLUSH_KEY = 5 ** len(ranks)
+ROYAL_BITS = sum(1 << (rank_values[rank] - 2) for rank in 'TJQKA')
+MIN_CARDS, MAX_CARDS = 5, 7
+
+
+def pack_strength(hand_value: int, high_cards: List[int]) -> int:
+    strength = hand_value
+    for position in range(MAX_KICKERS):
+        strength = (strength << KICKER_BITS) | (high_cards[position] if position < len(high_cards) else 0)
+    return strength
+
+
+def hand_category(strength: int) -> str:
+    return hand_names[strength >> CATEGORY_SHIFT]
+
+
+def unpack_strength(strength: int) -> Tuple[str, List[int]]:
+    high_cards = [(strength >> (KICKER_BITS * position)) & 0xF for position in range(MAX_KICKERS - 1, -1, -1)]
+    return hand_category(strength), [card for card in high_cards if card]
+
+
+STRAIGHT_MASKS = np.array([0x1F << low for low in range(9)] + [0b1000000001111])
+
+
+def _top_ranks(available: np.ndarray, number: int) -> np.ndarray:
+    # The `number` highest ranks marked in each row of a (hands, 13) mask.
+    order = np.argsort(~available[:, ::-1], axis=1, kind='stable')[:, :number]
+    return np.where(np.take_along_axis(available[:, ::-1], order, axis=1), 14 - order, 0)
+
+
+def _classify(hands: np.ndarray, counts: np.ndarray) -> List[np.ndarray]:
+    """The evaluate_hand cascade, vectorized over hands given as ascending
+    rank indices (rank - 2) with their per-rank counts. Returns the strengths
+    of every hand as a non-flush, a flush and a royal flush. Matching the
+    cascade's helpers, the kickers of quads, trips, two pair and a pair come
+    from all 13 ranks, not just the ranks held."""
+    held = counts > 0
+    mask = held @ (1 << np.arange(len(ranks)))
+    straight = ((mask[:, None] & STRAIGHT_MASKS) == STRAIGHT_MASKS).any(axis=1)
+    quads, trips, pairs = counts == 4, counts == 3, counts == 2
+    pair_count = pairs.sum(axis=1)
+
+    def padded(*columns):
+        high_cards = np.zeros((len(hands), MAX_KICKERS), dtype=np.int64)
+        at = 0
+        for column in columns:
+            column = column.reshape(len(hands), -1)
+            high_cards[:, at:at + column.shape[1]] = column
+            at += column.shape[1]
+        return high_cards
+
+    all_ranks = padded(hands[:, ::-1] + 2)
+    top_trips = _top_ranks(trips, 1)
+    top_pairs = _top_ranks(pairs, 3)
+    # Two pair lists every pair (two or three of them), then one kicker.
+    two_pair = padded(top_pairs)
+    two_pair[np.arange(len(hands)), np.minimum(pair_count, 3)] = _top_ranks(~pairs, 1)[:, 0]
+    high_cards = {
+        'foak': padded(_top_ranks(quads, 1), _top_ranks(~quads, 1)),
+        'fh': padded(top_trips, top_pairs[:, :1]),
+        'toak': padded(top_trips, _top_ranks(~trips, 2)),
+        'tp': two_pair,
+        'pa': padded(top_pairs[:, :1], _top_ranks(~pairs, 3)),
+    }
+
+    weights = 1 << (KICKER_BITS * np.arange(MAX_KICKERS - 1, -1, -1))
+    strengths = []
+    for flush, royal in ((False, False), (True, False), (True, True)):
+        conditions = [
+            np.full(len(hands), royal),
+            flush & straight,
+            quads.any(axis=1),
+            trips.any(axis=1) & (pair_count > 0),
+            np.full(len(hands), flush),
+            straight,
+            trips.any(axis=1),
+            pair_count >= 2,
+            pair_count == 1,
+        ]
+        names = ['rf', 'sf', 'foak', 'fh', 'fl', 'st', 'toak', 'tp', 'pa']
+        hand_value = np.select(conditions, [hand_values[name] for name in names], hand_values['hc'])
+        cards = all_ranks.copy()
+        for name, table in high_cards.items():
+            cards[hand_value == hand_values[name]] = table[hand_value == hand_values[name]]
+        strengths.append((hand_value << CATEGORY_SHIFT) | (cards @ weights))
+
+    return strengths
+
+
+def _build_strengths() -> Dict[int, int]:
+    strengths = {}
+    for size in range(MIN_CARDS, MAX_CARDS + 1):
+        hands = np.array(list(combinations_with_replacement(range(len(ranks)), size)))
+        counts = np.zeros((len(hands), len(ranks)), dtype=np.int64)
+        np.add.at(counts, (np.arange(len(hands))[:, None], hands), 1)
+        possible = counts.max(axis=1) <= 4
+        hands, counts = hands[possible], counts[possible]
+
+        plain, flush, royal = _classify(hands, counts)
+        keys = counts @ (5 ** np.arange(len(ranks)))
+        can_flush = (counts > 0).sum(axis=1) >= 5
+        can_royal = (counts[:, -5:] > 0).all(axis=1)
+
+        strengths.update(zip(keys.tolist(), plain.tolist()))
+        strengths.update(zip((keys[can_flush] + FLUSH_KEY).tolist(), flush[can_flush].tolist()))
+        strengths.update(zip((keys[can_royal] + 2 * FLUSH_KEY).tolist(), royal[can_royal].tolist()))
+    return strengths
+
+
+HAND_STRENGTHS = _build_strengths()
+# Suit-count key (3 bits per suit) -> the suit holding 5+ cards, if any.
+FLUSH_SUITS = [
+    next((suit for index, suit in enumerate(suits) if (key >> (3 * index)) & 7 >= 5), None)
+    for key in range(1 << SUIT_KEY_BITS)
+]
+
+
+# The same tables as arrays for evaluate_hands: keys sorted for searchsorted,
+# and per-card keys and rank bits by deck_template index.
+STRENGTH_KEYS = np.array(sorted(HAND_STRENGTHS), dtype=np.int64)
+STRENGTH_VALUES = np.array([HAND_STRENGTHS[key] for key in STRENGTH_KEYS.tolist()], dtype=np.int64)
+CARD_INDEX = {card: index for index, card in enumerate(deck_template)}
+CARD_KEY_ARRAY = np.array([CARD_KEYS[card] for card in deck_template], dtype=np.int64)
+CARD_RANK_BITS = np.array([RANK_BITS[card] for card in deck_template], dtype=np.int64)
+CARD_SUITS = np.array([suits.index(card[-1]) for card in deck_template])
+FLUSH_SUIT_INDEX = np.array([-1 if suit is None else suits.index(suit) for suit in FLUSH_SUITS])
+# Rank mask (bit rank - 2) -> mask of the ranks that would complete a
+# straight it does not already hold, for draw detection.
+STRAIGHT_OUTS = [
+    0 if any(mask & straight == straight for straight in STRAIGHT_MASKS.tolist())
+    else sum(straight & ~mask for straight in STRAIGHT_MASKS.tolist() if bin(straight & ~mask).count('1') == 1)
+    for mask in range(1 << len(ranks))
+]
+
+
+def _flush_key(suited: int) -> int:
+    # Lookup offset for a flush whose suit holds these ranks.
+    return 2 * FLUSH_KEY if suited & ROYAL_BITS == ROYAL_BITS else FLUSH_KEY
+
+
+def hand_strength(cards: List[str]) -> int:
+    """Comparable integer strength of 5 to 7 cards, e.g. ['AH', 'KH', ...]."""
+    keys = sum(map(CARD_KEYS.__getitem__, cards))
+    key = keys >> SUIT_KEY_BITS
+    flush_suit = FLUSH_SUITS[keys & SUIT_KEY_MASK]
+    if flush_suit is not None:
+        key += _flush_key(sum(RANK_BITS[card] for card in cards if card[-1] == flush_suit))
+    return HAND_STRENGTHS[key]
+
+
+def board_strengths(board: List[str], hole_cards: List[List[str]]) -> List[int]:
+    """hand_strength of the board with each seat's hole cards. The board's
+    keys and per-suit rank masks are summed once, so each seat only adds its
+    own cards."""
+    board_keys = sum(map(CARD_KEYS.__getitem__, board))
+    board_suited = dict.fromkeys(suits, 0)
+    for card in board:
+        board_suited[card[-1]] += RANK_BITS[card]
+
+    strengths = []
+    for hole in hole_cards:
+        keys = board_keys + sum(map(CARD_KEYS.__getitem__, hole))
+        key = keys >> SUIT_KEY_BITS
+        flush_suit = FLUSH_SUITS[keys & SUIT_KEY_MASK]
+        if flush_suit is not None:
+            key += _flush_key(board_suited[flush_suit] + sum(RANK_BITS[card] for card in hole if card[-1] == flush_suit))
+        strengths.append(HAND_STRENGTHS[key])
+    return strengths
+
+
+class HandState:
+    """A hand evaluated as its cards arrive, e.g. the hole cards and then the
+    flop, turn and river. Adding a card updates the lookup key and suit rank
+    masks, so the current strength and draws cost O(1) per card instead of a
+    fresh evaluation on every street."""
+    __slots__ = ('keys', 'suited', 'cards')
+
+    def __init__(self, cards: List[str] = ()):
+        self.keys = 0
+        self.suited = dict.fromkeys(suits, 0)
+        self.cards = 0
+        for card in cards:
+            self.add(card)
+
+    def add(self, card: str) -> 'HandState':
+        if self.cards == MAX_CARDS:
+            raise ValueError(f'A hand holds at most {MAX_CARDS} cards')
+        self.keys += CARD_KEYS[card]
+        self.suited[card[-1]] += RANK_BITS[card]
+        self.cards += 1
+        return self
+
+    @property
+    def strength(self) -> Optional[int]:
+        """hand_strength of the cards so far, None before there are five."""
+        if self.cards < MIN_CARDS:
+            return None
+        key = self.keys >> SUIT_KEY_BITS
+        flush_suit = FLUSH_SUITS[self.keys & SUIT_KEY_MASK]
+        if flush_suit is not None:
+            key += _flush_key(self.suited[flush_suit])
+        return HAND_STRENGTHS[key]
+
+    @property
+    def flush_draw(self) -> bool:
+        # Four cards of one suit.
+        return any((self.keys >> (3 * index)) & 7 == 4 for index in range(len(suits)))
+
+    @property
+    def straight_outs(self) -> int:
+        """Mask (bit rank - 2) of the ranks that would complete a straight."""
+        return STRAIGHT_OUTS[self.suited['H'] | self.suited['D'] | self.suited['C'] | self.suited['S']]
+
+    @property
+    def draws(self) -> List[str]:
+        draws = ['flush'] if self.flush_draw else []
+        outs = bin(self.straight_outs).count('1')
+        if outs:
+            draws.append('open_ended' if outs > 1 else 'gutshot')
+        return draws
+
+
+def card_indices(hands: List[List[str]]) -> np.ndarray:
+    """Card strings to deck_template indices, e.g. for evaluate_hands."""
+    return np.array([[CARD_INDEX[card] for card in hand] for hand in hands], dtype=np.int64)
+
+
+def evaluate_boards(boards: np.ndarray, hole_cards: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """board_strengths for G boards at once: boards is a (G, B) array and
+    hole_cards a (G, S, H) array of deck_template card indices, with 5 to 7
+    cards per seat in all. Returns (G, S) strengths and hand_values codes.
+    """
+    boards, hole_cards = np.asarray(boards, dtype=np.int64), np.asarray(hole_cards, dtype=np.int64)
+    if boards.ndim != 2 or hole_cards.ndim != 3 or len(boards) != len(hole_cards):
+        raise ValueError('Boards must be a (G, B) and hole cards a (G, S, H) array of card indices')
+    if not MIN_CARDS <= boards.shape[1] + hole_cards.shape[2] <= MAX_CARDS:
+        raise ValueError(f'Every seat must hold {MIN_CARDS} to {MAX_CARDS} cards with the board')
+    for cards in (boards, hole_cards):
+        if cards.size and (cards.min() < 0 or cards.max() >= len(deck_template)):
+            raise ValueError(f'Card indices must be in [0, {len(deck_template)})')
+
+    # No card may appear twice on a table: its one-bit masks would then carry.
+    card_bits = np.concatenate([boards, hole_cards.reshape(len(boards), -1)], axis=1)
+    card_bits = np.left_shift(np.int64(1), card_bits)
+    if np.any(card_bits.sum(axis=1) != np.bitwise_or.reduce(card_bits, axis=1)):
+        raise ValueError('A table must not repeat a card')
+
+    keys = CARD_KEY_ARRAY[boards].sum(axis=1)[:, None] + CARD_KEY_ARRAY[hole_cards].sum(axis=2)
+    key = keys >> SUIT_KEY_BITS
+    flush_suit = FLUSH_SUIT_INDEX[keys & SUIT_KEY_MASK]
+    tables, seats = np.nonzero(flush_suit >= 0)
+    if len(tables):
+        suit = flush_suit[tables, seats, None]
+        board_cards, hole = boards[tables], hole_cards[tables, seats]
+        suited = (
+            np.where(CARD_SUITS[board_cards] == suit, CARD_RANK_BITS[board_cards], 0).sum(axis=1)
+            + np.where(CARD_SUITS[hole] == suit, CARD_RANK_BITS[hole], 0).sum(axis=1)
+        )
+        key[tables, seats] += np.where(suited & ROYAL_BITS == ROYAL_BITS, 2 * FLUSH_KEY, FLUSH_KEY)
+
+    strengths = STRENGTH_VALUES[np.searchsorted(STRENGTH_KEYS, key)]
+    return strengths, strengths >> CATEGORY_SHIFT
+
+
+def evaluate_hands(cards: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """hand_strength for an (N, 5 to 7) array of deck_template card indices.
+
+    Returns the strengths and the hand_values code of every hand.
+    """
+    cards = np.asarray(cards)
+    if cards.ndim != 2:
+        raise ValueError(f'Hands must be an (N, {MIN_CARDS}-{MAX_CARDS}) array of card indices')
+    strengths, hand_value = evaluate_boards(cards, np.empty((len(cards), 1, 0), dtype=np.int64))
+    return strengths[:, 0], hand_value[:, 0]
 
 
 def evaluate_hand(cards: List[str]) -> Tuple[str, List[int]]:
+    if MIN_CARDS <= len(cards) <= MAX_CARDS:
+        return unpack_strength(hand_strength(cards))
+    return evaluate_hand_cascade(cards)
+
+
+def evaluate_hand_cascade(cards: List[str]) -> Tuple[str, List[int]]:
     if is_royal_flush(cards):
         return 'rf', get_high_cards(cards)
     elif is_straight_flush(cards):
@@ -0,0 +1,183 @@
+# importance.py
+from dataclasses import dataclass
+from itertools import combinations
+from math import comb
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from .hand_evaluation import STRAIGHT_MASKS, deck_template, evaluate_boards, hand_names, hand_values, ranks, suits
+from ..rng import GameRNG, default_rng
+
+HAND_CARDS = 7
+BOARD_CARDS = 5
+HOLE_CARDS = 2
+
+# Tilted deals draw the first seat's seven cards from a mixture of the
+# uniform deal and deals that force a premium pattern into them: five cards
+# of one suit, a straight flush or four of a kind, the rest uniform. Keeping
+# the uniform deal in the mixture bounds every likelihood ratio by
+# 1 / TILT_SHARES['uniform'].
+TILT_SHARES = {'uniform': 0.25, 'flush': 0.25, 'straight_flush': 0.25, 'quads': 0.25}
+
+# Card indices by suit and rank (deck_template is ordered suit-major).
+_SUIT_CARDS = np.arange(len(deck_template)).reshape(len(suits), len(ranks))
+STRAIGHT_FLUSH_PATTERNS = np.array([
+    _SUIT_CARDS[suit, [rank for rank in range(len(ranks)) if straight >> rank & 1]]
+    for suit in range(len(suits)) for straight in STRAIGHT_MASKS.tolist()
+])
+QUADS_PATTERNS = _SUIT_CARDS.T.copy()
+FLUSH_PATTERNS = np.array([
+    _SUIT_CARDS[suit, list(chosen)] for suit in range(len(suits)) for chosen in combinations(range(len(ranks)), 5)
+])
+PATTERNS = {'flush': FLUSH_PATTERNS, 'straight_flush': STRAIGHT_FLUSH_PATTERNS, 'quads': QUADS_PATTERNS}
+PATTERN_MASKS = {
+    name: np.left_shift(np.int64(1), patterns).sum(axis=1) for name, patterns in PATTERNS.items()
+}
+_FIVE_SUBSETS = np.array([comb(count, 5) for count in range(HAND_CARDS + 1)])
+
+UNIFORM_PROBABILITY = 1 / comb(len(deck_template), HAND_CARDS)
+
+
+@dataclass
+class HandFrequency:
+    hand: str
+    frequency: float
+    stdError: float
+    hits: int
+    meanNetWin: Optional[float] = None
+
+
+@dataclass
+class HandFrequencies:
+    hands: int
+    seats: int
+    tilted: bool
+    frequencies: List[HandFrequency]
+
+
+def _pattern_density(cards: np.ndarray, name: str) -> np.ndarray:
+    # Probability of the component drawing each seven-card set: the share of
+    # its patterns the set contains, each filled out uniformly from the rest.
+    patterns = PATTERNS[name]
+    size = patterns.shape[1]
+    if name == 'flush':
+        # A set with n cards of a suit holds C(n, 5) of its five-card patterns.
+        suit_counts = (cards[:, :, None] // len(ranks) == np.arange(len(suits))).sum(axis=1)
+        contained = _FIVE_SUBSETS[suit_counts].sum(axis=1)
+    else:
+        masks = np.left_shift(np.int64(1), cards).sum(axis=1)
+        contained = ((masks[:, None] & PATTERN_MASKS[name]) == PATTERN_MASKS[name]).sum(axis=1)
+    return contained / len(patterns) / comb(len(deck_template) - size, HAND_CARDS - size)
+
+
+def tilted_weights(cards: np.ndarray, shares: Dict[str, float] = TILT_SHARES) -> np.ndarray:
+    """Likelihood ratio of the uniform deal to the tilted mixture for each
+    (N, 7) row of card indices dealt as a seat's hole cards and board."""
+    density = shares['uniform'] * UNIFORM_PROBABILITY
+    for name in PATTERNS:
+        density = density + shares.get(name, 0) * _pattern_density(cards, name)
+    return UNIFORM_PROBABILITY / density
+
+
+def deal_tilted(
+    rng: np.random.Generator,
+    num_games: int,
+    seats: int = 2,
+    shares: Dict[str, float] = TILT_SHARES,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Deals num_games tables with the first seat's hole cards and board from
+    the tilted mixture and every other seat's hole cards uniformly from the
+    rest of the deck. Returns (G, 5) boards, (G, seats, 2) hole cards and
+    the (G,) likelihood-ratio weights that make weighted averages over the
+    tables unbiased for the uniform deal."""
+    names = list(shares)
+    probabilities = np.array([shares[name] for name in names], dtype=float)
+    if np.any(probabilities < 0) or probabilities.sum() <= 0 or shares.get('uniform', 0) <= 0:
+        raise ValueError('Tilt shares must be non-negative with a positive uniform share')
+    component = rng.choice(len(names), num_games, p=probabilities / probabilities.sum())
+
+    # Cards come off the deck in order of random keys; forced cards are
+    # pushed ahead of the rest so they land in the first seat's seven.
+    keys = rng.random((num_games, len(deck_template)))
+    for index, name in enumerate(names):
+        if name == 'uniform':
+            continue
+        games = np.nonzero(component == index)[0]
+        patterns = PATTERNS[name][rng.integers(0, len(PATTERNS[name]), len(games))]
+        keys[games[:, None], patterns] -= 1
+    order = keys.argsort(axis=1)
+
+    # The seven cards are shuffled so forced cards are as likely to be hole
+    # cards as board cards.
+    hand = np.take_along_axis(order[:, :HAND_CARDS], rng.random((num_games, HAND_CARDS)).argsort(axis=1), axis=1)
+    others = order[:, HAND_CARDS:HAND_CARDS + HOLE_CARDS * (seats - 1)].reshape(num_games, seats - 1, HOLE_CARDS)
+    hole_cards = np.concatenate([hand[:, None, :HOLE_CARDS], others], axis=1)
+    return hand[:, HOLE_CARDS:], hole_cards, tilted_weights(hand, shares)
+
+
+def deal_uniform(rng: np.random.Generator, num_games: int, seats: int = 2) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    order = rng.random((num_games, len(deck_template))).argsort(axis=1)
+    hole_cards = order[:, BOARD_CARDS:BOARD_CARDS + HOLE_CARDS * seats].reshape(num_games, seats, HOLE_CARDS)
+    return order[:, :BOARD_CARDS], hole_cards, np.ones(num_games)
+
+
+def weighted_frequencies(
+    codes: np.ndarray,
+    weights: np.ndarray,
+    net_wins: Optional[np.ndarray] = None,
+) -> List[HandFrequency]:
+    """Share of hands in each category from the hand_values codes of the
+    first seat of tables dealt with these weights, with its standard error
+    and, given the seat's net wins, the mean net win of a hand in that
+    category. Only the first seat's cards are tilted, so the other seats
+    would add variance without adding rare hands."""
+    frequencies = []
+    for value in sorted(hand_names, reverse=True):
+        hits = codes == value
+        weighted = weights * hits
+        mean_net_win = None
+        if net_wins is not None and hits.any():
+            mean_net_win = float((weighted * net_wins).sum() / weighted.sum())
+        frequencies.append(HandFrequency(
+            hand=hand_names[value],
+            frequency=float(weighted.mean()),
+            stdError=float(weighted.std(ddof=1) / np.sqrt(len(codes))),
+            hits=int(hits.sum()),
+            meanNetWin=mean_net_win,
+        ))
+    return frequencies
+
+
+def hand_frequencies(
+    num_hands: int,
+    seats: int = 2,
+    tilted: bool = True,
+    rng: Optional[GameRNG] = None,
+    chunk_size: int = 100_000,
+) -> HandFrequencies:
+    """Frequency of each hand category over num_hands tables, dealt tilted
+    toward rare hands and reweighted, or uniformly."""
+    if num_hands < 2 or not 1 <= seats <= 10:
+        raise ValueError('Need at least 2 hands and 1 to 10 seats')
+    rng = (rng or default_rng()).numpy
+    codes, weights = [], []
+    for start in range(0, num_hands, chunk_size):
+        size = min(chunk_size, num_hands - start)
+        boards, hole_cards, chunk_weights = deal_tilted(rng, size, seats) if tilted else deal_uniform(rng, size, seats)
+        codes.append(evaluate_boards(boards, hole_cards[:, :1])[1][:, 0])
+        weights.append(chunk_weights)
+
+    return HandFrequencies(
+        hands=num_hands,
+        seats=seats,
+        tilted=tilted,
+        frequencies=weighted_frequencies(np.concatenate(codes), np.concatenate(weights)),
+    )
+
+
+def results_report(results: Sequence) -> List[HandFrequency]:
+    """weighted_frequencies over simulate_poker results, with each hand's
+    mean net win by best hand; tilted results carry their weights."""
+    codes = np.array([hand_values[result.players[0].bestHand] for result in results])
+    net_wins = np.array([result.players[0].netWin for result in results])
+    weights = np.array([result.weight for result in results])
+    return weighted_frequencies(codes, weights, net_wins)
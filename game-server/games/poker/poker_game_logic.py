@@ -1,9 +1,13 @@
 # poker_game_logic.py
 import random
 import hashlib
+import threading
 import datetime
-from typing import List, Dict, Tuple, Any
-from .hand_evaluation import evaluate_hand
+from typing import List, Dict, Optional, Sequence, Tuple, Any
+from .hand_evaluation import KICKER_BITS, HandState, board_strengths, evaluate_hand, hand_category, hand_values, pack_strength
+from .equity import preflop_class
+from .preflop_equity import PREFLOP_EQUITY
+from ..rng import default_rng
 
 behaviors = ['High Gambler', 'Safe Player', 'Low Baller']
 win_options = ['All in', 'Showdown', 'Forfeit', 'Fold']
@@ -14,22 +18,16 @@ suits = ['H', 'D', 'C', 'S']
 ranks = ['2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A']
 deck_template = [rank + suit for suit in suits for rank in ranks]
 rank_values = {rank: index for index, rank in enumerate(ranks, start=2)}
-hand_values = {
-    'hc': 1,
-    'pa': 2,
-    'tp': 3,
-    'toak': 4,
-    'st': 5,
-    'fl': 6,
-    'fh': 7,
-    'foak': 8,
-    'sf': 9,
-    'rf': 10
-}
+MIN_BUY_IN, MAX_BUY_IN = 5000, 40000
+MIN_SEATS, MAX_SEATS = 2, 10
+RAKE = 5
+INITIAL_BETS = 10
+# Community cards showing in each betting round: preflop, flop, turn, river.
+STREET_CARDS = (0, 3, 4, 5)
 
 
 class Player:
-    def __init__(self, player_id: str, name: str, behavior: str):
+    def __init__(self, player_id: str, name: str, behavior: str, rng: Optional[random.Random] = None):
         self.player_id = player_id
         self.name = name
         self.behavior = behavior
@@ -38,10 +36,21 @@ class Player:
         self.forfeited = False
         self.bets_made = 0
         self.net_win = 0
-        self.chips = random.randint(5000, 40000)
+        self.chips = (rng or default_rng()).randint(MIN_BUY_IN, MAX_BUY_IN)
+        self.rebuys = 0
 
-    def deal_hole_cards(self, deck: List[str]) -> None:
-        self.hole_cards = random.sample(deck, 2)
+    def new_hand(self, rng: Optional[random.Random] = None) -> None:
+        self.hole_cards = []
+        self.folded = False
+        self.forfeited = False
+        self.bets_made = 0
+        # A player who can't cover the minimum bet buys back in.
+        if self.chips < MIN_BUY_IN:
+            self.chips = (rng or default_rng()).randint(MIN_BUY_IN, MAX_BUY_IN)
+            self.rebuys += 1
+
+    def deal_hole_cards(self, deck: List[str], rng: Optional[random.Random] = None) -> None:
+        self.hole_cards = (rng or default_rng()).sample(deck, 2)
         for card in self.hole_cards:
             deck.remove(card)
 
@@ -60,96 +69,186 @@ def generate_player_id(name: str) -> str:
     return full_hash[:25]
 
 
-def create_player_pool(num_players: int) -> Dict[str, Player]:
+def create_player_pool(num_players: int, rng: Optional[random.Random] = None) -> Dict[str, Player]:
+    rng = rng or default_rng()
     player_pool: Dict[str, Player] = {}
     for i in range(num_players):
         name = f"Player {i+1}"
         player_id = generate_player_id(name)
-        behavior = random.choice(behaviors)
-        player_pool[player_id] = Player(player_id, name, behavior)
+        behavior = rng.choice(behaviors)
+        player_pool[player_id] = Player(player_id, name, behavior, rng)
     return player_pool
 
 
-def draw_cards(deck: List[str], num: int) -> List[str]:
-    return random.sample(deck, num)
+class PlayerRegistry:
+    """A long-lived pool of players with stable ids whose chips and net wins
+    carry over from hand to hand. Seats are sampled from a list, so seating a
+    table costs O(seats) however large the pool is.
 
+    Requests share the pool across threads: hold lock from seating a hand
+    until it is settled, and from split until update."""
 
-def generate_hole_and_community_cards(player_1: Player, player_2: Player) -> Tuple[List[str], List[str], List[str]]:
-    deck = deck_template.copy()
-    random.shuffle(deck)
+    def __init__(self, num_players: int = 0, players: Optional[List[Player]] = None, rng: Optional[random.Random] = None):
+        if players is None:
+            players = list(create_player_pool(num_players, rng).values())
+        self.players: List[Player] = players
+        self.by_id: Dict[str, Player] = {player.player_id: player for player in self.players}
+        self.lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+    def split(self, parts: int) -> List[List[Player]]:
+        """Deals the players out into parts disjoint groups, e.g. one per
+        worker process so no player sits at two workers' tables."""
+        return [self.players[part::parts] for part in range(parts)]
 
-    player_1.deal_hole_cards(deck)
-    player_2.deal_hole_cards(deck)
+    def update(self, players: List[Player]) -> None:
+        """Takes back the state of players that were played elsewhere, such
+        as copies returned from a worker process."""
+        index = {player.player_id: position for position, player in enumerate(self.players)}
+        for player in players:
+            self.players[index[player.player_id]] = player
+            self.by_id[player.player_id] = player
 
-    community_cards = draw_cards(deck, 5)
+    def seat(self, seats: int = 2, rng: Optional[random.Random] = None) -> List[Player]:
+        rng = rng or default_rng()
+        players = rng.sample(self.players, seats)
+        for player in players:
+            player.new_hand(rng)
+        return players
+
+
+player_registry = PlayerRegistry(100)
+
+
+def draw_cards(deck: List[str], num: int, rng: Optional[random.Random] = None) -> List[str]:
+    return (rng or default_rng()).sample(deck, num)
+
+
+def generate_hole_and_community_cards(player_1: Player, player_2: Player) -> Tuple[List[str], List[str], List[str]]:
+    (player_1.hole_cards, player_2.hole_cards), community_cards = deal_cards(2)
     return player_1.hole_cards, player_2.hole_cards, community_cards
 
 
-def determine_winner(hand1: str, hand2: str, hand1_high_cards: List[int], hand2_high_cards: List[int], hole_cards_p1: List[str], hole_cards_p2: List[str]) -> str:
-    if hand_values[hand1] > hand_values[hand2]:
+def showdown_strength(strength: int, hole_cards: List[str]) -> int:
+    # Equal hands are split by the players' hole cards, highest first.
+    for rank in sorted((rank_values[card[:-1]] for card in hole_cards), reverse=True):
+        strength = (strength << KICKER_BITS) | rank
+    return strength
+
+
+def compare_strengths(strength_p1: int, strength_p2: int) -> str:
+    if strength_p1 > strength_p2:
         return "p1"
-    elif hand_values[hand1] < hand_values[hand2]:
+    elif strength_p1 < strength_p2:
         return "p2"
-    else:
-        for h1, h2 in zip(hand1_high_cards, hand2_high_cards):
-            if h1 > h2:
-                return "p1"
-            elif h1 < h2:
-                return "p2"
-
-        hole_card_values_p1 = sorted([rank_values[card[:-1]] for card in hole_cards_p1], reverse=True)
-        hole_card_values_p2 = sorted([rank_values[card[:-1]] for card in hole_cards_p2], reverse=True)
+    return "tie"
 
-        for h1, h2 in zip(hole_card_values_p1, hole_card_values_p2):
-            if h1 > h2:
-                return "p1"
-            elif h1 < h2:
-                return "p2"
 
-        return "tie"
+def determine_winner(hand1: str, hand2: str, hand1_high_cards: List[int], hand2_high_cards: List[int], hole_cards_p1: List[str], hole_cards_p2: List[str]) -> str:
+    # High cards are compared pairwise up to the shorter list, as zip did.
+    compared = min(len(hand1_high_cards), len(hand2_high_cards))
+    return compare_strengths(
+        showdown_strength(pack_strength(hand_values[hand1], hand1_high_cards[:compared]), hole_cards_p1),
+        showdown_strength(pack_strength(hand_values[hand2], hand2_high_cards[:compared]), hole_cards_p2),
+    )
+
+
+def settle_pots(contributions: List[float], strengths: List[Optional[int]], rake: float = RAKE) -> Tuple[List[float], List[Dict[str, Any]], float]:
+    """Splits the chips put in by each seat into a main pot and side pots, one
+    layer per distinct contribution. Each pot goes to the highest showdown
+    strength among the seats that paid into it and are still in the hand
+    (strength None means folded), shared equally on a tie, less the rake. A
+    layer only one seat paid into, or that every seat in it folded, is
+    returned unraked.
+
+    Returns each seat's payout, the pots (amount and winning seats) and the
+    house earnings.
+    """
+    payouts = [0.0] * len(contributions)
+    pots: List[Dict[str, Any]] = []
+    house_earnings = 0.0
+    previous = 0
+    for level in sorted(set(contributions)):
+        paid_in = [seat for seat, contribution in enumerate(contributions) if contribution >= level]
+        amount = (level - previous) * len(paid_in)
+        previous = level
+        contenders = [seat for seat in paid_in if strengths[seat] is not None]
+
+        if len(paid_in) == 1 or not contenders:
+            for seat in paid_in:
+                payouts[seat] += amount / len(paid_in)
+            continue
+
+        best = max(strengths[seat] for seat in contenders)
+        winners = [seat for seat in contenders if strengths[seat] == best]
+        raked = amount * rake / 100
+        house_earnings += raked
+        for seat in winners:
+            payouts[seat] += (amount - raked) / len(winners)
+        if pots and pots[-1]["winners"] == winners:
+            pots[-1]["amount"] += amount
+        else:
+            pots.append({"amount": amount, "winners": winners})
+
+    return payouts, pots, house_earnings
+
+
+def settle_players(players: List[Player], bets: List[int], strengths: List[Optional[int]]) -> Tuple[List[float], List[Dict[str, Any]], float]:
+    # Every seat pays the initial blind on top of its bets.
+    contributions = [INITIAL_BETS + bet for bet in bets]
+    payouts, pots, house_earnings = settle_pots(contributions, strengths)
+    net_wins = [payout - contribution for payout, contribution in zip(payouts, contributions)]
+    for player, bet, net_win in zip(players, bets, net_wins):
+        player.bets_made = bet
+        player.net_win += net_win
+        player.chips = round(player.chips + net_win)
+    return net_wins, pots, house_earnings
 
 
 def generate_winnings(winner: str, player1: Player, player2: Player, player1_bets: int, player2_bets: int) -> Tuple[float, float, float, float, float, float]:
-    rake = 5
-    initial_bets = 10
-    total_pot = player1_bets + player2_bets + (initial_bets * 2)
-    house_earnings = total_pot * (rake / 100)
-    player1_netwin = 0
-    player2_netwin = 0
-    total_chips_dist = total_pot - house_earnings
-
-    if winner == "p1":
-        player1_netwin = total_chips_dist - (initial_bets + player1_bets)
-        player2_netwin = -1 * (player2_bets + initial_bets)
-    elif winner == "p2":
-        player2_netwin = total_chips_dist - (initial_bets + player2_bets)
-        player1_netwin = -1 * (player1_bets + initial_bets)
-    elif winner == "tie":
-        player1_netwin, player2_netwin =  (total_chips_dist - player1_bets) / 2
+    strengths = {"p1": [1, 0], "p2": [0, 1], "tie": [0, 0]}[winner]
+    (player1_netwin, player2_netwin), _, house_earnings = settle_players([player1, player2], [player1_bets, player2_bets], strengths)
+    total_pot = player1_bets + player2_bets + (INITIAL_BETS * 2)
+    return player1_netwin, player2_netwin, house_earnings, total_pot, RAKE, INITIAL_BETS
 
-    player1.net_win += player1_netwin
-    player2.net_win += player2_netwin
 
-    return player1_netwin, player2_netwin, house_earnings, total_pot, rake, initial_bets
+def place_table_bets(players: List[Player], win_option: str, rng: Optional[random.Random] = None) -> List[int]:
+    if win_option == 'All in':
+        return [player.chips for player in players]
+    bet = (rng or default_rng()).randint(MIN_BUY_IN, min(players[0].chips, MAX_BUY_IN))
+    # Everyone else matches the first bet or goes all-in with less.
+    return [bet] + [min(bet, player.chips) for player in players[1:]]
 
 
 def place_bets(player1: Player, player2: Player, win_option: str) -> Tuple[int, int]:
-    if win_option == 'All in':
-        player1_bets = player1.chips
-        player2_bets = player2.chips
-    else:
-        player1_bets = random.randint(5000, min(player1.chips, 40000))
-        player2_bets = min(player1_bets, player2.chips)  # Match player1's bet or go all-in if player2 has less chips
-
+    player1_bets, player2_bets = place_table_bets([player1, player2], win_option)
     return player1_bets, player2_bets
 
 
-def generate_employee_id() -> str:
-    return hashlib.sha256(str(random.getrandbits(256)).encode()).hexdigest()[:6]
+def street_leader(players: List[Player], community_cards: List[str], rounds: int) -> int:
+    """Seat holding the strongest cards in betting round `rounds` (1-4).
+    Preflop seats are ranked by heads-up preflop equity; from the flop on
+    each seat's HandState takes the new street's cards and is ranked by its
+    hand so far, split by hole cards as at showdown."""
+    if rounds == 1:
+        return max(range(len(players)), key=lambda seat: PREFLOP_EQUITY[preflop_class(players[seat].hole_cards)])
+
+    states = [HandState(player.hole_cards) for player in players]
+    for card in community_cards[:STREET_CARDS[rounds - 1]]:
+        for state in states:
+            state.add(card)
+    return max(range(len(players)), key=lambda seat: showdown_strength(states[seat].strength, players[seat].hole_cards))
 
 
-def game_details(rounds: int) -> Dict[str, Any]:
-    game_id = hashlib.sha256(str(random.getrandbits(256)).encode()).hexdigest()[:24]
+def generate_employee_id(rng: Optional[random.Random] = None) -> str:
+    return hashlib.sha256(str((rng or default_rng()).getrandbits(256)).encode()).hexdigest()[:6]
+
+
+def game_details(rounds: int, rng: Optional[random.Random] = None) -> Dict[str, Any]:
+    rng = rng or default_rng()
+    game_id = hashlib.sha256(str(rng.getrandbits(256)).encode()).hexdigest()[:24]
     dealer_behaviors = ['Sus', 'Sus', 'Good', 'Good', 'Good', 'Good', 'Good', 'Good']
     dealer_ids = {
         "Dealer01": {"behavior": "Sus", "employeeId": "a1b2c3"},
@@ -161,11 +260,11 @@ def game_details(rounds: int) -> Dict[str, Any]:
         "Dealer07": {"behavior": "Good", "employeeId": "s9t0u1"},
         "Dealer08": {"behavior": "Good", "employeeId": "v2w3x4"}
     }
-    selected_dealer = random.choice(list(dealer_ids.keys()))
+    selected_dealer = rng.choice(list(dealer_ids.keys()))
     selected_dealer_behavior = dealer_ids[selected_dealer]['behavior']
     selected_dealer_employee_id = dealer_ids[selected_dealer]['employeeId']
     datetime_start = datetime.datetime.now().replace(microsecond=0)
-    datetime_end = (datetime_start + datetime.timedelta(minutes=random.randint(5, 10) * rounds)).replace(microsecond=0)
+    datetime_end = (datetime_start + datetime.timedelta(minutes=rng.randint(5, 10) * rounds)).replace(microsecond=0)
 
     return {
         "game_id": game_id,
@@ -178,67 +277,87 @@ def game_details(rounds: int) -> Dict[str, Any]:
     }
 
 
-def generate_poker_hand() -> Dict[str, Any]:
-    player_pool = create_player_pool(100)
-    player_ids = random.sample(list(player_pool.keys()), 2)
-    player_1 = player_pool[player_ids[0]]
-    player_2 = player_pool[player_ids[1]]
-    hole_cards_p1, hole_cards_p2, community_cards = generate_hole_and_community_cards(player_1, player_2)
-    best_hand_p1, high_cards_p1 = evaluate_hand(hole_cards_p1 + community_cards)
-    best_hand_p2, high_cards_p2 = evaluate_hand(hole_cards_p2 + community_cards)
-    win_option = random.choices(win_options, wo_probabilities)[0]
-    player1_bets, player2_bets = place_bets(player_1, player_2, win_option)
-
-    if win_option == 'Showdown':
-        rounds = 4
-    else:
-        rounds = random.randint(1, 4)
-
-    if win_option in ['All in', 'Showdown']:
-        winner = determine_winner(best_hand_p1, best_hand_p2, high_cards_p1, high_cards_p2, hole_cards_p1, hole_cards_p2)
-    elif win_option == 'Forfeit':
-        player_1.forfeit()
-        winner = "p2"
-    elif win_option == 'Fold':
-        player_1.fold()
-        winner = "p2"
-
-    player1_netwin, player2_netwin, house_earnings, total_pot, rake, initial_bets = generate_winnings(winner, player_1, player_2, player1_bets, player2_bets)
-
-    game_info = game_details(rounds)
-
-    game_data = {
-        "gameID": game_info['game_id'],
-        "datetime_start": game_info['datetime_start'].strftime("%Y-%m-%d %H:%M:%S"),
-        "datetime_end": game_info['datetime_end'].strftime("%Y-%m-%d %H:%M:%S"),
-        "employeeDealerId": game_info['selected_dealer_employee_id'],
-        "totalRounds": rounds,
-        "winType": win_option.lower(),
-        "winner": player_1.player_id if winner == "p1" else player_2.player_id,
-        "totalPot": total_pot,
-        "initialBlind": initial_bets,
-        "rake": rake,
-        "players": [
-            {
-                "playerId": player_1.player_id,
-                "holeCards": player_1.hole_cards,  # Ensure these are strings
-                "startingChips": player_1.chips,
-                "bestHand": best_hand_p1,
-                "netWin": player1_netwin
-            },
-            {
-                "playerId": player_2.player_id,
-                "holeCards": player_2.hole_cards,  # Ensure these are strings
-                "startingChips": player_2.chips,
-                "bestHand": best_hand_p2,
-                "netWin": player2_netwin
+def deal_cards(seats: int = 2, rng: Optional[random.Random] = None) -> Tuple[List[List[str]], List[str]]:
+    """Deals hole cards for every seat and the community cards, before anyone is seated."""
+    if not MIN_SEATS <= seats <= MAX_SEATS:
+        raise ValueError(f'A table seats {MIN_SEATS} to {MAX_SEATS} players')
+    cards = (rng or default_rng()).sample(deck_template, 2 * seats + 5)
+    return [cards[2 * seat:2 * seat + 2] for seat in range(seats)], cards[-5:]
+
+
+def generate_poker_hand(deal: Optional[Tuple[List[List[str]], List[str]]] = None, strengths: Optional[Sequence[int]] = None, seats: int = 2, registry: Optional[PlayerRegistry] = None, rng: Optional[random.Random] = None) -> Dict[str, Any]:
+    # Cards from deal_cards can be passed in with every seat's strength, e.g.
+    # from one evaluate_boards call over many hands. Players are only seated
+    # here, so one player can sit at several of those hands in turn.
+    rng = rng or default_rng()
+    hole_cards, community_cards = deal if deal is not None else deal_cards(seats, rng)
+    registry = registry if registry is not None else player_registry
+    with registry.lock:
+        players = registry.seat(len(hole_cards), rng)
+        for player, cards in zip(players, hole_cards):
+            player.hole_cards = cards
+        if strengths is None:
+            strengths = board_strengths(community_cards, hole_cards)
+        strengths = [int(strength) for strength in strengths]
+        starting_chips = [player.chips for player in players]
+        win_option = rng.choices(win_options, wo_probabilities)[0]
+        bets = place_table_bets(players, win_option, rng)
+
+        if win_option == 'Showdown':
+            rounds = 4
+        else:
+            rounds = rng.randint(1, 4)
+
+        # On a forfeit or fold everyone but the seat leading on the last street
+        # played gives up the hand.
+        if win_option in ('Forfeit', 'Fold'):
+            leader = street_leader(players, community_cards, rounds)
+            for seat, player in enumerate(players):
+                if seat == leader:
+                    continue
+                if win_option == 'Forfeit':
+                    player.forfeit()
+                else:
+                    player.fold()
+
+        showdown = [
+            None if player.folded or player.forfeited else showdown_strength(strength, player.hole_cards)
+            for player, strength in zip(players, strengths)
+        ]
+        net_wins, pots, house_earnings = settle_players(players, bets, showdown)
+
+        game_info = game_details(rounds, rng)
+
+        game_data = {
+            "gameID": game_info['game_id'],
+            "datetime_start": game_info['datetime_start'].strftime("%Y-%m-%d %H:%M:%S"),
+            "datetime_end": game_info['datetime_end'].strftime("%Y-%m-%d %H:%M:%S"),
+            "employeeDealerId": game_info['selected_dealer_employee_id'],
+            "totalRounds": rounds,
+            "winType": win_option.lower(),
+            "winner": players[pots[0]["winners"][0]].player_id,
+            "totalPot": sum(bets) + INITIAL_BETS * len(players),
+            "initialBlind": INITIAL_BETS,
+            "rake": RAKE,
+            "players": [
+                {
+                    "playerId": player.player_id,
+                    "holeCards": player.hole_cards,  # Ensure these are strings
+                    "startingChips": chips,
+                    "bestHand": hand_category(strength),
+                    "netWin": net_win
+                }
+                for player, chips, strength, net_win in zip(players, starting_chips, strengths, net_wins)
+            ],
+            "pots": [
+                {"amount": pot["amount"], "winners": [players[seat].player_id for seat in pot["winners"]]}
+                for pot in pots
+            ],
+            "communityCards": {
+                "flop": [{"rank": card[:-1], "suit": card[-1]} for card in community_cards[:3]],
+                "turn": {"rank": community_cards[3][:-1], "suit": community_cards[3][-1]},
+                "river": {"rank": community_cards[4][:-1], "suit": community_cards[4][-1]}
             }
-        ],
-        "communityCards": {
-            "flop": [{"rank": card[:-1], "suit": card[-1]} for card in community_cards[:3]],
-            "turn": {"rank": community_cards[3][:-1], "suit": community_cards[3][-1]},
-            "river": {"rank": community_cards[4][:-1], "suit": community_cards[4][-1]}
         }
-    }
 
-    return game_data
+        return game_data
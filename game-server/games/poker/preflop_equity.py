@@ -0,0 +1,177 @@
+# preflop_equity.py
+# Heads-up equity of each preflop class against a random hand, under the
+# game's showdown rules. Generated by
+# equity.preflop_equity_table(deals=500_000, rng=GameRNG(169)).
+PREFLOP_DEALS = 500_000
+
+PREFLOP_EQUITY = {
+    'AA': 0.8553,
+    'KK': 0.8257,
+    'QQ': 0.7985,
+    'JJ': 0.7733,
+    'TT': 0.7473,
+    '99': 0.7165,
+    '88': 0.6855,
+    'AKs': 0.6770,
+    'AQs': 0.6685,
+    'AJs': 0.6603,
+    'AKo': 0.6590,
+    '77': 0.6546,
+    'ATs': 0.6540,
+    'AQo': 0.6513,
+    'AJo': 0.6423,
+    'KQs': 0.6395,
+    'A9s': 0.6362,
+    'ATo': 0.6353,
+    'KJs': 0.6325,
+    'A8s': 0.6275,
+    '66': 0.6259,
+    'KTs': 0.6248,
+    'KQo': 0.6202,
+    'A7s': 0.6188,
+    'A9o': 0.6167,
+    'KJo': 0.6126,
+    'A8o': 0.6098,
+    'QJs': 0.6073,
+    'K9s': 0.6071,
+    'A6s': 0.6046,
+    'KTo': 0.6039,
+    'A5s': 0.6031,
+    'QTs': 0.6007,
+    'A7o': 0.5995,
+    '55': 0.5977,
+    'A4s': 0.5909,
+    'K8s': 0.5893,
+    'QJo': 0.5862,
+    'A6o': 0.5848,
+    'K9o': 0.5847,
+    'Q9s': 0.5839,
+    'A5o': 0.5832,
+    'K7s': 0.5829,
+    'JTs': 0.5814,
+    'QTo': 0.5793,
+    'A3s': 0.5785,
+    'K6s': 0.5717,
+    'K8o': 0.5688,
+    'A4o': 0.5687,
+    'Q8s': 0.5659,
+    'A2s': 0.5658,
+    'J9s': 0.5634,
+    'K5s': 0.5632,
+    '44': 0.5622,
+    'Q9o': 0.5613,
+    'K7o': 0.5607,
+    'JTo': 0.5575,
+    'A3o': 0.5568,
+    'Q7s': 0.5498,
+    'K4s': 0.5491,
+    'K6o': 0.5490,
+    'J8s': 0.5472,
+    'T9s': 0.5452,
+    'Q8o': 0.5430,
+    'A2o': 0.5429,
+    'Q6s': 0.5427,
+    'J9o': 0.5392,
+    'K5o': 0.5383,
+    'K3s': 0.5367,
+    'Q5s': 0.5315,
+    'J7s': 0.5299,
+    'T8s': 0.5294,
+    '33': 0.5279,
+    'Q7o': 0.5246,
+    'K4o': 0.5244,
+    'K2s': 0.5229,
+    'J8o': 0.5225,
+    'T9o': 0.5205,
+    'Q4s': 0.5194,
+    'Q6o': 0.5169,
+    '98s': 0.5134,
+    'T7s': 0.5130,
+    'K3o': 0.5121,
+    'J6s': 0.5106,
+    'Q3s': 0.5065,
+    'Q5o': 0.5061,
+    'T8o': 0.5041,
+    'J5s': 0.5035,
+    'J7o': 0.5024,
+    'K2o': 0.4974,
+    '97s': 0.4964,
+    'T6s': 0.4946,
+    '22': 0.4932,
+    'Q4o': 0.4929,
+    'Q2s': 0.4921,
+    'J4s': 0.4895,
+    '98o': 0.4862,
+    'T7o': 0.4855,
+    'J6o': 0.4843,
+    '87s': 0.4836,
+    'Q3o': 0.4791,
+    '96s': 0.4782,
+    'J3s': 0.4777,
+    'J5o': 0.4763,
+    'T5s': 0.4755,
+    '97o': 0.4688,
+    'T6o': 0.4667,
+    'T4s': 0.4659,
+    '86s': 0.4658,
+    'J2s': 0.4653,
+    'Q2o': 0.4637,
+    'J4o': 0.4627,
+    '95s': 0.4607,
+    '76s': 0.4560,
+    '87o': 0.4543,
+    'T3s': 0.4524,
+    '96o': 0.4490,
+    'J3o': 0.4482,
+    '85s': 0.4473,
+    'T5o': 0.4469,
+    'T2s': 0.4406,
+    '94s': 0.4394,
+    '75s': 0.4381,
+    '86o': 0.4363,
+    'T4o': 0.4351,
+    'J2o': 0.4338,
+    '65s': 0.4313,
+    '95o': 0.4288,
+    '93s': 0.4282,
+    '84s': 0.4262,
+    '76o': 0.4242,
+    'T3o': 0.4211,
+    '74s': 0.4174,
+    '85o': 0.4157,
+    '92s': 0.4148,
+    '64s': 0.4090,
+    'T2o': 0.4080,
+    '94o': 0.4072,
+    '54s': 0.4072,
+    '75o': 0.4057,
+    '83s': 0.4041,
+    '65o': 0.3976,
+    '93o': 0.3955,
+    '73s': 0.3945,
+    '82s': 0.3934,
+    '84o': 0.3932,
+    '63s': 0.3862,
+    '53s': 0.3855,
+    '74o': 0.3840,
+    '92o': 0.3797,
+    '64o': 0.3760,
+    '54o': 0.3737,
+    '43s': 0.3717,
+    '72s': 0.3712,
+    '83o': 0.3689,
+    '52s': 0.3636,
+    '62s': 0.3635,
+    '73o': 0.3607,
+    '82o': 0.3588,
+    '63o': 0.3523,
+    '53o': 0.3513,
+    '42s': 0.3488,
+    '32s': 0.3380,
+    '43o': 0.3348,
+    '72o': 0.3346,
+    '52o': 0.3282,
+    '62o': 0.3269,
+    '42o': 0.3132,
+    '32o': 0.2986,
+}
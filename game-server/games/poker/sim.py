@@ -1,7 +1,17 @@
 # sim.py
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Dict, Union
+from typing import TYPE_CHECKING, Any, List, Dict, Optional, Tuple, Union
+import numpy as np
+from ..rng import GameRNG, default_rng
+
+if TYPE_CHECKING:
+    from .poker_game_logic import Player, PlayerRegistry
+
+# Fewest hands worth sending to a worker process; smaller requests, and every
+# single-hand request, run in the calling process.
+MIN_SHARD_GAMES = 2000
 
 
 @dataclass
@@ -33,13 +43,88 @@ class PokerResult:
     rake: float
     players: List[PlayerResult]
     communityCards: Dict[str, Union[List[CommunityCard], CommunityCard]]
+    pots: List[Dict[str, Any]]
+    # Likelihood ratio of a tilted deal (see importance.deal_tilted), 1 otherwise.
+    weight: float = 1.0
+
+
+def simulate_poker(
+    num_games: int = 1,
+    seats: int = 2,
+    workers: int = 1,
+    tilted: bool = False,
+    rng: Optional[GameRNG] = None,
+) -> List[PokerResult]:
+    # Callers opt in to workers > 1, which splits large requests into shards
+    # of at least MIN_SHARD_GAMES hands, one per worker process. Each worker
+    # draws from its own stream spawned from rng and seats its own share of
+    # the player registry, whose chips are merged back when it is done.
+    # tilted deals the first seat's cards toward rare hands, with each
+    # result's weight correcting for it in reports such as
+    # importance.results_report.
+    from .poker_game_logic import player_registry
+
+    rng = rng or default_rng()
+    workers = max(1, min(workers, num_games // MIN_SHARD_GAMES, len(player_registry) // seats))
+    if workers == 1:
+        return _simulate_games(num_games, seats, tilted=tilted, rng=rng)
+
+    counts = [num_games // workers + (worker < num_games % workers) for worker in range(workers)]
+    results = []
+    # The workers play copies of the players, so no other request may seat
+    # them until their chips are merged back.
+    with player_registry.lock:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(
+                _simulate_shard,
+                rng.spawn(workers),
+                counts,
+                [seats] * workers,
+                player_registry.split(workers),
+                [tilted] * workers,
+            ))
+
+        for shard_results, players in parts:
+            results.extend(shard_results)
+            player_registry.update(players)
+    return results
+
+
+def _simulate_shard(rng: GameRNG, num_games: int, seats: int, players: List['Player'], tilted: bool) -> Tuple[List[PokerResult], List['Player']]:
+    from .poker_game_logic import PlayerRegistry
+
+    registry = PlayerRegistry(players=players)
+    return _simulate_games(num_games, seats, registry, tilted, rng), registry.players
+
+
+def _simulate_games(
+    num_games: int,
+    seats: int,
+    registry: Optional['PlayerRegistry'] = None,
+    tilted: bool = False,
+    rng: Optional[GameRNG] = None,
+) -> List[PokerResult]:
+    from .poker_game_logic import deal_cards, generate_poker_hand
+    from .hand_evaluation import card_indices, deck_template, evaluate_boards
+    from .importance import deal_tilted
 
+    # Deal every hand first so all seats are scored in one evaluate_boards
+    # call, which sums each board's part of the lookup key once.
+    rng = rng or default_rng()
+    if tilted:
+        boards, hole_cards, weights = deal_tilted(rng.numpy, num_games, seats)
+        cards = np.array(deck_template)
+        deals = [(holes.tolist(), board.tolist()) for holes, board in zip(cards[hole_cards], cards[boards])]
+    else:
+        deals = [deal_cards(seats, rng) for _ in range(num_games)]
+        boards = card_indices([community_cards for _, community_cards in deals]).reshape(num_games, 5)
+        hole_cards = card_indices([hole for holes, _ in deals for hole in holes]).reshape(num_games, seats, 2)
+        weights = np.ones(num_games)
+    strengths, _ = evaluate_boards(boards, hole_cards)
 
-def simulate_poker(num_games: int = 1) -> List[PokerResult]:
-    from .poker_game_logic import generate_poker_hand
     results = []
-    for _ in range(num_games):
-        game_data = generate_poker_hand()
+    for deal, deal_strengths, weight in zip(deals, strengths, weights.tolist()):
+        game_data = generate_poker_hand(deal, deal_strengths, registry=registry, rng=rng)
         start_time = datetime.now()
         end_time = game_data["datetime_end"]
 
@@ -74,7 +159,9 @@ def simulate_poker(num_games: int = 1) -> List[PokerResult]:
             initialBlind=game_data["initialBlind"],
             rake=game_data["rake"],
             players=players,
-            communityCards=community_cards
+            communityCards=community_cards,
+            pots=game_data["pots"],
+            weight=weight
         )
 
         results.append(result)
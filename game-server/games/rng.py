@@ -0,0 +1,62 @@
+import os
+import random
+from typing import List, Optional, Union
+import numpy as np
+
+
+class GameRNG(random.Random):
+    """Random source shared by the simulators.
+
+    It is a random.Random for per-hand draws, with a NumPy Generator in .numpy
+    for bulk draws. Both are seeded from one SeedSequence, so a seed replays a
+    whole run, and spawn hands out independent streams for worker processes.
+    """
+
+    def __init__(self, seed: Union[None, int, np.random.SeedSequence] = None):
+        self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        python_seed, numpy_seed = self.seed_sequence.spawn(2)
+        super().__init__(int.from_bytes(python_seed.generate_state(4, np.uint64).tobytes(), 'little'))
+        self.numpy = np.random.default_rng(numpy_seed)
+
+    def spawn(self, n: int) -> List['GameRNG']:
+        return [GameRNG(seed) for seed in self.seed_sequence.spawn(n)]
+
+    def __reduce__(self):
+        # random.Random pickles only its own state; workers need the NumPy
+        # stream and the seed sequence to spawn from as well.
+        return _restore, (self.seed_sequence, self.getstate(), self.numpy.bit_generator.state)
+
+
+def _restore(seed_sequence: np.random.SeedSequence, state: tuple, numpy_state: dict) -> GameRNG:
+    rng = GameRNG.__new__(GameRNG)
+    rng.seed_sequence = seed_sequence
+    rng.setstate(state)
+    rng.numpy = np.random.default_rng(seed_sequence)
+    rng.numpy.bit_generator.state = numpy_state
+    return rng
+
+
+_default: Optional[GameRNG] = None
+
+
+def default_rng() -> GameRNG:
+    """The process's unseeded GameRNG, drawn from OS entropy once. A forked
+    worker gets a fresh one rather than replaying its parent's stream."""
+    global _default
+    if _default is None:
+        _default = GameRNG()
+    return _default
+
+
+def _reset_default() -> None:
+    global _default
+    _default = None
+
+
+os.register_at_fork(after_in_child=_reset_default)
+
+
+def game_rng(seed: Optional[int] = None) -> GameRNG:
+    """A GameRNG for one request: seeded when a seed is given, otherwise the
+    process's default."""
+    return GameRNG(seed) if seed is not None else default_rng()
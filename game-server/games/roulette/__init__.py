@@ -1 +1,2 @@
-from .sim import simulate_roulette
\ No newline at end of file
+from .sim import simulate_roulette, simulate_roulette_session
+from .batch import simulate_roulette_batch, RouletteBatchResult
@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from typing import List, Optional
+import numpy as np
+from .bet import random_bets
+from .bet.random_bet import LAYOUT_BETS, LAYOUT_MASKS, LAYOUT_PAYOUTS, LAYOUT_POCKETS, LAYOUT_TYPES
+from .game.roulette_pocket import NUM_POCKETS, WINNING_POCKETS
+from ..rng import GameRNG, default_rng
+
+
+# Columnar result: spin fields hold one entry per spin, bet fields one entry
+# per bet, with the bets of spin i at [i * bets_per_spin, (i + 1) * bets_per_spin).
+@dataclass
+class RouletteBatchResult:
+    spins: int
+    bets_per_spin: int
+    winning_pocket_number: List[int]
+    winning_pocket_color: List[str]
+    total_bet: List[float]
+    total_won: List[float]
+    bet_id: List[str]
+    bet_type: List[str]
+    bet: List[Optional[str]]
+    bet_pockets: List[Optional[List[int]]]
+    bet_amount: List[float]
+    amount_won: List[Optional[float]]
+
+
+POCKET_NUMBERS = np.array([pocket.pocket_number for pocket in WINNING_POCKETS])
+POCKET_COLORS = np.array([pocket.pocket_color.value for pocket in WINNING_POCKETS], dtype=object)
+
+
+def simulate_roulette_batch(spins: int, bets_per_spin: int = 100, rng: Optional[GameRNG] = None) -> RouletteBatchResult:
+    """spins spins of bets_per_spin bets each, drawn by random_bets and
+    settled as arrays instead of one RouletteGame per spin."""
+    rng = rng or default_rng()
+
+    slots = rng.numpy.integers(0, NUM_POCKETS, spins)
+    bets = random_bets(spins * bets_per_spin, rng)
+    layouts, bet_amount = bets.layouts, bets.bet_amount
+
+    wins = LAYOUT_MASKS[layouts, np.repeat(slots, bets_per_spin)]
+    won = bet_amount * LAYOUT_PAYOUTS[layouts] * wins
+    amount_won = won.astype(object)
+    amount_won[~wins] = None
+
+    return RouletteBatchResult(
+        spins=spins,
+        bets_per_spin=bets_per_spin,
+        winning_pocket_number=POCKET_NUMBERS[slots].tolist(),
+        winning_pocket_color=POCKET_COLORS[slots].tolist(),
+        total_bet=bet_amount.reshape(spins, bets_per_spin).sum(axis=1).tolist(),
+        total_won=won.reshape(spins, bets_per_spin).sum(axis=1).tolist(),
+        bet_id=bets.ids(rng),
+        bet_type=LAYOUT_TYPES[layouts].tolist(),
+        bet=LAYOUT_BETS[layouts].tolist(),
+        bet_pockets=LAYOUT_POCKETS[layouts].tolist(),
+        bet_amount=bet_amount.tolist(),
+        amount_won=amount_won.tolist(),
+    )
@@ -20,4 +20,4 @@ from .roulette_bet_impl import (
 )
 
 
-from .random_bet import random_bet
+from .random_bet import random_bet, random_bets, RandomBets
@@ -1,5 +1,11 @@
+from dataclasses import dataclass
+from functools import partial
 from random import Random
+import string
+from typing import Callable, List, Optional, Tuple
+import numpy as np
 from ..game import RouletteGame, PocketColor
+from ..game.roulette_pocket import POCKETS_BY_COORD
 from . import (
     RouletteBet,
     RouletteBetType,
@@ -17,133 +23,259 @@ from . import (
     ColorBet,
     OddOrEvenBet,
 )
+from ...rng import GameRNG, default_rng
 
+_BET_TYPES = list(RouletteBetType)
+_DOZENS = list(Dozen)
+_COLUMNS = list(Column)
+_HIGH_OR_LOW = list(HighOrLow)
+_COLORS = list(PocketColor)
+_ODD_OR_EVEN = [RouletteBetType.ODD, RouletteBetType.EVEN]
 
-def random_bet(game: RouletteGame) -> RouletteBet:
-    bet_type: RouletteBetType = Random().choice(list(RouletteBetType))
+
+def random_bet(game: RouletteGame, rng: Random = None) -> RouletteBet:
+    rng = rng or game.rng
+    bet_type: RouletteBetType = rng.choice(_BET_TYPES)
     if bet_type == RouletteBetType.STRAIGHT_UP:
-        return _random_straight_up_bet(game)
+        return _random_straight_up_bet(game, rng)
 
     if bet_type == RouletteBetType.SPLIT:
-        return _random_split_bet(game)
+        return _random_split_bet(game, rng)
 
     if bet_type == RouletteBetType.STREET:
-        return _random_street_bet(game)
+        return _random_street_bet(game, rng)
 
     if bet_type == RouletteBetType.FIVE_NUMBER_BET:
-        return _five_number_bet(game)
+        return _five_number_bet(game, rng)
 
     if bet_type == RouletteBetType.LINE:
-        return _random_line_bet(game)
+        return _random_line_bet(game, rng)
 
     if bet_type == RouletteBetType.DOZEN:
-        return _random_dozen_bet(game)
+        return _random_dozen_bet(game, rng)
 
     if bet_type == RouletteBetType.COLUMN:
-        return _random_column_bet(game)
+        return _random_column_bet(game, rng)
 
     if bet_type == RouletteBetType.EIGHTEEN_NUMBER_BET:
-        return _random_eighteen_number_bet(game)
+        return _random_eighteen_number_bet(game, rng)
 
     if bet_type == RouletteBetType.COLOR:
-        return _random_color_bet(game)
+        return _random_color_bet(game, rng)
 
     if bet_type == RouletteBetType.ODD:
-        return _odd_or_even_bet(game=game, is_even=False)
+        return _odd_or_even_bet(game=game, rng=rng, is_even=False)
 
     if bet_type == RouletteBetType.EVEN:
-        return _odd_or_even_bet(game=game, is_even=True)
+        return _odd_or_even_bet(game=game, rng=rng, is_even=True)
 
 
-def _random_straight_up_bet(game: RouletteGame) -> RouletteBet:
-    row = Random().randint(1, 12)
-    col = Random().randint(1, 3)
+def _random_straight_up_bet(game: RouletteGame, rng: Random) -> RouletteBet:
+    row = rng.randint(1, 12)
+    col = rng.randint(1, 3)
     random_pocket = game.pocket_from_coord(row, col)
 
     return StraightUpBet(
-        bet_amount=Random().uniform(1, 100),
+        bet_amount=rng.uniform(1, 100),
         pocket=random_pocket,
+        rng=rng,
     )
 
 
-def _random_split_bet(game: RouletteGame) -> RouletteBet:
-    row = Random().randint(1, 12)
-    col = Random().randint(1, 3)
+def _random_split_bet(game: RouletteGame, rng: Random) -> RouletteBet:
+    row = rng.randint(1, 12)
+    col = rng.randint(1, 3)
     random_pocket = game.pocket_from_coord(row, col)
     adj_rows = [i for i in [row - 1, row + 1] if i >= 1 and i <= 12]
     adj_cols = [i for i in [col - 1, col + 1] if i >= 1 and i <= 3]
 
-    should_use_row = Random().random() < 0.5
+    should_use_row = rng.random() < 0.5
 
-    cell = Random().choice(adj_rows) if should_use_row else Random().choice(adj_cols)
+    cell = rng.choice(adj_rows) if should_use_row else rng.choice(adj_cols)
     adj_row, adj_col = (cell, col) if should_use_row else (row, cell)
 
     adjacent_pocker = game.pocket_from_coord(adj_row, adj_col)
     return SplitBet(
-        bet_amount=Random().uniform(1, 100),
+        bet_amount=rng.uniform(1, 100),
         pockets=[random_pocket, adjacent_pocker],
+        rng=rng,
     )
 
 
-def _random_street_bet(game: RouletteGame) -> RouletteBet:
-    row = Random().randint(1, 12)
+def _random_street_bet(game: RouletteGame, rng: Random) -> RouletteBet:
+    row = rng.randint(1, 12)
     return StreetBet(
-        bet_amount=Random().uniform(1, 100),
+        bet_amount=rng.uniform(1, 100),
         pockets=[game.pocket_from_coord(row, col) for col in range(1, 4)],
+        rng=rng,
     )
 
 
-def _five_number_bet(game: RouletteGame) -> RouletteBet:
+def _five_number_bet(game: RouletteGame, rng: Random) -> RouletteBet:
     return FiveNumberBet(
-        bet_amount=Random().uniform(1, 100),
+        bet_amount=rng.uniform(1, 100),
+        rng=rng,
     )
 
 
-def _random_line_bet(game: RouletteGame) -> RouletteBet:
-    row = Random().randint(1, 11)
+def _random_line_bet(game: RouletteGame, rng: Random) -> RouletteBet:
+    row = rng.randint(1, 11)
     return LineBet(
-        bet_amount=Random().uniform(1, 100),
+        bet_amount=rng.uniform(1, 100),
         pockets=[game.pocket_from_coord(row, col) for col in range(1, 4)]
         + [game.pocket_from_coord(row + 1, col) for col in range(1, 4)],
+        rng=rng,
     )
 
 
-def _random_dozen_bet(game: RouletteGame) -> RouletteBet:
-    bet = Random().choice(list(Dozen))
+def _random_dozen_bet(game: RouletteGame, rng: Random) -> RouletteBet:
+    bet = rng.choice(_DOZENS)
     return DozenBet(
-        bet_amount=Random().uniform(1, 100),
+        bet_amount=rng.uniform(1, 100),
         bet=bet,
+        rng=rng,
     )
 
 
-def _random_column_bet(game: RouletteGame) -> RouletteBet:
-    bet = Random().choice(list(Column))
+def _random_column_bet(game: RouletteGame, rng: Random) -> RouletteBet:
+    bet = rng.choice(_COLUMNS)
     return ColumnBet(
-        bet_amount=Random().uniform(1, 100),
+        bet_amount=rng.uniform(1, 100),
         bet=bet,
+        rng=rng,
     )
 
 
-def _random_eighteen_number_bet(game: RouletteGame) -> RouletteBet:
-    bet = Random().choice(list(HighOrLow))
+def _random_eighteen_number_bet(game: RouletteGame, rng: Random) -> RouletteBet:
+    bet = rng.choice(_HIGH_OR_LOW)
     return EighteenNumberBet(
-        bet_amount=Random().uniform(1, 100),
+        bet_amount=rng.uniform(1, 100),
         bet=bet,
+        rng=rng,
     )
 
 
-def _random_color_bet(game: RouletteGame) -> RouletteBet:
-    color = Random().choice(list(PocketColor))
+def _random_color_bet(game: RouletteGame, rng: Random) -> RouletteBet:
+    color = rng.choice(_COLORS)
 
     return ColorBet(
-        bet_amount=Random().uniform(1, 100),
+        bet_amount=rng.uniform(1, 100),
         bet=color,
+        rng=rng,
     )
 
 
-def _odd_or_even_bet(game: RouletteGame, is_even: bool) -> RouletteBet:
-    bet = Random().choice([RouletteBetType.ODD, RouletteBetType.EVEN])
+def _odd_or_even_bet(game: RouletteGame, rng: Random, is_even: bool) -> RouletteBet:
+    bet = rng.choice(_ODD_OR_EVEN)
     return OddOrEvenBet(
-        bet_amount=Random().uniform(1, 100),
+        bet_amount=rng.uniform(1, 100),
         bet=bet,
+        rng=rng,
+    )
+
+
+def _bet_layouts() -> List[Tuple[Callable[..., RouletteBet], float]]:
+    # Every bet random_bet can place, as a constructor taking bet_amount and
+    # rng, with the probability random_bet places it: a uniform bet type,
+    # then the same choices the helpers above make for it.
+    type_share = 1 / len(_BET_TYPES)
+    cells = [(row, col) for row in range(1, 13) for col in range(1, 4)]
+    layouts = []
+
+    for row, col in cells:
+        layouts.append((partial(StraightUpBet, pocket=POCKETS_BY_COORD[row, col]), type_share / len(cells)))
+
+    for row, col in cells:
+        adj_rows = [i for i in [row - 1, row + 1] if i >= 1 and i <= 12]
+        adj_cols = [i for i in [col - 1, col + 1] if i >= 1 and i <= 3]
+        adjacent = [((cell, col), 1 / len(adj_rows)) for cell in adj_rows] + [((row, cell), 1 / len(adj_cols)) for cell in adj_cols]
+        for coord, share in adjacent:
+            pockets = [POCKETS_BY_COORD[row, col], POCKETS_BY_COORD[coord]]
+            layouts.append((partial(SplitBet, pockets=pockets), type_share / len(cells) * 0.5 * share))
+
+    for row in range(1, 13):
+        pockets = [POCKETS_BY_COORD[row, col] for col in range(1, 4)]
+        layouts.append((partial(StreetBet, pockets=pockets), type_share / 12))
+
+    layouts.append((FiveNumberBet, type_share))
+
+    for row in range(1, 12):
+        pockets = [POCKETS_BY_COORD[line, col] for line in (row, row + 1) for col in range(1, 4)]
+        layouts.append((partial(LineBet, pockets=pockets), type_share / 11))
+
+    for bet_class, choices in ((DozenBet, _DOZENS), (ColumnBet, _COLUMNS), (EighteenNumberBet, _HIGH_OR_LOW), (ColorBet, _COLORS)):
+        for choice in choices:
+            layouts.append((partial(bet_class, bet=choice), type_share / len(choices)))
+
+    # The ODD and EVEN bet types both place an odd or an even bet at random,
+    # so each of those bets takes one type's share.
+    for choice in _ODD_OR_EVEN:
+        layouts.append((partial(OddOrEvenBet, bet=choice), type_share))
+
+    return layouts
+
+
+# Lookup Tables
+# A random bet is coded by its index into these, so drawing many is one
+# weighted draw and settling them a gather from LAYOUT_MASKS.
+_LAYOUTS = _bet_layouts()
+BET_LAYOUTS = [layout for layout, _ in _LAYOUTS]
+LAYOUT_PROBABILITIES = np.array([probability for _, probability in _LAYOUTS])
+_PROTOTYPES = [layout(bet_amount=0, rng=Random(0)) for layout in BET_LAYOUTS]
+LAYOUT_MASKS = np.stack([bet.pocket_mask() for bet in _PROTOTYPES])
+LAYOUT_PAYOUTS = np.array([bet.PAYOUT for bet in _PROTOTYPES], dtype=float)
+LAYOUT_TYPES = np.array([bet.type.value for bet in _PROTOTYPES], dtype=object)
+LAYOUT_BETS = np.array([bet.bet.value if hasattr(bet, "bet") else None for bet in _PROTOTYPES], dtype=object)
+LAYOUT_POCKETS = np.empty(len(_PROTOTYPES), dtype=object)
+LAYOUT_POCKETS[:] = [
+    [pocket.pocket_number for pocket in bet.pockets] if hasattr(bet, "pockets")
+    else [bet.pocket.pocket_number] if hasattr(bet, "pocket")
+    else None
+    for bet in _PROTOTYPES
+]
+for _table in (LAYOUT_PROBABILITIES, LAYOUT_MASKS, LAYOUT_PAYOUTS):
+    _table.flags.writeable = False
+
+BET_ID_CHARS = np.array(list(string.ascii_uppercase + string.digits))
+
+
+@dataclass
+class RandomBets:
+    """
+    Bets drawn in bulk by random_bets, held as arrays
+    - [layouts]: Index of each bet into BET_LAYOUTS and the LAYOUT_* tables
+    - [bet_amount]: Amount of each bet
+    """
+
+    layouts: np.ndarray
+    bet_amount: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.layouts)
+
+    def payout_rows(self) -> np.ndarray:
+        """(bets, 38) amount each bet wins on each winning pocket slot, 0 where
+        it loses, as RouletteGame compiles one bet at a time."""
+        return LAYOUT_MASKS[self.layouts] * (self.bet_amount * LAYOUT_PAYOUTS[self.layouts])[:, None]
+
+    def ids(self, rng: Optional[GameRNG] = None) -> List[str]:
+        chars = BET_ID_CHARS[(rng or default_rng()).numpy.integers(0, len(BET_ID_CHARS), (len(self), 6))]
+        return np.char.add("RBID-", chars.view("<U6").ravel()).tolist()
+
+    def materialize(self, rng: Random = None) -> List[RouletteBet]:
+        """The bets as RouletteBet objects."""
+        rng = rng or default_rng()
+        return [
+            BET_LAYOUTS[layout](bet_amount=amount, rng=rng)
+            for layout, amount in zip(self.layouts.tolist(), self.bet_amount.tolist())
+        ]
+
+
+def random_bets(count: int, rng: Optional[GameRNG] = None) -> RandomBets:
+    """count bets drawn as arrays, with the same odds as calling random_bet
+    count times."""
+    rng = (rng or default_rng()).numpy
+    return RandomBets(
+        layouts=rng.choice(len(BET_LAYOUTS), count, p=LAYOUT_PROBABILITIES),
+        bet_amount=rng.uniform(1, 100, count),
     )
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+import numpy as np
 from .roulette_bet_type import RouletteBetType
 
 
@@ -7,7 +8,15 @@ class RouletteBet(ABC):
     type: RouletteBetType
     bet_amount: float
     amount_won: float = None
+    # Multiple of bet_amount won when the winning pocket is in pocket_mask().
+    PAYOUT: int
 
     @abstractmethod
     def compute_winnings() -> None:
         raise Exception("Unimplemented Error")
+
+    @abstractmethod
+    def pocket_mask(self) -> np.ndarray:
+        """The pockets the bet wins on, as a bool array over the 38 pocket
+        slots (slot = pocket number + 1, 00 being slot 0)."""
+        raise Exception("Unimplemented Error")
@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from random import Random
 import string
 from typing import List
+import numpy as np
 from .roulette_bet_type import (
     Column,
     Dozen,
@@ -9,12 +10,24 @@ from .roulette_bet_type import (
     RouletteBetType,
 )
 from .roulette_bet import RouletteBet
-from ..game.roulette_pocket import PocketColor, RoulettePocket, WinningPocket
+from ..game.roulette_pocket import (
+    WINNING_POCKETS,
+    PocketColor,
+    RoulettePocket,
+    WinningPocket,
+    pockets_mask,
+    winning_pocket_mask,
+)
+from ...rng import default_rng
+
+# FiveNumberBet covers 00, 0, 1, 2 and 3.
+_FIVE_NUMBER_MASK = np.array([pocket.pocket_number <= 3 for pocket in WINNING_POCKETS])
+_FIVE_NUMBER_MASK.flags.writeable = False
 
 
-def _generate_id() -> str:
+def _generate_id(rng: Random = None) -> str:
     return "RBID-" + "".join(
-        Random().choices(
+        (rng or default_rng()).choices(
             string.ascii_uppercase + string.digits,
             k=6,
         )
@@ -29,12 +42,15 @@ class StraightUpBet(RouletteBet):
     amount_won: float = None
     pocket: RoulettePocket = None
 
+    PAYOUT = 35
+
     def __init__(
         self,
         bet_amount: float,
         pocket: RoulettePocket,
+        rng: Random = None,
     ) -> None:
-        self.id = _generate_id()
+        self.id = _generate_id(rng)
         self.bet_amount = bet_amount
         self.pocket = pocket
 
@@ -42,6 +58,9 @@ class StraightUpBet(RouletteBet):
         if winning_pocket == self.pocket:
             self.amount_won = self.bet_amount * 35
 
+    def pocket_mask(self) -> np.ndarray:
+        return pockets_mask([self.pocket])
+
 
 @dataclass
 class SplitBet(RouletteBet):
@@ -51,12 +70,15 @@ class SplitBet(RouletteBet):
     amount_won: float = None
     pockets: List[RoulettePocket] = None
 
+    PAYOUT = 17
+
     def __init__(
         self,
         bet_amount: float,
         pockets: List[RoulettePocket],
+        rng: Random = None,
     ) -> None:
-        self.id = _generate_id()
+        self.id = _generate_id(rng)
         self.bet_amount = bet_amount
         self.pockets = pockets
 
@@ -64,6 +86,9 @@ class SplitBet(RouletteBet):
         if winning_pocket in self.pockets:
             self.amount_won = self.bet_amount * 17
 
+    def pocket_mask(self) -> np.ndarray:
+        return pockets_mask(self.pockets)
+
 
 @dataclass
 class StreetBet(RouletteBet):
@@ -73,12 +98,15 @@ class StreetBet(RouletteBet):
     amount_won: float = None
     pockets: List[RoulettePocket] = None
 
+    PAYOUT = 11
+
     def __init__(
         self,
         bet_amount: float,
         pockets: List[RoulettePocket],
+        rng: Random = None,
     ) -> None:
-        self.id = _generate_id()
+        self.id = _generate_id(rng)
         self.bet_amount = bet_amount
         self.pockets = pockets
 
@@ -86,6 +114,9 @@ class StreetBet(RouletteBet):
         if winning_pocket in self.pockets:
             self.amount_won = self.bet_amount * 11
 
+    def pocket_mask(self) -> np.ndarray:
+        return pockets_mask(self.pockets)
+
 
 @dataclass
 class FiveNumberBet(RouletteBet):
@@ -94,17 +125,23 @@ class FiveNumberBet(RouletteBet):
     bet_amount: float = None
     amount_won: float = None
 
+    PAYOUT = 11
+
     def __init__(
         self,
         bet_amount: float,
+        rng: Random = None,
     ) -> None:
-        self.id = _generate_id()
+        self.id = _generate_id(rng)
         self.bet_amount = bet_amount
 
     def compute_winnings(self, winning_pocket: WinningPocket):
         if winning_pocket.pocket_number <= 3:
             self.amount_won = self.bet_amount * 11
 
+    def pocket_mask(self) -> np.ndarray:
+        return _FIVE_NUMBER_MASK
+
 
 @dataclass
 class LineBet(RouletteBet):
@@ -114,12 +151,15 @@ class LineBet(RouletteBet):
     amount_won: float = None
     pockets: List[RoulettePocket] = None
 
+    PAYOUT = 5
+
     def __init__(
         self,
         bet_amount: float,
         pockets: List[RoulettePocket],
+        rng: Random = None,
     ) -> None:
-        self.id = _generate_id()
+        self.id = _generate_id(rng)
         self.bet_amount = bet_amount
         self.pockets = pockets
 
@@ -127,6 +167,9 @@ class LineBet(RouletteBet):
         if winning_pocket in self.pockets:
             self.amount_won = self.bet_amount * 5
 
+    def pocket_mask(self) -> np.ndarray:
+        return pockets_mask(self.pockets)
+
 
 @dataclass
 class DozenBet(RouletteBet):
@@ -136,12 +179,15 @@ class DozenBet(RouletteBet):
     amount_won: float = None
     bet: Dozen = None
 
+    PAYOUT = 2
+
     def __init__(
         self,
         bet_amount: float,
         bet: Dozen,
+        rng: Random = None,
     ) -> None:
-        self.id = _generate_id()
+        self.id = _generate_id(rng)
         self.bet_amount = bet_amount
         self.bet = bet
 
@@ -149,6 +195,9 @@ class DozenBet(RouletteBet):
         if winning_pocket.dozen == self.bet:
             self.amount_won = self.bet_amount * 2
 
+    def pocket_mask(self) -> np.ndarray:
+        return winning_pocket_mask("dozen", self.bet)
+
 
 @dataclass
 class ColumnBet(RouletteBet):
@@ -158,12 +207,15 @@ class ColumnBet(RouletteBet):
     amount_won: float = None
     bet: Column = None
 
+    PAYOUT = 2
+
     def __init__(
         self,
         bet_amount: float,
         bet: Column,
+        rng: Random = None,
     ) -> None:
-        self.id = _generate_id()
+        self.id = _generate_id(rng)
         self.bet_amount = bet_amount
         self.bet = bet
 
@@ -171,6 +223,9 @@ class ColumnBet(RouletteBet):
         if winning_pocket.column == self.bet:
             self.amount_won = self.bet_amount * 2
 
+    def pocket_mask(self) -> np.ndarray:
+        return winning_pocket_mask("column", self.bet)
+
 
 @dataclass
 class EighteenNumberBet(RouletteBet):
@@ -180,12 +235,15 @@ class EighteenNumberBet(RouletteBet):
     amount_won: float = None
     bet: HighOrLow = None
 
+    PAYOUT = 1
+
     def __init__(
         self,
         bet_amount: float,
         bet: HighOrLow,
+        rng: Random = None,
     ) -> None:
-        self.id = _generate_id()
+        self.id = _generate_id(rng)
         self.bet_amount = bet_amount
         self.bet = bet
 
@@ -193,6 +251,9 @@ class EighteenNumberBet(RouletteBet):
         if winning_pocket.high_or_low == self.bet:
             self.amount_won = self.bet_amount
 
+    def pocket_mask(self) -> np.ndarray:
+        return winning_pocket_mask("high_or_low", self.bet)
+
 
 @dataclass
 class ColorBet(RouletteBet):
@@ -202,12 +263,15 @@ class ColorBet(RouletteBet):
     amount_won: float = None
     bet: PocketColor = None
 
+    PAYOUT = 1
+
     def __init__(
         self,
         bet_amount: float,
         bet: PocketColor,
+        rng: Random = None,
     ) -> None:
-        self.id = _generate_id()
+        self.id = _generate_id(rng)
         self.bet_amount = bet_amount
         self.bet = bet
 
@@ -215,6 +279,9 @@ class ColorBet(RouletteBet):
         if winning_pocket.pocket_color == self.bet:
             self.amount_won = self.bet_amount
 
+    def pocket_mask(self) -> np.ndarray:
+        return winning_pocket_mask("pocket_color", self.bet)
+
 
 @dataclass
 class OddOrEvenBet(RouletteBet):
@@ -223,15 +290,21 @@ class OddOrEvenBet(RouletteBet):
     bet_amount: float = None
     amount_won: float = None
 
+    PAYOUT = 1
+
     def __init__(
         self,
         bet_amount: float,
         bet: RouletteBetType,
+        rng: Random = None,
     ) -> None:
-        self.id = _generate_id()
+        self.id = _generate_id(rng)
         self.bet_amount = bet_amount
         self.type = bet
 
     def compute_winnings(self, winning_pocket: WinningPocket):
         if winning_pocket.odd_or_even == self.type:
             self.amount_won = self.bet_amount
+
+    def pocket_mask(self) -> np.ndarray:
+        return winning_pocket_mask("odd_or_even", self.type)
@@ -1,2 +1,3 @@
 from .roulette_pocket import RoulettePocket, PocketColor
 from .roulette_game import RouletteGame
+from .roulette_session import RouletteSession, RouletteSessionResult
@@ -1,7 +1,20 @@
 from random import Random
 from typing import List
-from .roulette_pocket import RoulettePocket, PocketColor, WinningPocket
+import numpy as np
+from .roulette_pocket import (
+    NUM_POCKETS,
+    POCKET_NUMBERS,
+    POCKETS,
+    POCKETS_BY_COLOR,
+    POCKETS_BY_COORD,
+    WINNING_POCKETS,
+    RoulettePocket,
+    PocketColor,
+    WinningPocket,
+    pocket_slot,
+)
 from ..bet.roulette_bet import RouletteBet
+from ...rng import default_rng
 
 
 class RouletteGame:
@@ -9,18 +22,36 @@ class RouletteGame:
     __winning_pocket: WinningPocket = None
     __bets: List[RouletteBet] = []
 
-    def __init__(self):
-        self.__pockets = [RoulettePocket(pocket_number=i) for i in range(-1, 37)]
+    def __init__(self, rng: Random = None):
+        self.rng = rng or default_rng()
+        self.__pockets = POCKETS
         self.__winning_pocket = None
         self.__bets = []
+        # Each bet's payout column (amount won per winning pocket slot),
+        # compiled once when it is added into a matrix that doubles its
+        # capacity when full, so adding a bet costs amortized O(38).
+        self.__payouts = np.zeros((NUM_POCKETS, 16))
+        self.__bet_count = 0
+        # House liability by winning pocket slot, kept up to date as bets are
+        # added: what it pays out, and the stakes on the bets that win there.
+        self.__liability = np.zeros(NUM_POCKETS)
+        self.__covered_stake = np.zeros(NUM_POCKETS)
+        self.__total_stake = 0.0
 
     def spin(self):
-        self.__winning_pocket = WinningPocket(
-            pocket_number=Random().randint(-1, 36),
-        )
+        self.__winning_pocket = WINNING_POCKETS[pocket_slot(self.rng.randint(-1, 36))]
 
-        for bet in self.__bets:
-            bet.compute_winnings(self.__winning_pocket)
+        amounts_won = self.payout_matrix()[pocket_slot(self.__winning_pocket.pocket_number)]
+        winners = np.flatnonzero(amounts_won)
+        for index, amount_won in zip(winners.tolist(), amounts_won[winners].tolist()):
+            self.__bets[index].amount_won = amount_won
+
+    def payout_matrix(self) -> np.ndarray:
+        """(38, bets) amount each bet wins on each winning pocket slot, 0 where
+        it loses. Settling a spin reads one contiguous row of it."""
+        payouts = self.__payouts[:, :self.__bet_count]
+        payouts.flags.writeable = False
+        return payouts
 
     def get_winning_pocket(self) -> WinningPocket:
         return self.__winning_pocket
@@ -33,20 +64,50 @@ class RouletteGame:
 
     def clear_bets(self):
         self.__bets.clear()
+        self.__bet_count = 0
+        self.__liability[:] = 0
+        self.__covered_stake[:] = 0
+        self.__total_stake = 0.0
 
     def add_bet(self, bet: RouletteBet):
+        mask = bet.pocket_mask()
         self.__bets.append(bet)
+        if self.__bet_count == self.__payouts.shape[1]:
+            grown = np.zeros((NUM_POCKETS, 2 * self.__bet_count))
+            grown[:, :self.__bet_count] = self.__payouts
+            self.__payouts = grown
+        self.__payouts[:, self.__bet_count] = mask * (bet.bet_amount * bet.PAYOUT)
+        self.__bet_count += 1
+        self.__liability[mask] += bet.bet_amount * bet.PAYOUT
+        self.__covered_stake[mask] += bet.bet_amount
+        self.__total_stake += bet.bet_amount
+
+    def liability(self) -> np.ndarray:
+        """(38,) amount the house pays out on each winning pocket slot for the
+        bets on the table. A read-only view that follows add_bet and clear_bets."""
+        liability = self.__liability.view()
+        liability.flags.writeable = False
+        return liability
+
+    def house_net(self) -> np.ndarray:
+        """(38,) house result on each winning pocket slot: the stakes of the
+        losing bets it keeps less what it pays the winning ones."""
+        return self.__total_stake - self.__covered_stake - self.__liability
+
+    def worst_case_exposure(self) -> float:
+        """Most the house can lose on one spin, 0 if it wins on every pocket."""
+        return max(float(-self.house_net().min()), 0.0)
+
+    def expected_payout(self) -> float:
+        """Mean payout over the 38 equally likely pockets."""
+        return float(self.__liability.mean())
 
     def pocket_from_coord(self, row: int, col: int) -> RoulettePocket:
-        pocket_number = col + ((row - 1) * 3)
-        for pocket in self.__pockets:
-            if pocket_number == pocket.pocket_number:
-                return pocket
+        return POCKETS_BY_COORD.get((row, col))
 
     def pocket_from_pocket_number(self, pocket_number: int) -> RoulettePocket:
-        for pocket in self.__pockets:
-            if pocket_number == pocket.pocket_number:
-                return pocket
+        if pocket_number in POCKET_NUMBERS:
+            return self.__pockets[pocket_slot(pocket_number)]
 
     def pockets_from_color(self, color: PocketColor) -> List[RoulettePocket]:
-        return [pocket for pocket in self.__pockets if pocket.pocket_color == color]
+        return list(POCKETS_BY_COLOR[color])
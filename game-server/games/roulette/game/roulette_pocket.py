@@ -1,4 +1,7 @@
 from enum import Enum
+from functools import lru_cache
+from typing import List
+import numpy as np
 from ..bet import RouletteBetType, Dozen, Column, HighOrLow
 
 
@@ -122,3 +125,57 @@ class WinningPocket(RoulettePocket):
                 if self.pocket_number % 2 == 0
                 else RouletteBetType.ODD
             )
+
+
+# Pockets are numbered -1 (00) to 36 and kept in 38 slots, slot = number + 1,
+# so a bet compiles to a 38-slot mask of the pockets it wins on. Every game
+# shares these read-only pockets, built once with all derived attributes.
+POCKET_NUMBERS = range(-1, 37)
+NUM_POCKETS = len(POCKET_NUMBERS)
+class _ReadOnlyPocket:
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Pocket {self.pocket_number} is shared between games and read-only")
+
+
+class SharedRoulettePocket(_ReadOnlyPocket, RoulettePocket):
+    pass
+
+
+class SharedWinningPocket(_ReadOnlyPocket, WinningPocket):
+    pass
+
+
+def _shared(pocket: RoulettePocket, shared_class: type) -> RoulettePocket:
+    # Built as a normal pocket, then made read-only by switching its class.
+    pocket.__class__ = shared_class
+    return pocket
+
+
+POCKETS = tuple(_shared(RoulettePocket(pocket_number=number), SharedRoulettePocket) for number in POCKET_NUMBERS)
+WINNING_POCKETS = tuple(_shared(WinningPocket(pocket_number=number), SharedWinningPocket) for number in POCKET_NUMBERS)
+# Table layout: row 1-12, column 1-3, pocket number = column + (row - 1) * 3.
+POCKETS_BY_COORD = {
+    ((pocket.pocket_number - 1) // 3 + 1, (pocket.pocket_number - 1) % 3 + 1): pocket
+    for pocket in POCKETS
+    if pocket.pocket_number > 0
+}
+POCKETS_BY_COLOR = {color: tuple(pocket for pocket in POCKETS if pocket.pocket_color == color) for color in PocketColor}
+
+
+def pocket_slot(pocket_number: int) -> int:
+    return pocket_number + 1
+
+
+def pockets_mask(pockets: List[RoulettePocket]) -> np.ndarray:
+    mask = np.zeros(NUM_POCKETS, dtype=bool)
+    mask[[pocket_slot(pocket.pocket_number) for pocket in pockets]] = True
+    return mask
+
+
+@lru_cache(maxsize=None)
+def winning_pocket_mask(attribute: str, value) -> np.ndarray:
+    """Mask of the pockets whose WinningPocket `attribute` equals value, e.g.
+    ('dozen', Dozen.FIRST_DOZEN). Shared between bets, so read-only."""
+    mask = np.array([getattr(pocket, attribute) == value for pocket in WINNING_POCKETS])
+    mask.flags.writeable = False
+    return mask
@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from .roulette_pocket import NUM_POCKETS, POCKET_NUMBERS, pocket_slot
+from ..bet.roulette_bet import RouletteBet
+from ...rng import GameRNG, default_rng
+
+
+@dataclass
+class RouletteSessionResult:
+    spins: int
+    stake: float
+    bets: List[RouletteBet]
+    winning_pocket_number: List[int]
+    net: List[float]
+    bankroll: List[float]
+
+
+class RouletteSession:
+    """
+    A player repeating the same layout of bets spin after spin
+    - [bets]: The layout, compiled once into the player's net result for each pocket
+    - [bankroll]: The player's bankroll, carried over from one play to the next
+    """
+
+    def __init__(self, bets: Sequence[RouletteBet], bankroll: float = 0.0, rng: Optional[GameRNG] = None):
+        self.bets = list(bets)
+        self.bankroll = bankroll
+        self.rng = rng or default_rng()
+        self.stake = float(sum(bet.bet_amount for bet in self.bets))
+        # Net result of one spin by winning pocket slot: winning bets pay
+        # bet_amount * PAYOUT, losing bets lose their bet_amount.
+        net = np.zeros(NUM_POCKETS)
+        for bet in self.bets:
+            net += np.where(bet.pocket_mask(), bet.bet_amount * bet.PAYOUT, -bet.bet_amount)
+        net.flags.writeable = False
+        self.net_by_pocket = net
+
+    def settle(self, pocket_numbers: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Net result of each spin landing on these pocket numbers and the
+        running bankroll after it, in one gather and one cumulative sum."""
+        net = self.net_by_pocket[pocket_slot(np.asarray(pocket_numbers, dtype=np.int64))]
+        bankroll = self.bankroll + np.cumsum(net)
+        if len(bankroll):
+            self.bankroll = float(bankroll[-1])
+        return net, bankroll
+
+    def play(self, spins: int) -> RouletteSessionResult:
+        pocket_numbers = self.rng.numpy.integers(POCKET_NUMBERS.start, POCKET_NUMBERS.stop, spins)
+        net, bankroll = self.settle(pocket_numbers)
+        return RouletteSessionResult(
+            spins=spins,
+            stake=self.stake,
+            bets=self.bets,
+            winning_pocket_number=pocket_numbers.tolist(),
+            net=net.tolist(),
+            bankroll=bankroll.tolist(),
+        )
@@ -3,9 +3,10 @@ from dataclasses import dataclass
 
 from typing import Dict, List
 
-from .bet import random_bet, RouletteBet
+from .bet import random_bets, RouletteBet
 
-from .game import RouletteGame, RoulettePocket
+from .game import RouletteGame, RoulettePocket, RouletteSession, RouletteSessionResult
+from ..rng import GameRNG, default_rng
 
 
 @dataclass
@@ -15,10 +16,11 @@ class RouletteResult:
     bets: Dict
 
 
-def simulate_roulette() -> RouletteResult:
-    game = RouletteGame()
+def simulate_roulette(rng: GameRNG = None, num_bets: int = 100) -> RouletteResult:
+    rng = rng or default_rng()
+    game = RouletteGame(rng)
 
-    for bet in [random_bet(game) for _ in range(100)]:
+    for bet in random_bets(num_bets, rng).materialize(rng):
         game.add_bet(bet)
 
     game.spin()
@@ -30,6 +32,18 @@ def simulate_roulette() -> RouletteResult:
     )
 
 
+def simulate_roulette_session(
+    spins: int,
+    num_bets: int = 100,
+    bankroll: float = 0.0,
+    rng: GameRNG = None,
+) -> RouletteSessionResult:
+    # One random layout of num_bets bets, repeated for every spin.
+    rng = rng or default_rng()
+    session = RouletteSession(random_bets(num_bets, rng).materialize(rng), bankroll, rng)
+    return session.play(spins)
+
+
 def _bets_as_dict(bet_list: List[RouletteBet]) -> Dict:
     bets = defaultdict(list)
     for bet in bet_list:
@@ -1,36 +1,143 @@
-from fastapi import FastAPI, Query
-from games.poker import simulate_poker
+import os
+import json
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from games.poker import hand_frequencies, poker_equity, simulate_poker
 from games.bigwheel import simulate_bigwheel
-from games.baccarat import simulate_baccarat
-from games.blackjack import simulate_blackjack_games
-from games.roulette import simulate_roulette
+from games.baccarat import simulate_baccarat, simulate_baccarat_batch, simulate_baccarat_shoe, baccarat_odds
+from games.blackjack import estimate_house_edge, simulate_blackjack_games, stream_blackjack_games
+from games.roulette import simulate_roulette, simulate_roulette_batch, simulate_roulette_session
+from games.rng import game_rng
 from dataclasses import asdict
-from typing import Dict, Any
+from typing import Dict, Any, List, Literal, Optional, Union
 
 app = FastAPI()
 
 @app.get("/poker")
-def get_poker(hands:int = 1):
-    return simulate_poker(num_games=hands)
+def get_poker(
+    hands: int = Query(default=1, ge=1, le=100000),
+    seats: int = Query(default=2, ge=2, le=10),
+    workers: int = Query(default=1, ge=1, le=os.cpu_count() or 1),
+    tilted: bool = False,
+    seed: Optional[int] = None
+):
+    return simulate_poker(num_games=hands, seats=seats, workers=workers, tilted=tilted, rng=game_rng(seed))
+
+
+@app.get("/poker/hand-frequencies")
+def get_poker_hand_frequencies(
+    hands: int = Query(default=1_000_000, ge=2, le=50_000_000),
+    seats: int = Query(default=2, ge=2, le=10),
+    tilted: bool = True,
+    seed: Optional[int] = None
+):
+    return asdict(hand_frequencies(hands, seats, tilted, game_rng(seed)))
+
+
+@app.get("/poker/equity")
+def get_poker_equity(
+    hands: List[str] = Query(..., description="Hole cards per hand, e.g. AHKD; a single hand plays a random opponent"),
+    board: str = Query(default="", description="Known community cards, e.g. 2C7D9S"),
+    deals: int = Query(default=200_000, ge=1000, le=5_000_000),
+    workers: int = Query(default=1, ge=1, le=os.cpu_count() or 1),
+    seed: Optional[int] = None
+):
+    def cards(text: str) -> List[str]:
+        return [text[i:i + 2].upper() for i in range(0, len(text), 2)]
+
+    try:
+        equity = poker_equity([cards(hand) for hand in hands], cards(board), deals, workers, game_rng(seed))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return asdict(equity)
 
 @app.get("/bigwheel")
-def get_bigwheel():
-    return asdict(simulate_bigwheel())
+def get_bigwheel(seed: Optional[int] = None):
+    return asdict(simulate_bigwheel(game_rng(seed)))
 
 
 @app.get("/baccarat")
-def get_baccarat_single():
-    return asdict(simulate_baccarat())
+def get_baccarat(
+    hands: Optional[int] = Query(default=None, ge=1, le=100000),
+    seed: Optional[int] = None
+):
+    if hands is None:
+        return asdict(simulate_baccarat(rng=game_rng(seed)))
+    return asdict(simulate_baccarat_batch(hands, game_rng(seed)))
+
+
+@app.get("/baccarat/shoe")
+def get_baccarat_shoe(
+    decks: int = Query(default=8, ge=1, le=8),
+    penetration: float = Query(default=0.75, gt=0, le=1),
+    seed: Optional[int] = None
+):
+    return [asdict(hand) for hand in simulate_baccarat_shoe(decks, penetration, game_rng(seed))]
 
-@app.get("/blackjack")
+
+@app.get("/baccarat/odds")
+def get_baccarat_odds(
+    decks: int = Query(default=8, ge=1, le=8),
+    type: Literal['normal', 'rigged'] = 'normal'
+):
+    return asdict(baccarat_odds(decks=decks, type=type))
+
+@app.get("/blackjack", response_model=None)
 def get_blackjack(
     players: int = Query(default=10, ge=1, le=10000),
-    games: int = Query(default=10, ge=1, le=100000)
-) -> Dict[str, Any]:
-    simulation = simulate_blackjack_games(players, games)
+    games: int = Query(default=10, ge=1, le=100000),
+    workers: int = Query(default=1, ge=1, le=os.cpu_count() or 1),
+    decks: Optional[int] = Query(default=None, ge=1, le=8),
+    strategy: Literal['naive', 'basic'] = 'naive',
+    stream: bool = False,
+    seed: Optional[int] = None
+) -> Union[Dict[str, Any], StreamingResponse]:
+    rng = game_rng(seed)
+    if stream:
+        if workers > 1:
+            raise HTTPException(status_code=422, detail="workers cannot be combined with stream")
+        # One transaction per line (NDJSON), sent chunk by chunk as it is simulated.
+        return StreamingResponse(
+            (
+                "".join(json.dumps(transaction) + "\n" for transaction in chunk)
+                for chunk in stream_blackjack_games(players, games, decks, strategy=strategy, rng=rng)
+            ),
+            media_type="application/x-ndjson",
+        )
+
+    simulation = simulate_blackjack_games(players, games, workers, decks, strategy=strategy, rng=rng)
     return asdict(simulation)
 
 
+@app.get("/blackjack/house-edge")
+def get_blackjack_house_edge(
+    strategy: Literal['naive', 'basic'] = 'naive',
+    decks: Optional[int] = Query(default=None, ge=1, le=8),
+    penetration: float = Query(default=0.75, gt=0, le=1),
+    target_width: float = Query(default=0.01, gt=0),
+    confidence: float = Query(default=0.95, gt=0, lt=1),
+    max_hands: int = Query(default=50_000_000, ge=1, le=500_000_000),
+    seed: Optional[int] = None
+):
+    return asdict(estimate_house_edge(strategy, decks, penetration, target_width, confidence, max_hands=max_hands, rng=game_rng(seed)))
+
+
 @app.get("/roulette")
-def get_roulette():
-    return asdict(simulate_roulette())
\ No newline at end of file
+def get_roulette(
+    spins: Optional[int] = Query(default=None, ge=1, le=1_000_000),
+    bets_per_spin: int = Query(default=100, ge=1, le=1000),
+    seed: Optional[int] = None
+):
+    if spins is None:
+        return asdict(simulate_roulette(game_rng(seed), bets_per_spin))
+    return asdict(simulate_roulette_batch(spins, bets_per_spin, game_rng(seed)))
+
+
+@app.get("/roulette/session")
+def get_roulette_session(
+    spins: int = Query(default=1000, ge=1, le=1_000_000),
+    bets: int = Query(default=10, ge=1, le=1000),
+    bankroll: float = 0.0,
+    seed: Optional[int] = None
+):
+    return asdict(simulate_roulette_session(spins, bets, bankroll, game_rng(seed)))
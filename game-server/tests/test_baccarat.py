@@ -1,9 +1,14 @@
 import pytest
 import random
+import itertools
 from games.baccarat.helper_functions import build_deck, rebuild_deck, build_combinations, announce_winner, announce_bet_winner, compute_payout, play_game
-from games.baccarat.sim import simulate_baccarat
+from games.baccarat.helper_functions import CARDS, PAIR_INDICES, PAIR_VALUES, DECK_DICT, draw_banker_hand, draw_player
+from games.baccarat.helper_functions import Shoe, card_point
+from games.baccarat.sim import simulate_baccarat, simulate_baccarat_shoe
+from games.baccarat.batch import simulate_baccarat_batch
+from games.baccarat.odds import baccarat_odds
 
-random.seed = 123542
+random.seed(123542)
 
 def test_build_deck():
     deck = build_deck()
@@ -25,6 +30,29 @@ def test_build_combinations():
     assert isinstance(deck_dict, dict)
 
 
+def test_precomputed_tables():
+    card_combinations, card_combinations_df, deck_dict = build_combinations(build_deck())
+    assert len(PAIR_INDICES) == len(PAIR_VALUES) == (52 * 51)/2
+    assert dict(DECK_DICT) == deck_dict
+    assert not PAIR_VALUES.flags.writeable
+
+    with pytest.raises(TypeError):
+        DECK_DICT[('A of Hearts', 'A of Spades')] = 0
+
+
+def test_draws_exclude_drawn_cards():
+    player_hand = ('5 of Hearts', 'K of Clubs')
+    for _ in range(200):
+        banker_hand, banker_hand_value = draw_banker_hand(player_hand, with_weights='Yes')
+        assert not set(banker_hand) & set(player_hand)
+        assert banker_hand_value == DECK_DICT[banker_hand]
+
+    drawn_cards = [card for card in CARDS if card != 'A of Spades']
+    player_hand, player_hand_value, player_draw = draw_player(drawn_cards, ('2 of Hearts', '3 of Hearts'), 5)
+    assert player_draw == ('A of Spades', )
+    assert player_hand_value == 6
+
+
 def test_announce_winner():
     assert announce_winner(player_hand_value=9, banker_hand_value=8) == 'Player'
     assert announce_winner(player_hand_value=5, banker_hand_value=8) == 'Banker'
@@ -53,3 +81,95 @@ def test_simulate_baccarat():
     assert result.player_hand_value == int(str(sum(10 if card['value'] in ['K', 'Q', 'J'] else 1 if card['value'] == 'A' else int(card['value']) for card in result.player_hand))[-1])
     assert result.banker_hand_value == int(str(sum(10 if card['value'] in ['K', 'Q', 'J'] else 1 if card['value'] == 'A' else int(card['value']) for card in result.banker_hand))[-1])
     assert result.player_ending_balance - result.player_payout == result.player_beginning_balance
+
+
+def test_shoe():
+    shoe = Shoe(decks=6, penetration=0.5)
+    assert shoe.cards_remaining == 6 * 52
+    assert sorted(shoe.cards) == sorted(list(range(52)) * 6)
+
+    hand, hand_value = shoe.deal_pair(with_weights='Yes')
+    assert shoe.position == 2
+    assert hand_value == (card_point(hand[0]) + card_point(hand[1])) % 10
+
+    while not shoe.needs_shuffle:
+        shoe.draw()
+    assert shoe.position == shoe.cut_card == 156
+
+    with pytest.raises(ValueError):
+        Shoe(decks=0)
+
+
+def test_simulate_baccarat_shoe():
+    results = simulate_baccarat_shoe(decks=1, penetration=1)
+    cards = [(card['value'], card['rank']) for result in results for card in result.player_hand + result.banker_hand]
+    assert len(cards) == len(set(cards))
+    assert 52 - len(cards) < 6
+
+
+def test_simulate_baccarat_batch():
+    result = simulate_baccarat_batch(500)
+    assert result.hands == 500
+    assert len(result.game_id) == len(set(result.game_id)) == 500
+
+    for i in range(result.hands):
+        assert result.start_time[i] < result.end_time[i]
+        assert result.player_hand_value[i] == sum(10 if card['value'] in ['K', 'Q', 'J'] else 1 if card['value'] == 'A' else int(card['value']) for card in result.player_hand[i]) % 10
+        assert result.banker_hand_value[i] == sum(10 if card['value'] in ['K', 'Q', 'J'] else 1 if card['value'] == 'A' else int(card['value']) for card in result.banker_hand[i]) % 10
+
+        cards = [(card['value'], card['rank']) for card in result.player_hand[i] + result.banker_hand[i]]
+        assert len(cards) == len(set(cards))
+
+        winner = announce_winner(result.player_hand_value[i], result.banker_hand_value[i])
+        assert result.player_payout[i] == compute_payout(winner, result.player_wager[i], result.player_bet[i])
+        assert result.player_bet_outcome[i] == announce_bet_winner(result.player_bet[i], winner)
+
+
+def brute_force_odds(points, type):
+    outcomes = {'Player': 0, 'Banker': 0, 'Tie': 0}
+    for cards in itertools.permutations(range(len(points)), 6):
+        hand = [points[card] for card in cards]
+        player_value, banker_value = (hand[0] + hand[1]) % 10, (hand[2] + hand[3]) % 10
+        weight = 1
+
+        if type == 'rigged':
+            remaining = [points[card] for card in range(len(points)) if card not in cards[:2]]
+            pair_weights = [10 if (a + b) % 10 >= 7 else 1 for a, b in itertools.combinations(remaining, 2)]
+            weight = (10 if banker_value >= 7 else 1) / (sum(pair_weights) / len(pair_weights))
+
+        third_cards = iter(hand[4:])
+        if player_value <= 5:
+            player_value = (player_value + next(third_cards)) % 10
+        if banker_value <= 5:
+            banker_value = (banker_value + next(third_cards)) % 10
+
+        outcomes[announce_winner(player_value, banker_value)] += weight
+
+    total = sum(outcomes.values())
+    return {winner: count / total for winner, count in outcomes.items()}
+
+
+@pytest.mark.parametrize('type', ['normal', 'rigged'])
+def test_baccarat_odds_matches_enumeration(type):
+    points = [0, 0, 0, 1, 3, 4, 5, 7, 8]
+    composition = [points.count(point) for point in range(10)]
+
+    odds = baccarat_odds(composition, type=type)
+    expected = brute_force_odds(points, type)
+
+    assert odds.player == pytest.approx(expected['Player'])
+    assert odds.banker == pytest.approx(expected['Banker'])
+    assert odds.tie == pytest.approx(expected['Tie'])
+    assert odds.ev['Banker'] == pytest.approx(odds.banker * .95 - odds.player - odds.tie)
+
+
+def test_baccarat_odds_shoe_composition():
+    shoe = Shoe(decks=8)
+    assert baccarat_odds(shoe.composition()) == baccarat_odds(decks=8)
+
+    odds = baccarat_odds(decks=8)
+    assert odds.player + odds.banker + odds.tie == pytest.approx(1)
+    assert odds.tie == pytest.approx(0.1119, abs=1e-3)
+
+    with pytest.raises(ValueError):
+        baccarat_odds([0] * 9 + [5])
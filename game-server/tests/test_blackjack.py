@@ -1,5 +1,13 @@
 import pytest
-from games.blackjack.sim import Card, Deck, calculate_hand_value, simulate_blackjack, simulate_blackjack_games
+import numpy as np
+from collections import Counter
+from games.blackjack.edge import RunningStats, estimate_house_edge
+from games.blackjack.sim import Card, Deck, Shoe, calculate_hand_value, simulate_blackjack, simulate_blackjack_games, stream_blackjack_games
+from games.blackjack.engine import CARD_DICTS, CARD_POINTS, CARD_IS_ACE, MAX_HANDS, OUTCOME_MULTIPLIERS, Shoes, hand_value, play_games, play_lane_games, play_table_games, schedule_games_parallel
+from games.blackjack.strategy import BASIC, NAIVE, DOUBLE_OR_HIT, DOUBLE_OR_STAND, HIT, SPLIT, STAND, HandTotals, card_points
+from games.rng import GameRNG
+from fastapi.testclient import TestClient
+from server.app import app
 from datetime import datetime
 
 def test_card_creation():
@@ -22,6 +30,27 @@ def test_deck_draw():
     assert isinstance(card, Card)
     assert len(deck.cards) == 51
 
+def test_shoe():
+    shoe = Shoe(num_decks=6, penetration=0.5)
+    assert len(shoe.cards) == 6 * 52
+    assert Counter(shoe.cards) == {card: 6 for card in range(52)}
+
+    drawn = [shoe.draw() for _ in range(156)]
+    assert all(isinstance(card, Card) for card in drawn)
+    assert shoe.needs_shuffle
+    assert Counter(map(str, drawn)).most_common(1)[0][1] <= 6
+
+    shoe.shuffle()
+    assert shoe.position == 0 and not shoe.needs_shuffle
+
+def test_simulate_blackjack_shared_shoe():
+    shoe = Shoe(num_decks=1, penetration=0.5)
+    seen = []
+    while not shoe.needs_shuffle:
+        result = simulate_blackjack(1000, 50, datetime.now(), shoe)
+        seen += [(card['suit'], card['value']) for card in result['playerHand'] + result['dealerHand']]
+    assert len(seen) == len(set(seen)) == shoe.position
+
 def test_calculate_hand_value():
     hand = [Card('hearts', 'A'), Card('spades', 'K')]
     assert calculate_hand_value(hand) == 21
@@ -29,6 +58,16 @@ def test_calculate_hand_value():
     hand = [Card('hearts', '5'), Card('spades', '7'), Card('diamonds', 'K')]
     assert calculate_hand_value(hand) == 22
 
+    hand = [Card('hearts', 'A'), Card('spades', 'A'), Card('diamonds', '10')]
+    assert calculate_hand_value(hand) == 12
+
+def test_simulate_blackjack_seeded_replays():
+    timestamp = datetime.now()
+    first = simulate_blackjack(1000, 50, timestamp, rng=GameRNG(3))
+    assert first == simulate_blackjack(1000, 50, timestamp, rng=GameRNG(3))
+    assert first['gameId'] != simulate_blackjack(1000, 50, timestamp, rng=GameRNG(4))['gameId']
+
+
 def test_simulate_blackjack():
     result = simulate_blackjack(1000, 50, datetime.now())
     assert 'gameId' in result
@@ -43,3 +82,171 @@ def test_simulate_blackjack_games():
     assert len(result.transactions) == 6  # 2 players * 3 games
 
 
+
+def test_engine_hand_value_matches_calculate_hand_value():
+    rng = np.random.default_rng(7)
+    for _ in range(2000):
+        cards = rng.choice(52, size=rng.integers(2, 7), replace=False)
+        hand = [Card(**CARD_DICTS[card]) for card in cards]
+        value = hand_value(CARD_POINTS[cards].sum(), CARD_IS_ACE[cards].sum())
+        assert value == calculate_hand_value(hand)
+    assert hand_value(np.array([10, 9, 10]), np.array([2, 2, 1])).tolist() == [12, 21, 21]
+
+def test_play_games():
+    batch = play_games(np.random.default_rng(11), 5000)
+    assert np.all(batch.hand_count == 1)
+    for i in range(len(batch)):
+        player_hand = [Card(**CARD_DICTS[card]) for card in batch.player_cards[i, 0, :batch.player_card_count[i, 0]]]
+        dealer_hand = [Card(**CARD_DICTS[card]) for card in batch.dealer_cards[i, :batch.dealer_card_count[i]]]
+        assert calculate_hand_value(player_hand) == batch.player_value[i, 0] >= 17
+        assert calculate_hand_value(dealer_hand) == batch.dealer_value[i]
+        assert batch.last_action[i] == (len(player_hand) > 2)
+        assert len(set(map(str, player_hand + dealer_hand))) == len(player_hand + dealer_hand)
+        if batch.player_value[i, 0] <= 21:
+            assert batch.dealer_value[i] >= 17
+
+def hand_of(*values):
+    totals = HandTotals()
+    for value in values:
+        totals.add(value)
+    return totals
+
+def test_hand_totals():
+    assert hand_of('A', '6').value == 17 and hand_of('A', '6').is_soft
+    assert hand_of('A', '6', 'K').value == 17 and not hand_of('A', '6', 'K').is_soft
+    assert hand_of('5', '7', 'K').value == 22
+    assert hand_of('A', 'A', '9').value == 21 and hand_of('A', 'A', '9').is_soft
+    assert hand_of('K', 'A', 'A').value == 12 and not hand_of('K', 'A', 'A').is_soft
+    assert hand_of('A', 'A', '10').value == 12 and not hand_of('A', 'A', '10').is_soft
+
+def test_basic_strategy_decisions():
+    assert BASIC.decide(hand_of('10', '6'), 10) == HIT
+    assert BASIC.decide(hand_of('10', '6'), 6) == STAND
+    assert BASIC.decide(hand_of('6', '5'), 6) == DOUBLE_OR_HIT
+    assert BASIC.decide(hand_of('4', '2', '5'), 6) == HIT
+    assert BASIC.decide(hand_of('A', '7'), 4) == DOUBLE_OR_STAND
+    assert BASIC.decide(hand_of('A', '2', '5'), 4) == STAND
+    assert BASIC.decide(hand_of('8', '8'), 11, pair_points=8) == SPLIT
+    assert BASIC.decide(hand_of('K', 'Q'), 6, pair_points=10) == STAND
+    assert NAIVE.decide(hand_of('8', '8'), 6, pair_points=8) == HIT
+
+def test_play_games_basic_strategy():
+    batch = play_games(np.random.default_rng(3), 20000, strategy=BASIC)
+    assert batch.hand_count.max() > 1 and batch.bet_units.max() == 2
+    for i in np.flatnonzero(batch.hand_count > 1):
+        hands = [
+            [Card(**CARD_DICTS[card]) for card in batch.player_cards[i, hand, :batch.player_card_count[i, hand]]]
+            for hand in range(batch.hand_count[i])
+        ]
+        assert all(calculate_hand_value(hand) == batch.player_value[i, k] for k, hand in enumerate(hands))
+        # Every hand starts from one card of the split pair.
+        assert len({card_points(hand[0].value) for hand in hands}) == 1
+        assert not batch.player_card_count[i, batch.hand_count[i]:].any()
+
+    expected = (OUTCOME_MULTIPLIERS[batch.hand_outcome] * batch.bet_units).sum(axis=1) * 10
+    assert np.array_equal(batch.payouts(np.full(len(batch), 10)), expected)
+    # Basic strategy loses far less than hitting to 17.
+    assert batch.payouts(np.ones(len(batch))).mean() > play_games(np.random.default_rng(3), 20000).payouts(np.ones(20000)).mean()
+
+def test_simulate_blackjack_basic_strategy_splits():
+    shoe = Shoe(num_decks=6)
+    results = [simulate_blackjack(1000, 10, datetime.now(), shoe, BASIC) for _ in range(3000)]
+    split = [result for result in results if 'splitHands' in result]
+    assert split
+    for result in split:
+        hands = result['splitHands']
+        assert 2 <= len(hands) <= MAX_HANDS
+        assert result['playerHand'] == hands[0]['hand']
+        assert result['currentBet'] == sum(hand['bet'] for hand in hands)
+        assert result['payout'] == sum(hand['payout'] for hand in hands)
+    assert {result['lastAction'] for result in results} <= {'initial_deal', 'hit', 'double_down', 'split'}
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_simulate_blackjack_games_transactions(workers):
+    result = simulate_blackjack_games(5, 40, workers=workers)
+    transactions = result.transactions
+    assert len(transactions) == 200
+    assert [t['timestamp'] for t in transactions] == sorted(t['timestamp'] for t in transactions)
+    assert set(transactions[0]) == {'playerId', *simulate_blackjack(1000, 50, datetime.now())}
+
+    for player_id in range(2000, 2005):
+        games = [t for t in transactions if t['playerId'] == player_id]
+        assert len(games) == 40
+        # Balances chain from 1000: every game starts from another game's end balance except the first.
+        starts = Counter(t['playerBalance'] - t['payout'] for t in games)
+        ends = Counter([1000] + [t['playerBalance'] for t in games])
+        assert sum((ends - starts).values()) == 1
+
+def test_schedule_games_parallel_shards_players():
+    games = schedule_games_parallel(np.random.SeedSequence(3), np.arange(2000, 2007), 30, 7 * 30 * 10, workers=3)
+    assert len(games.offsets) == 210
+    assert np.all(np.diff(games.offsets) >= 0)
+    assert Counter(games.player_ids.tolist()) == {player_id: 30 for player_id in range(2000, 2007)}
+
+def test_stream_blackjack_games():
+    chunks = list(stream_blackjack_games(3, 5000))
+    transactions = [transaction for chunk in chunks for transaction in chunk]
+    assert len(chunks) > 1
+    assert len(transactions) == 15000
+    assert [t['timestamp'] for t in transactions] == sorted(t['timestamp'] for t in transactions)
+
+    for player_id in range(2000, 2003):
+        games = [t for t in transactions if t['playerId'] == player_id]
+        assert len(games) == 5000
+        balance = 1000
+        for game in games:
+            balance += game['payout']
+            assert game['playerBalance'] == balance
+
+def test_play_table_games():
+    batch = play_table_games(np.random.default_rng(5), 3, 40, num_decks=1, penetration=0.75)
+    assert len(batch) == 120
+    for table in range(3):
+        rows = range(table * 40, table * 40 + 40)
+        cards = [card for i in rows for card in [*batch.player_cards[i, 0, :batch.player_card_count[i, 0]], *batch.dealer_cards[i, :batch.dealer_card_count[i]]]]
+        # A single-deck shoe is dealt through before repeating any card.
+        assert len(set(cards[:28])) == 28
+
+def test_play_lane_games():
+    lanes = np.random.default_rng(8).permutation(np.repeat(np.arange(3), 40))
+    batch = play_lane_games(np.random.default_rng(5), lanes, Shoes(np.random.default_rng(6), 3, 1, 0.75))
+    assert len(batch) == 120
+    for lane in range(3):
+        rows = np.flatnonzero(lanes == lane)
+        cards = [card for i in rows for card in [*batch.player_cards[i, 0, :batch.player_card_count[i, 0]], *batch.dealer_cards[i, :batch.dealer_card_count[i]]]]
+        # Each lane's games are dealt in order from its own single-deck shoe.
+        assert len(set(cards[:28])) == 28
+
+def test_stream_blackjack_games_from_shoes():
+    transactions = [transaction for chunk in stream_blackjack_games(2, 300, num_decks=6, rng=GameRNG(2)) for transaction in chunk]
+    assert len(transactions) == 600
+    assert Counter(t['playerId'] for t in transactions) == {2000: 300, 2001: 300}
+
+def test_blackjack_endpoint_stream():
+    client = TestClient(app)
+    response = client.get('/blackjack', params={'players': 2, 'games': 20, 'decks': 6, 'stream': True})
+    assert response.status_code == 200 and len(response.text.splitlines()) == 40
+    response = client.get('/blackjack', params={'stream': True, 'workers': 2})
+    assert response.status_code == 422
+
+def test_running_stats_merges_batches():
+    values = np.random.default_rng(9).normal(0.5, 2, 10001)
+    stats = RunningStats()
+    for batch in np.array_split(values, 7):
+        stats.update(batch)
+    assert stats.count == len(values)
+    assert np.isclose(stats.mean, values.mean())
+    assert np.isclose(stats.variance, values.var(ddof=1))
+
+def test_estimate_house_edge():
+    estimate = estimate_house_edge(strategy='basic', target_width=0.05, batch_size=10000, rng=GameRNG(1))
+    assert estimate.converged
+    assert estimate.ciHigh - estimate.ciLow < 0.05
+    assert estimate.hands == 10000 * estimate.batches
+    assert estimate.ciLow < estimate.ev < estimate.ciHigh and estimate.houseEdge == -estimate.ev
+
+    capped = estimate_house_edge(target_width=1e-6, batch_size=1000, max_hands=3000, rng=GameRNG(1))
+    assert not capped.converged and capped.hands == 3000
+
+    shoe_play = estimate_house_edge(num_decks=6, target_width=1e-6, batch_size=1000, max_hands=5000, rng=GameRNG(1))
+    assert shoe_play.numDecks == 6 and shoe_play.hands == 5000
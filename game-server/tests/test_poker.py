@@ -1,8 +1,16 @@
 # test_poker.py
 import pytest
 import random
-from games.poker.poker_game_logic import Player, generate_poker_hand, create_player_pool, determine_winner, evaluate_hand
+from games.poker.poker_game_logic import Player, PlayerRegistry, deal_cards, street_leader, generate_poker_hand, generate_winnings, create_player_pool, determine_winner, evaluate_hand, settle_pots
+import numpy as np
+from games.poker.hand_evaluation import HandState, board_strengths, card_indices, deck_template, evaluate_boards, evaluate_hand_cascade, evaluate_hands, hand_strength, hand_values, pack_strength, unpack_strength
 from games.poker.sim import simulate_poker, CommunityCard
+from games.poker.equity import poker_equity, preflop_class, preflop_classes
+from games.poker.preflop_equity import PREFLOP_EQUITY
+from games.poker.importance import deal_tilted, hand_frequencies, results_report, tilted_weights
+from games.rng import GameRNG
+from fastapi.testclient import TestClient
+from server.app import app
 
 
 def test_create_player_pool():
@@ -11,6 +19,23 @@ def test_create_player_pool():
     assert all(isinstance(player, Player) for player in player_pool.values())
 
 
+def test_player_registry_carries_chips():
+    registry = PlayerRegistry(10)
+    assert len(registry) == 10
+    assert set(registry.by_id) == set(create_player_pool(10))
+
+    player_1, player_2 = registry.seat(2)
+    assert player_1 is not player_2
+    chips_1, chips_2 = player_1.chips, player_2.chips
+    player1_netwin, player2_netwin, *_ = generate_winnings("p1", player_1, player_2, 1000, 1000)
+    assert registry.by_id[player_1.player_id].chips == round(chips_1 + player1_netwin)
+    assert registry.by_id[player_2.player_id].chips == chips_2 - 1010
+
+    player_2.chips = 100
+    player_2.new_hand()
+    assert player_2.chips >= 5000 and player_2.rebuys == 1
+
+
 def test_deal_hole_cards():
     deck = [f"{rank}{suit}" for rank in '23456789TJQKA' for suit in 'HDCS']
     player = Player(player_id="test", name="Test Player", behavior="Safe Player")
@@ -26,6 +51,136 @@ def test_evaluate_hand():
     assert high_cards == [13, 9, 5, 3, 2]
 
 
+@pytest.mark.parametrize('hand, expected', [
+    (['TH', 'JH', 'QH', 'KH', 'AH', '2D', '2C'], ('rf', [14, 13, 12, 11, 10, 2, 2])),
+    (['2H', '3H', '4H', '5H', '9H', '6D', '2C'], ('sf', [9, 6, 5, 4, 3, 2, 2])),
+    (['AH', 'AD', 'AS', 'AC', 'KH', 'QD', '2C'], ('foak', [14, 13])),
+    (['AH', 'AD', 'AS', 'KC', 'KH', 'KD', '2C'], ('toak', [14, 12, 11])),
+    (['AH', 'AD', 'KS', 'KC', 'QH', 'QD', '2C'], ('tp', [14, 13, 12, 11])),
+    (['5H', '5D', '9C', 'KH', '2C'], ('pa', [5, 14, 13, 12])),
+])
+def test_evaluate_hand_table(hand, expected):
+    assert evaluate_hand(hand) == evaluate_hand_cascade(hand) == expected
+
+
+def test_evaluate_hand_matches_cascade():
+    rng = random.Random(3)
+    for _ in range(20000):
+        hand = rng.sample(deck_template, rng.randint(5, 7))
+        assert evaluate_hand(hand) == evaluate_hand_cascade(hand)
+        assert unpack_strength(hand_strength(hand)) == evaluate_hand(hand)
+
+
+def test_hand_strength_orders_categories_then_kickers():
+    assert hand_strength(['2H', '2D', '5S', '9C', 'KD']) > hand_strength(['AH', 'KD', 'QS', 'JC', '9D'])
+    assert hand_strength(['3H', '3D', '5S', '9C', 'KD']) > hand_strength(['2H', '2D', '5S', '9C', 'KD'])
+    assert pack_strength(2, [5, 14, 13, 12]) == hand_strength(['5H', '5D', '9C', 'KH', '2C'])
+
+
+@pytest.mark.parametrize('size', [5, 6, 7])
+def test_evaluate_hands_matches_hand_strength(size):
+    rng = random.Random(size)
+    hands = [rng.sample(deck_template, size) for _ in range(5000)]
+    hands.append(['TH', 'JH', 'QH', 'KH', 'AH', '2D', '2C'][:size])
+    strengths, categories = evaluate_hands(card_indices(hands))
+    assert strengths.tolist() == [hand_strength(hand) for hand in hands]
+    assert categories.tolist() == [hand_values[evaluate_hand(hand)[0]] for hand in hands]
+
+
+def test_evaluate_hands_rejects_invalid_hands():
+    with pytest.raises(ValueError):
+        evaluate_hands(np.zeros((3, 4), dtype=int))
+    with pytest.raises(ValueError):
+        evaluate_hands(np.array([[0, 0, 1, 2, 3, 4, 5]]))
+    with pytest.raises(ValueError):
+        evaluate_hands(np.array([[0, 1, 2, 3, 52]]))
+
+
+def test_evaluate_boards_matches_hand_strength():
+    rng = np.random.default_rng(3)
+    cards = np.array([rng.permutation(52)[:17] for _ in range(200)])
+    boards, hole_cards = cards[:, :5], cards[:, 5:].reshape(200, 6, 2)
+    strengths, codes = evaluate_boards(boards, hole_cards)
+    assert strengths.shape == codes.shape == (200, 6)
+    expected = [
+        [hand_strength([deck_template[card] for card in (*hole, *board)]) for hole in holes]
+        for board, holes in zip(boards, hole_cards)
+    ]
+    assert strengths.tolist() == expected
+    assert board_strengths([deck_template[card] for card in boards[0]], [[deck_template[card] for card in hole] for hole in hole_cards[0]]) == expected[0]
+
+    with pytest.raises(ValueError):
+        evaluate_boards(boards[:1], np.stack([boards[:1, :2], boards[:1, 2:4]], axis=1))
+
+
+def test_hand_state_tracks_streets():
+    rng = random.Random(5)
+    for _ in range(500):
+        cards = rng.sample(deck_template, 7)
+        state = HandState(cards[:2])
+        assert state.strength is None
+        for count in range(3, 8):
+            state.add(cards[count - 1])
+            assert state.strength == (hand_strength(cards[:count]) if count >= 5 else None)
+    with pytest.raises(ValueError):
+        state.add('2C')
+
+
+def test_hand_state_draws():
+    assert HandState(['5H', '6D', '7C', '8S', 'KH']).draws == ['open_ended']
+    assert HandState(['5H', '6D', '8C', '9S', 'KH']).draws == ['gutshot']
+    assert HandState(['AH', '2H', '3C', '4H', 'KH']).draws == ['flush', 'gutshot']
+    assert HandState(['9H', 'TD', 'JC', 'QS', 'KH', '2C']).draws == []
+
+
+def test_street_leader():
+    players = [Player(f"p{seat}", f"Player {seat}", "Safe Player") for seat in range(3)]
+    for player, hole_cards in zip(players, (['AH', 'AD'], ['7C', '2D'], ['8S', '9S'])):
+        player.hole_cards = hole_cards
+    board = ['8H', '8D', '2C', '9C', '3H']
+    assert street_leader(players, board, 1) == 0
+    assert street_leader(players, board, 2) == 2
+    assert street_leader(players, board, 4) == 2
+
+
+def test_settle_pots_side_pots_and_ties():
+    # Seat 0 is all-in for 100, seats 1 and 2 play on for 300; seat 0 has the best hand.
+    payouts, pots, house = settle_pots([100, 300, 300], [9, 5, 7], rake=0)
+    assert payouts == [300, 0, 400]
+    assert pots == [{"amount": 300, "winners": [0]}, {"amount": 400, "winners": [2]}]
+    assert house == 0
+
+    # A tie splits the pot and an uncalled bet goes back unraked.
+    payouts, pots, house = settle_pots([100, 100, 150], [7, None, 7], rake=10)
+    assert payouts == [135, 0, 185]
+    assert pots == [{"amount": 300, "winners": [0, 2]}]
+    assert house == 30
+
+
+def test_generate_winnings_tie():
+    player_1, player_2 = PlayerRegistry(2).seat(2)
+    player1_netwin, player2_netwin, house_earnings, total_pot, rake, initial_bets = generate_winnings("tie", player_1, player_2, 1000, 1000)
+    assert total_pot == 2020
+    assert player1_netwin == player2_netwin == -house_earnings / 2
+
+
+@pytest.mark.parametrize("seats", [3, 9])
+def test_generate_poker_hand_seats(seats):
+    registry = PlayerRegistry(seats)
+    chips = sum(player.chips for player in registry.players)
+    game_data = generate_poker_hand(deal_cards(seats), registry=registry)
+    assert len(game_data['players']) == seats
+    assert len({card for player in game_data['players'] for card in player['holeCards']}) == 2 * seats
+    assert sum(pot['amount'] for pot in game_data['pots']) <= game_data['totalPot']
+    assert game_data['winner'] in game_data['pots'][0]['winners']
+    net_wins = sum(player['netWin'] for player in game_data['players'])
+    assert net_wins == pytest.approx(-game_data['rake'] / 100 * sum(pot['amount'] for pot in game_data['pots']))
+    assert abs(sum(player.chips for player in registry.players) - chips - net_wins) <= seats
+
+    with pytest.raises(ValueError):
+        deal_cards(11)
+
+
 def test_determine_winner():
     hand1 = 'toak'
     hand2 = 'tp'
@@ -62,6 +217,47 @@ def test_simulate_poker_single_game():
     assert 'river' in result.communityCards and isinstance(result.communityCards['river'], CommunityCard)
 
 
+def test_simulate_poker_seats():
+    results = simulate_poker(3, seats=6)
+    assert all(len(result.players) == 6 and result.pots for result in results)
+
+
+def test_simulate_poker_workers(monkeypatch):
+    from games.poker import sim
+    from games.poker.poker_game_logic import player_registry
+    monkeypatch.setattr(sim, 'MIN_SHARD_GAMES', 5)
+    results = simulate_poker(20, seats=3, workers=2)
+    assert len(results) == 20 and all(len(result.players) == 3 for result in results)
+    assert len({result.gameID for result in results}) == 20
+    assert len(player_registry) == len(player_registry.by_id) == 100
+    assert all(player_registry.by_id[player.player_id] is player for player in player_registry.players)
+
+
+def test_simulate_poker_concurrent_requests():
+    from collections import defaultdict
+    from concurrent.futures import ThreadPoolExecutor
+    from games.poker.poker_game_logic import player_registry
+    before = {player.player_id: player.net_win for player in player_registry.players}
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        batches = list(pool.map(lambda _: simulate_poker(100, seats=4, workers=1), range(4)))
+
+    # Every hand's net wins land on the registry's players exactly once.
+    net_wins = defaultdict(float)
+    for result in (result for batch in batches for result in batch):
+        assert len({player.playerId for player in result.players}) == 4
+        for player in result.players:
+            net_wins[player.playerId] += player.netWin
+    for player in player_registry.players:
+        assert player.net_win - before[player.player_id] == pytest.approx(net_wins[player.player_id])
+
+
+def test_simulate_poker_seeded_deals_replay():
+    from games.rng import GameRNG
+    def deals():
+        return [(result.players[0].holeCards, result.communityCards) for result in simulate_poker(20, seats=3, workers=1, rng=GameRNG(4))]
+    assert deals() == deals()
+
+
 def test_simulate_poker_multiple_games():
     num_games = 2
     results = simulate_poker(num_games)
@@ -76,3 +272,77 @@ def test_simulate_poker_multiple_games():
         assert 'flop' in result.communityCards and len(result.communityCards['flop']) == 3
         assert 'turn' in result.communityCards and isinstance(result.communityCards['turn'], CommunityCard)
         assert 'river' in result.communityCards and isinstance(result.communityCards['river'], CommunityCard)
+
+
+def test_poker_equity_exact():
+    # Only the river is left: 44 cards.
+    result = poker_equity([['AH', 'KH'], ['QS', 'QC']], ['2H', '7H', 'QD', '3C'])
+    assert result.method == 'exact' and result.deals == 44
+    # Queens have trips: only a heart that pairs neither the board nor a
+    # queen gives the first hand its flush.
+    assert result.equity[0] == pytest.approx(7 / 44)
+    assert sum(result.equity) == pytest.approx(1)
+
+
+def test_poker_equity_monte_carlo_matches_exact():
+    sampled = poker_equity([['AH', 'AD']], ['2C', '7D', '9S'], deals=100_000, rng=GameRNG(7))
+    assert sampled.method == 'monte_carlo'
+    exact = poker_equity([['AH', 'AD']], ['2C', '7D', '9S', 'JD'])
+    assert exact.method == 'exact'
+    assert abs(sampled.equity[0] - 0.8544) < 5 * sampled.stdError
+
+
+def test_poker_equity_preflop_table():
+    assert len(preflop_classes()) == len(PREFLOP_EQUITY) == 169
+    assert preflop_class(['5D', 'AD']) == 'A5s' and preflop_class(['TC', '9H']) == 'T9o' and preflop_class(['7S', '7C']) == '77'
+    result = poker_equity([['KD', 'KS']])
+    assert result.method == 'preflop_table'
+    assert result.equity == [PREFLOP_EQUITY['KK'], pytest.approx(1 - PREFLOP_EQUITY['KK'])]
+    assert max(PREFLOP_EQUITY, key=PREFLOP_EQUITY.get) == 'AA'
+    assert min(PREFLOP_EQUITY, key=PREFLOP_EQUITY.get) == '32o'
+
+
+def test_poker_equity_rejects_invalid_cards():
+    with pytest.raises(ValueError):
+        poker_equity([['AH', 'AH']])
+    with pytest.raises(ValueError):
+        poker_equity([['AH', 'KD']], ['2C'])
+    with pytest.raises(ValueError):
+        poker_equity([['AH', '1D']])
+
+
+def test_poker_equity_endpoint_rejects_invalid_cards():
+    client = TestClient(app)
+    response = client.get('/poker/equity', params={'hands': 'AHAH'})
+    assert response.status_code == 400 and response.json()['detail'] == 'A card cannot be dealt twice'
+    response = client.get('/poker/equity', params={'hands': 'AHKD', 'board': '2c'})
+    assert response.status_code == 400 and response.json()['detail'] == 'The board must hold 0, 3, 4 or 5 cards'
+
+
+def test_deal_tilted_weights_are_unbiased():
+    rng = np.random.default_rng(11)
+    boards, hole_cards, weights = deal_tilted(rng, 50_000, seats=4)
+    cards = np.concatenate([boards, hole_cards.reshape(len(boards), -1)], axis=1)
+    assert all(len(set(row)) == 13 for row in cards[:1000].tolist())
+    assert weights.max() <= 4
+    # Weights average to one under the tilted deal, and the uniform deal
+    # (almost never a quad) gets weight close to 1 / uniform share.
+    assert weights.mean() == pytest.approx(1, abs=0.02)
+    assert tilted_weights(np.array([[0, 14, 28, 3, 17, 31, 45]]))[0] == pytest.approx(4, rel=0.01)
+
+
+def test_hand_frequencies_tilted_matches_exact_rates():
+    frequencies = {row.hand: row for row in hand_frequencies(200_000, rng=GameRNG(2)).frequencies}
+    # Seven-card royal flush and four of a kind rates.
+    assert abs(frequencies['rf'].frequency - 4324 / 133784560) < 4 * frequencies['rf'].stdError
+    assert abs(frequencies['foak'].frequency - 224848 / 133784560) < 4 * frequencies['foak'].stdError
+    assert frequencies['rf'].hits > 1000
+    assert sum(row.frequency for row in frequencies.values()) == pytest.approx(1, abs=0.02)
+
+
+def test_simulate_poker_tilted_results_carry_weights():
+    results = simulate_poker(200, tilted=True, workers=1)
+    assert all(0 < result.weight <= 4 for result in results)
+    report = results_report(results)
+    assert [row.hand for row in report][0] == 'rf'
+    assert all(row.meanNetWin is None or isinstance(row.meanNetWin, float) for row in report)
@@ -0,0 +1,37 @@
+import os
+import pickle
+from games.rng import GameRNG, default_rng, game_rng
+
+
+def test_seeded_streams_replay():
+    first, second = GameRNG(11), GameRNG(11)
+    assert [first.randint(0, 100) for _ in range(5)] == [second.randint(0, 100) for _ in range(5)]
+    assert first.numpy.integers(0, 100, 5).tolist() == second.numpy.integers(0, 100, 5).tolist()
+    assert GameRNG(11).random() != GameRNG(12).random()
+
+
+def test_spawned_streams_are_independent_and_replay():
+    children = GameRNG(3).spawn(2)
+    assert children[0].random() != children[1].random()
+    assert [child.random() for child in GameRNG(3).spawn(2)] == [child.random() for child in GameRNG(3).spawn(2)]
+
+
+def test_pickled_rng_continues_its_streams():
+    rng = GameRNG(5)
+    rng.random()
+    copy = pickle.loads(pickle.dumps(rng))
+    assert copy.random() == rng.random()
+    assert copy.numpy.random() == rng.numpy.random()
+    assert copy.spawn(1)[0].random() == rng.spawn(1)[0].random()
+
+
+def test_default_rng_is_shared_and_reset_after_fork():
+    assert default_rng() is default_rng() is game_rng()
+    parent = default_rng().getstate()
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.write(write, b'1' if default_rng().getstate() != parent else b'0')
+        os._exit(0)
+    os.waitpid(pid, 0)
+    assert os.read(read, 1) == b'1'
@@ -249,3 +249,161 @@ def test_even_bet(game: RouletteGame):
 
     assert game.get_winning_pocket().pocket_number == 9
     assert bet.amount_won is None
+
+
+def test_pocket_masks_match_compute_winnings(game: RouletteGame):
+    from games.roulette.bet import random_bet
+    from games.roulette.game.roulette_pocket import WINNING_POCKETS
+
+    bets = [random_bet(game) for _ in range(300)]
+    for bet in bets:
+        mask = bet.pocket_mask()
+        for slot, pocket in enumerate(WINNING_POCKETS):
+            bet.amount_won = None
+            bet.compute_winnings(pocket)
+            assert (bet.amount_won is not None) == mask[slot]
+            if mask[slot]:
+                assert bet.amount_won == bet.bet_amount * bet.PAYOUT
+
+
+def test_spin_settles_from_payout_matrix(game: RouletteGame):
+    bets = [
+        StraightUpBet(bet_amount=10, pocket=RoulettePocket(pocket_number=9)),
+        ColorBet(bet_amount=20, bet=PocketColor.GREEN),
+        OddOrEvenBet(bet_amount=30, bet=RouletteBetType.EVEN),
+    ]
+    for bet in bets:
+        game.add_bet(bet)
+    assert game.payout_matrix().shape == (38, 3)
+    assert game.payout_matrix()[0].tolist() == [0, 20, 30]
+
+    with patch("random.Random.randint", return_value=-1):
+        game.spin()
+
+    assert [bet.amount_won for bet in bets] == [None, 20, 30]
+
+    game.clear_bets()
+    assert game.payout_matrix().shape == (38, 0)
+
+
+def test_payout_matrix_grows_as_bets_are_added_between_spins(game: RouletteGame):
+    for number in range(40):
+        game.add_bet(StraightUpBet(bet_amount=number + 1, pocket=RoulettePocket(pocket_number=number % 37)))
+        game.spin()
+        assert game.payout_matrix().shape == (38, number + 1)
+    assert game.payout_matrix().sum(axis=1).tolist() == game.liability().tolist()
+    assert not game.payout_matrix().flags.writeable
+
+
+def test_pockets_are_shared_and_read_only(game: RouletteGame):
+    other = RouletteGame()
+    assert game.pocket_from_coord(12, 3) is other.pocket_from_pocket_number(36)
+    assert game.pocket_from_coord(13, 1) is None
+    assert game.pocket_from_pocket_number(-1).pocket_color == PocketColor.GREEN
+    assert game.pocket_from_pocket_number(37) is None
+
+    with pytest.raises(AttributeError):
+        game.pocket_from_pocket_number(5).pocket_color = PocketColor.BLACK
+
+    with patch("random.Random.randint", return_value=9):
+        game.spin()
+        other.spin()
+    assert game.get_winning_pocket() is other.get_winning_pocket()
+    assert game.get_winning_pocket().dozen == Dozen.FIRST_DOZEN
+
+
+def test_seeded_roulette_replays():
+    from dataclasses import asdict
+    from games.rng import GameRNG
+    from games.roulette.sim import simulate_roulette
+
+    assert asdict(simulate_roulette(GameRNG(8))) == asdict(simulate_roulette(GameRNG(8)))
+
+
+def test_simulate_roulette_batch():
+    from games.rng import GameRNG
+    from games.roulette.batch import simulate_roulette_batch
+    from games.roulette.bet.random_bet import LAYOUT_PROBABILITIES
+    from games.roulette.game.roulette_pocket import WINNING_POCKETS, pocket_slot
+
+    assert abs(LAYOUT_PROBABILITIES.sum() - 1) < 1e-12
+    result = simulate_roulette_batch(200, bets_per_spin=30, rng=GameRNG(4))
+    assert len(result.winning_pocket_number) == len(result.total_won) == 200
+    assert len(result.bet_id) == len(result.amount_won) == 200 * 30
+
+    # Each bet settles as the matching bet object would against its spin's pocket.
+    for index, (bet_type, pockets, amount, won) in enumerate(zip(result.bet_type, result.bet_pockets, result.bet_amount, result.amount_won)):
+        pocket = WINNING_POCKETS[pocket_slot(result.winning_pocket_number[index // 30])]
+        if bet_type == 'STRAIGHT_UP':
+            assert (won is not None) == (pocket.pocket_number in pockets)
+            assert won is None or won == amount * 35
+        elif bet_type in ('ODD', 'EVEN'):
+            assert (won is not None) == (pocket.odd_or_even.value == bet_type)
+    assert sum(won or 0 for won in result.amount_won[:30]) == pytest.approx(result.total_won[0])
+
+
+def test_session_matches_single_spins(game: RouletteGame):
+    from games.rng import GameRNG
+    from games.roulette.bet import random_bet
+    from games.roulette.game import RouletteSession
+
+    bets = [random_bet(game) for _ in range(20)]
+    session = RouletteSession(bets, bankroll=500, rng=GameRNG(6))
+    result = session.play(50)
+    assert len(result.net) == len(result.bankroll) == 50
+    assert session.bankroll == result.bankroll[-1]
+
+    for number, net in zip(result.winning_pocket_number, result.net):
+        for bet in bets:
+            bet.amount_won = None
+            game.add_bet(bet)
+        with patch("random.Random.randint", return_value=number):
+            game.spin()
+        won = sum(bet.amount_won for bet in game.get_winning_bets())
+        lost = sum(bet.bet_amount for bet in bets if bet.amount_won is None)
+        assert net == pytest.approx(won - lost)
+        game.clear_bets()
+    assert result.bankroll[-1] == pytest.approx(500 + sum(result.net))
+
+
+def test_random_bets_materialize(game: RouletteGame):
+    import numpy as np
+    from games.rng import GameRNG
+    from games.roulette.bet import random_bets
+
+    bets = random_bets(500, GameRNG(2))
+    materialized = bets.materialize()
+    assert len(materialized) == len(bets) == 500
+    assert [bet.bet_amount for bet in materialized] == bets.bet_amount.tolist()
+    for bet in materialized:
+        game.add_bet(bet)
+    assert np.allclose(game.payout_matrix().T, bets.payout_rows())
+    assert len(set(bets.ids())) > 490
+
+
+def test_liability_follows_bets(game: RouletteGame):
+    from games.rng import GameRNG
+    from games.roulette.bet import random_bets
+    from games.roulette.game.roulette_pocket import WINNING_POCKETS
+
+    assert game.worst_case_exposure() == 0 and game.expected_payout() == 0
+    bets = random_bets(40, GameRNG(9)).materialize()
+    for bet in bets:
+        game.add_bet(bet)
+
+    for slot, pocket in enumerate(WINNING_POCKETS):
+        paid = kept = 0
+        for bet in bets:
+            bet.amount_won = None
+            bet.compute_winnings(pocket)
+            if bet.amount_won is None:
+                kept += bet.bet_amount
+            else:
+                paid += bet.amount_won
+        assert game.liability()[slot] == pytest.approx(paid)
+        assert game.house_net()[slot] == pytest.approx(kept - paid)
+    assert game.expected_payout() == pytest.approx(game.payout_matrix().sum() / 38)
+    assert game.worst_case_exposure() == pytest.approx(max(0, -game.house_net().min()))
+
+    game.clear_bets()
+    assert not game.liability().any() and game.worst_case_exposure() == 0